@@ -0,0 +1,157 @@
+"""
+Format files with asyncio, for storage where I/O dominates (network mounts).
+
+Reads and writes of up to `io_concurrency` files overlap in a thread pool, while parsing
+and serialization run in an executor: a process pool when several jobs are requested.
+Results are collected in the event loop thread, so the `Report` needs no locking.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import replace
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable
+
+from jsonator.document import format_document
+from jsonator.jsonator import (
+    format_json_file,
+    log_diff,
+    read_text,
+    report_error,
+    report_os_error,
+)
+from jsonator.ndjson import is_ndjson
+from jsonator.report import Report
+from jsonator.schema import schema_for
+from jsonator.stats import Stats
+from jsonator.write import FSYNC_BATCHED, sync_files, write_atomic
+
+if TYPE_CHECKING:
+    from jsonator.models import ModeArgs
+
+
+async def format_paths(  # pylint: disable=too-many-arguments
+    files: Iterable[Path],
+    report: Report,
+    mode_args: ModeArgs,
+    dump_args: dict[str, Any],
+    *,
+    io_concurrency: int,
+    executor: Executor | None = None,
+    cached: frozenset[Path] = frozenset(),
+) -> None:
+    """
+    Format `files`, reading and writing up to `io_concurrency` of them at once, and report
+    the `cached` ones, known to be well formatted, as they come.
+    Parsing and serialization run in `executor`, the default one of the loop if None.
+    """
+    loop = asyncio.get_running_loop()
+    pending = iter(files)
+    io_concurrency = max(1, io_concurrency)
+
+    async def format_ndjson_path(path: Path, io_pool: Executor) -> None:
+        # Streamed in the I/O thread with a report of its own, merged in this thread
+        stats = Stats(mode_args.trace) if mode_args.stats else None
+        path_report = Report(mode_args.check, mode_args.diff, stats, record=mode_args.report)
+        await loop.run_in_executor(
+            io_pool, format_json_file, path, path_report, replace(mode_args, jobs=1), dump_args
+        )
+        report.merge(path_report)
+
+    async def format_path(path: Path, io_pool: Executor) -> None:
+        if path in cached:
+            report.done(path, changed=False)
+            return
+        if is_ndjson(path):
+            await format_ndjson_path(path, io_pool)
+            return
+
+        try:
+            with report.phase(path, "read"):
+                text, size = await loop.run_in_executor(io_pool, read_text, path)
+        except FileNotFoundError:
+            report.failed(path, "File not found")
+            return
+        report.count_bytes(path, read=size)
+
+        with report.phase(path, "format"):
+            changed, output, error, document = await loop.run_in_executor(
+                executor,
+                partial(
+                    format_document, text, mode_args, dump_args, schema=schema_for(path, mode_args)
+                ),
+            )
+        if error is not None:
+            report_error(report, path, error)
+            return
+
+        if changed and output is not None and not mode_args.check:
+            try:
+                with report.phase(path, "write"):
+                    size = await loop.run_in_executor(
+                        io_pool, write_atomic, path, output, mode_args.fsync
+                    )
+            except OSError as exc:
+                report_os_error(report, path, exc)
+                return
+            report.count_bytes(path, written=size)
+
+        report.done(path, changed)
+
+        if mode_args.diff and output is not None:
+            with report.phase(path, "diff"):
+                log_diff(path, text, output, mode_args, document)
+
+    async def worker(io_pool: Executor) -> None:
+        for path in pending:
+            await format_path(path, io_pool)
+
+    written = len(report.written)
+    with ThreadPoolExecutor(max_workers=io_concurrency) as io_pool:
+        await asyncio.gather(*(worker(io_pool) for _ in range(io_concurrency)))
+
+    if mode_args.fsync == FSYNC_BATCHED:
+        with report.phase(None, "fsync"):
+            sync_files(report.written[written:])
+
+
+def format_many_async(  # pylint: disable=too-many-arguments
+    files: list[Path],
+    report: Report,
+    mode_args: ModeArgs,
+    dump_args: dict[str, Any],
+    *,
+    jobs: int,
+    io_concurrency: int,
+    cached: frozenset[Path] = frozenset(),
+) -> None:
+    """
+    Run `format_paths` with a pool of `jobs` worker processes for the CPU-bound work,
+    or threads if a single job is requested or processes are not supported.
+    """
+    executor: Executor | None = None
+    jobs = min(jobs, len(files) - len(cached))
+    if jobs > 1:
+        try:
+            executor = ProcessPoolExecutor(max_workers=jobs)
+        except (ImportError, NotImplementedError, OSError):
+            executor = None
+
+    try:
+        asyncio.run(
+            format_paths(
+                files,
+                report,
+                mode_args,
+                dump_args,
+                io_concurrency=io_concurrency,
+                executor=executor,
+                cached=cached,
+            )
+        )
+    finally:
+        if executor is not None:
+            executor.shutdown()
@@ -0,0 +1,144 @@
+"""
+Format JSON documents in memory.
+
+    >>> from jsonator import Formatter, format_str
+    >>> format_str('{"b": 1, "a": 2}', indent=2, sort_keys=True)
+    '{\\n  "a": 2,\\n  "b": 1\\n}\\n'
+    >>> formatter = Formatter(compact=True)
+    >>> formatter.check_str('{"a":1}\\n')
+    True
+
+Invalid documents raise `json.JSONDecodeError`, invalid options `ValueError` and a
+requested backend which is not installed `ImportError`. With `strict=True`, documents
+with duplicate keys or numbers which can't be represented exactly are invalid.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import replace
+from functools import lru_cache
+from typing import Any
+
+from jsonator.backend import AUTO, BACKENDS, get_backend, select_backend
+from jsonator.document import format_document
+from jsonator.models import ModeArgs
+
+UTF_8 = "utf-8"
+FORMATTERS_CACHE_SIZE = 64
+
+
+class Formatter:
+    """Format documents with options validated once."""
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        *,
+        indent: int | str | None = 4,
+        sort_keys: bool = False,
+        ensure_ascii: bool = True,
+        compact: bool = False,
+        backend: str = AUTO,
+        strict: bool = False,
+    ) -> None:
+        """
+        The options are the ones of the command line: `indent` is a number of spaces,
+        a string such as "\\t", or None to separate items with spaces on one line.
+        `compact` suppresses all whitespace. `strict` rejects the documents formatting
+        would change the data of, see `jsonator.strict`.
+        """
+        if isinstance(indent, bool) or not isinstance(indent, (int, str, type(None))):
+            raise ValueError(f"Invalid indent: {indent!r}")
+        if backend not in (AUTO, *BACKENDS):
+            raise ValueError(f"Invalid backend: {backend!r}")
+
+        self.dump_args: dict[str, Any] = {
+            "sort_keys": bool(sort_keys),
+            "indent": None if compact else indent,
+            "ensure_ascii": bool(ensure_ascii),
+        }
+        if compact:
+            self.dump_args["separators"] = ",", ":"
+        self.backend = get_backend(select_backend(backend, self.dump_args))
+        self.strict = bool(strict)
+        self.mode_args = ModeArgs(
+            check=False, diff=False, color=False, backend=self.backend.name, strict=self.strict
+        )
+        # Checks don't serialize the documents which can be told apart without it
+        self.check_args = replace(self.mode_args, check=True)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.dump_args!r}, backend={self.backend.name!r})"
+
+    def format_str(self, text: str) -> str:
+        """Return the formatted document, `text` itself if it's already well formatted."""
+        _, output = self._format(text, self.mode_args)
+        return text if output is None else output
+
+    def format_bytes(self, data: bytes) -> bytes:
+        """Format a UTF-8 encoded document."""
+        text = data.decode(UTF_8)
+        formatted = self.format_str(text)
+        return data if formatted is text else formatted.encode(UTF_8)
+
+    def check_str(self, text: str) -> bool:
+        """Return whether the document is already well formatted."""
+        changed, _ = self._format(text, self.check_args)
+        return not changed
+
+    def check_bytes(self, data: bytes) -> bool:
+        """Return whether the UTF-8 encoded document is already well formatted."""
+        return self.check_str(data.decode(UTF_8))
+
+    def _format(self, text: str, mode_args: ModeArgs) -> tuple[bool, str | None]:
+        """Return whether the document changes and its output, if needed in `mode_args`."""
+        changed, output, error, _ = format_document(text, mode_args, self.dump_args)
+        if error is not None:
+            message, line, column = error
+            raise json.JSONDecodeError(message, text, offset(text, line, column))
+        return changed, output
+
+
+def offset(text: str, line: int, column: int) -> int:
+    """Return the index in `text` of a 1-based line and column."""
+    start = 0
+    for _ in range(line - 1):
+        start = text.index("\n", start) + 1
+    return start + column - 1
+
+
+# jsonatord creates formatters for the options of the requests
+@lru_cache(maxsize=FORMATTERS_CACHE_SIZE)
+def get_formatter(  # pylint: disable=too-many-arguments
+    *,
+    indent: int | str | None = 4,
+    sort_keys: bool = False,
+    ensure_ascii: bool = True,
+    compact: bool = False,
+    backend: str = AUTO,
+    strict: bool = False,
+) -> Formatter:
+    """Return the formatter for the options, created once."""
+    return Formatter(
+        indent=indent,
+        sort_keys=sort_keys,
+        ensure_ascii=ensure_ascii,
+        compact=compact,
+        backend=backend,
+        strict=strict,
+    )
+
+
+def format_str(text: str, **options: Any) -> str:
+    """Return the formatted document. See `Formatter` for the options."""
+    return get_formatter(**options).format_str(text)
+
+
+def format_bytes(data: bytes, **options: Any) -> bytes:
+    """Return the formatted UTF-8 encoded document. See `Formatter` for the options."""
+    return get_formatter(**options).format_bytes(data)
+
+
+def check_str(text: str, **options: Any) -> bool:
+    """Return whether the document is already well formatted. See `Formatter` for the options."""
+    return get_formatter(**options).check_str(text)
@@ -0,0 +1,288 @@
+"""
+JSON codecs.
+
+Third-party codecs are used when they can produce the same output as `json.dumps`
+for the requested `dump_args`. Documents they can't handle exactly (NaN, numbers out of
+range, lone surrogates, deep nesting) fall back to the standard library.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from functools import lru_cache
+from json.encoder import encode_basestring_ascii
+from typing import Any
+
+from jsonator.strict import strict_loads
+
+AUTO = "auto"
+STDLIB = "json"
+# In the order of preference for the automatic selection
+BACKENDS = ("orjson", "ujson", "simplejson", STDLIB)
+
+# Python renders floats as 1e+16, 1e-07 and 5e-05, orjson as 1e16, 1e-7 and 0.00005
+ORJSON_FLOATS = (re.compile(r"e-?\d"), re.compile(r"0\.0000"))
+UJSON_FLOATS = (re.compile(r"e-\d(?!\d)"),)
+NUMBER_CHARS = frozenset("0123456789.-")
+NUMBER_END = re.compile(r"[\d.eE+-]*")
+NON_ASCII = re.compile("[\x7f-\U0010ffff]+")
+# orjson parses integers beyond 64 bits as floats. To find long integers (but not long
+# fractions) quickly, the UTF-8 text is mapped to zeros for digits, dots and spaces.
+DIGITS_TABLE = bytes(
+    ord("0") if ord("0") <= byte <= ord("9") else byte if byte == ord(".") else ord(" ")
+    for byte in range(256)
+)
+LONG_INTEGER = b"0" * 19
+
+
+class BackendFallback(Exception):
+    """The backend can't reproduce the standard library result, use `json` instead."""
+
+
+def fix_floats(text: str, candidates: tuple[re.Pattern[str], ...]) -> str:
+    """
+    Render the floats in `text` the same way `json.dumps` does. `candidates` match
+    inside the floats which may be rendered differently, and inside strings.
+    """
+    spans = {}
+    for candidate in candidates:
+        for match in candidate.finditer(text):
+            start = match.start()
+            while start and text[start - 1] in NUMBER_CHARS:
+                start -= 1
+            spans[start] = NUMBER_END.match(text, start).end()  # type: ignore[union-attr]
+    if not spans:
+        return text
+
+    # Blank out escaped backslashes and quotes, so quotes only delimit strings
+    masked = text.replace("\\\\", "__").replace('\\"', "__") if "\\" in text else text
+    parts: list[str] = []
+    last = counted = quotes = 0
+    for start in sorted(spans):
+        quotes += masked.count('"', counted, start)
+        counted = start
+        if quotes % 2:
+            continue
+
+        parts.extend((text[last:start], float.__repr__(float(text[start : spans[start]]))))
+        last = spans[start]
+
+    parts.append(text[last:])
+    return "".join(parts)
+
+
+def _escape(match: re.Match[str]) -> str:
+    return encode_basestring_ascii(match.group())[1:-1]
+
+
+def escape_non_ascii(text: str) -> str:
+    """Escape non-ASCII characters in `text` the same way `json.dumps` does by default."""
+    if text.isascii() and "\x7f" not in text:
+        return text
+    return NON_ASCII.sub(_escape, text)
+
+
+def has_long_integer(text: str) -> bool:
+    """Return whether `text` may contain an integer of 19 digits or more."""
+    digits = text.encode("utf-8", "surrogatepass").translate(DIGITS_TABLE)
+    return digits.startswith(LONG_INTEGER) or b" " + LONG_INTEGER in digits
+
+
+def spaces(indent: int | str) -> int | None:
+    """Return the indentation width, or None if it's not made of spaces."""
+    if isinstance(indent, str):
+        return len(indent) if indent.strip(" ") == "" else None
+    return indent
+
+
+class Backend:
+    """The standard library codec, supports any `dump_args`."""
+
+    name = STDLIB
+
+    @classmethod
+    def supports(cls, dump_args: dict[str, Any]) -> bool:  # pylint: disable=unused-argument
+        """
+        Return whether the output for `dump_args` is identical to `json.dumps`.
+        Doesn't need the library, so it's checked before importing it.
+        """
+        return True
+
+    def loads(self, text: str) -> Any:
+        """Parse a document. Raises `JSONDecodeError` with the `json.loads` message."""
+        return json.loads(text)
+
+    def dumps(self, document: Any, dump_args: dict[str, Any]) -> str:
+        """Serialize a parsed document."""
+        return json.dumps(document, **dump_args)
+
+
+class OrjsonBackend(Backend):
+    """orjson, supports 2 spaces indentation or the compact layout."""
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        import orjson  # pylint: disable=import-outside-toplevel  # noqa: PLC0415
+
+        self.orjson = orjson
+
+    @classmethod
+    def supports(cls, dump_args: dict[str, Any]) -> bool:
+        indent = dump_args.get("indent")
+        separators = dump_args.get("separators")
+        if indent is None:
+            return separators is not None and tuple(separators) == (",", ":")
+        return spaces(indent) == 2 and separators is None  # noqa: PLR2004
+
+    def loads(self, text: str) -> Any:
+        if has_long_integer(text):
+            raise BackendFallback
+        try:
+            return self.orjson.loads(text)
+        except self.orjson.JSONDecodeError:
+            # NaN and Infinity, or an error to be reported with the json.loads message
+            raise BackendFallback from None
+
+    def dumps(self, document: Any, dump_args: dict[str, Any]) -> str:
+        option = 0
+        if dump_args.get("indent") is not None:
+            option |= self.orjson.OPT_INDENT_2
+        if dump_args.get("sort_keys"):
+            option |= self.orjson.OPT_SORT_KEYS
+
+        try:
+            text = fix_floats(self.orjson.dumps(document, option=option).decode(), ORJSON_FLOATS)
+        except self.orjson.JSONEncodeError:
+            raise BackendFallback from None
+
+        return escape_non_ascii(text) if dump_args.get("ensure_ascii", True) else text
+
+
+class UjsonBackend(Backend):
+    """
+    ujson, supports indentation with spaces or the compact layout.
+    Its parser accepts invalid documents, so the standard library one is used.
+    """
+
+    name = "ujson"
+
+    def __init__(self) -> None:
+        import ujson  # pylint: disable=import-outside-toplevel  # noqa: PLC0415
+
+        self.ujson = ujson
+
+    @classmethod
+    def supports(cls, dump_args: dict[str, Any]) -> bool:
+        indent = dump_args.get("indent")
+        separators = dump_args.get("separators")
+        if indent is None:
+            return separators is not None and tuple(separators) == (",", ":")
+        width = spaces(indent)
+        return width is not None and width > 0 and separators is None
+
+    def dumps(self, document: Any, dump_args: dict[str, Any]) -> str:
+        try:
+            text = self.ujson.dumps(
+                document,
+                ensure_ascii=False,
+                escape_forward_slashes=False,
+                indent=spaces(dump_args.get("indent") or 0) or 0,
+                sort_keys=bool(dump_args.get("sort_keys")),
+            )
+        except (OverflowError, TypeError, ValueError, UnicodeError):
+            raise BackendFallback from None
+
+        text = fix_floats(text, UJSON_FLOATS)
+        return escape_non_ascii(text) if dump_args.get("ensure_ascii", True) else text
+
+
+class SimplejsonBackend(Backend):
+    """simplejson, supports any `dump_args`."""
+
+    name = "simplejson"
+
+    def __init__(self) -> None:
+        import simplejson  # pylint: disable=import-outside-toplevel  # noqa: PLC0415
+
+        self.simplejson = simplejson
+
+    def loads(self, text: str) -> Any:
+        # simplejson skips the BOM, json.loads reports it
+        if text.startswith("\ufeff"):
+            raise BackendFallback
+        try:
+            return self.simplejson.loads(text)
+        except self.simplejson.JSONDecodeError:
+            raise BackendFallback from None
+
+    def dumps(self, document: Any, dump_args: dict[str, Any]) -> str:
+        try:
+            return self.simplejson.dumps(document, allow_nan=True, **dump_args)
+        except (TypeError, ValueError, RecursionError):
+            raise BackendFallback from None
+
+
+BACKEND_CLASSES: dict[str, type[Backend]] = {
+    "orjson": OrjsonBackend,
+    "ujson": UjsonBackend,
+    "simplejson": SimplejsonBackend,
+    STDLIB: Backend,
+}
+
+
+@lru_cache(maxsize=None)
+def get_backend(name: str) -> Backend:
+    """Return the backend by name. Raises `ImportError` if the library is not installed."""
+    return BACKEND_CLASSES[name]()
+
+
+def is_available(name: str) -> bool:
+    """Return whether the library of the backend is installed."""
+    try:
+        get_backend(name)
+    except ImportError:
+        return False
+    return True
+
+
+def select_backend(name: str, dump_args: dict[str, Any]) -> str:
+    """
+    Return the name of the backend to use for `dump_args`: the requested one if it
+    supports them, the fastest installed one for "auto", or the standard library.
+    Raises `ImportError` if the requested backend is not installed.
+    """
+    if name != AUTO:
+        return name if get_backend(name).supports(dump_args) else STDLIB
+
+    # Only the libraries of the backends supporting the options are imported
+    for candidate in BACKENDS:
+        if BACKEND_CLASSES[candidate].supports(dump_args) and is_available(candidate):
+            return candidate
+    return STDLIB
+
+
+def loads(text: str, backend: Backend, strict: bool = False) -> tuple[Any, Backend]:
+    """
+    Parse `text` and return the document with the backend able to serialize it.
+    With `strict`, documents with duplicate keys or numbers which can't be represented
+    exactly raise `LossyDocumentError`, see `jsonator.strict`.
+    """
+    if strict:
+        # The hooks are only available in the standard library, which also writes the
+        # document: other backends would write NaN and Infinity as null
+        return strict_loads(text), get_backend(STDLIB)
+    try:
+        return backend.loads(text), backend
+    except BackendFallback:
+        backend = get_backend(STDLIB)
+        return backend.loads(text), backend
+
+
+def dumps(document: Any, dump_args: dict[str, Any], backend: Backend) -> str:
+    """Serialize `document`, falling back to the standard library if needed."""
+    try:
+        return backend.dumps(document, dump_args)
+    except BackendFallback:
+        return get_backend(STDLIB).dumps(document, dump_args)
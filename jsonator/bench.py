@@ -0,0 +1,380 @@
+"""
+Benchmarks
+
+Run with `jsonator bench` or `python -m jsonator.bench`.
+
+Synthetic corpora are written to a temporary directory, already formatted or messy,
+and formatted by `python -m jsonator` in check, diff and write modes. Every run gets
+a fresh copy of the corpus. Files/s, MB/s and the peak RSS of the process are reported
+and can be exported as JSON to compare versions.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from jsonator.cache import get_version
+from jsonator.enum import ReturnCode
+from jsonator.verify import is_formatted
+
+DUMP_ARGS: dict[str, Any] = {"sort_keys": False, "indent": 4, "ensure_ascii": True}
+MESSY_DUMP_ARGS: dict[str, Any] = {"sort_keys": False, "indent": None, "ensure_ascii": False}
+
+MODES = {"check": ["--check"], "diff": ["--diff"], "write": []}
+STATES = ("formatted", "messy")
+UNICODE_WORDS = (
+    "naïve",
+    "Größe",
+    "日本語のテキスト",
+    "Ελληνικά",
+    "עברית",
+    "😀🎉",
+    "𝄞 music",
+    "Ñandú",
+)
+MB = 1024 * 1024
+ROOT = str(Path(__file__).resolve().parent.parent)
+# Exit statuses of the runs which went through: check and diff modes find messy files
+SUCCESS_STATUSES = (
+    ReturnCode.NOTHING_WOULD_CHANGE.value,
+    ReturnCode.SOME_FILES_WOULD_BE_REFORMATTED.value,
+)
+
+
+class BenchError(Exception):
+    """A benchmarked run failed, so its timings don't measure formatting."""
+
+
+def make_corpora(scale: int = 1) -> dict[str, Any]:
+    """Generate synthetic documents of different shapes."""
+    rnd = random.Random(0)
+    return {
+        "records": [
+            {
+                "id": i,
+                "name": f"user{i}",
+                "tags": ["a", "b", "c"],
+                "score": rnd.random(),
+                "nested": {"x": i, "y": [1, 2, {"z": None}]},
+                "ok": True,
+            }
+            for i in range(20000 * scale)
+        ],
+        "coordinates": [[rnd.random(), rnd.random()] for _ in range(50000 * scale)],
+        "wide objects": [
+            {f"key{j}": j if j % 3 else f"value{j}" for j in range(30)} for _ in range(5000 * scale)
+        ],
+        "flat array": list(range(300000 * scale)),
+    }
+
+
+def best_of(func: Callable[..., Any], *args: Any, repeat: int = 3) -> float:
+    """Return the best wall time of `repeat` calls."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def compare_output(text: str, parsed: Any) -> bool:
+    """Check the document the way it's done without the verification engine."""
+    return text == json.dumps(parsed, **DUMP_ARGS) + "\n"
+
+
+def bench_verify(scale: int = 1) -> None:
+    """Compare checking already formatted documents with and without re-serialization."""
+    for name, document in make_corpora(scale).items():
+        text = json.dumps(document, **DUMP_ARGS) + "\n"
+        parsed = json.loads(text)
+        compare = best_of(compare_output, text, parsed)
+        verify = best_of(is_formatted, text, parsed, DUMP_ARGS)
+        print(  # noqa: T201
+            f"{name:<14} {len(text) / 1e6:7.1f} MB  "
+            f"dumps+compare {compare:6.3f}s  verify {verify:6.3f}s  x{compare / verify:.1f}"
+        )
+
+
+def tiny_files(rnd: random.Random, scale: float) -> Iterator[tuple[str, Any]]:
+    """Many small configuration-like files in nested directories."""
+    for i in range(max(1, int(5000 * scale))):
+        yield f"{i % 50}/{i}.json", {
+            "name": f"package{i}",
+            "version": f"{rnd.randint(0, 9)}.{rnd.randint(0, 99)}.{rnd.randint(0, 999)}",
+            "private": rnd.random() < 0.5,
+            "dependencies": {f"dep{j}": f"^{j}.0.0" for j in range(rnd.randint(0, 5))},
+        }
+
+
+def huge_files(rnd: random.Random, scale: float) -> Iterator[tuple[str, Any]]:
+    """A few big files of records."""
+    for i in range(2):
+        yield f"{i}.json", [
+            {
+                "id": j,
+                "name": f"user{j}",
+                "score": rnd.random(),
+                "tags": ["a", "b", "c"][: j % 4],
+                "location": {"lat": rnd.uniform(-90, 90), "lon": rnd.uniform(-180, 180)},
+                "active": j % 3 == 0,
+            }
+            for j in range(max(1, int(50000 * scale)))
+        ]
+
+
+def nested_files(rnd: random.Random, scale: float) -> Iterator[tuple[str, Any]]:
+    """Deeply nested documents."""
+    for i in range(max(1, int(200 * scale))):
+        document: Any = {"leaf": rnd.random()}
+        for depth in range(rnd.randint(50, 300)):
+            document = {f"level{depth}": document, "n": depth} if depth % 2 else [document, depth]
+        yield f"{i}.json", document
+
+
+def unicode_files(rnd: random.Random, scale: float) -> Iterator[tuple[str, Any]]:
+    """Documents made mostly of non-ASCII strings."""
+    for i in range(max(1, int(500 * scale))):
+        yield f"{i}.json", {
+            rnd.choice(UNICODE_WORDS) + str(j): " ".join(rnd.choices(UNICODE_WORDS, k=8))
+            for j in range(50)
+        }
+
+
+CORPORA: dict[str, Callable[[random.Random, float], Iterator[tuple[str, Any]]]] = {
+    "tiny": tiny_files,
+    "huge": huge_files,
+    "nested": nested_files,
+    "unicode": unicode_files,
+}
+
+
+@dataclass
+class Result:  # pylint: disable=too-many-instance-attributes
+    """Measurements of a benchmark case."""
+
+    corpus: str
+    state: str
+    mode: str
+    files: int
+    bytes: int
+    seconds: float
+    files_per_second: float
+    mb_per_second: float
+    peak_rss: int | None
+
+    def __str__(self) -> str:
+        rss = "-" if self.peak_rss is None else f"{self.peak_rss / MB:.1f}"
+        return (
+            f"{self.corpus:<8} {self.state:<9} {self.mode:<5} {self.files:>6} files "
+            f"{self.bytes / MB:8.1f} MB {self.seconds:8.3f}s {self.files_per_second:9.0f} files/s "
+            f"{self.mb_per_second:7.1f} MB/s {rss:>7} MB RSS"
+        )
+
+
+def write_corpus(directory: Path, corpus: str, scale: float, formatted: bool) -> tuple[int, int]:
+    """Write the files of the corpus. Return the number of files and their total size."""
+    dump_args = DUMP_ARGS if formatted else MESSY_DUMP_ARGS
+    files = size = 0
+    for name, document in CORPORA[corpus](random.Random(0), scale):
+        path = directory / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        text = json.dumps(document, **dump_args) + ("\n" if formatted else "")
+        size += path.write_bytes(text.encode("utf-8"))
+        files += 1
+    return files, size
+
+
+def exit_code(status: int) -> int:
+    """Return the exit code of a process from its wait status, minus the signal if killed."""
+    if sys.version_info >= (3, 9):
+        return os.waitstatus_to_exitcode(status)
+    return os.WEXITSTATUS(status) if os.WIFEXITED(status) else -os.WTERMSIG(status)
+
+
+def run_process(command: list[str]) -> tuple[float, int | None]:
+    """
+    Run the command. Return the wall time and the peak RSS in bytes, if available.
+    Raises `BenchError` if the command fails.
+    """
+    # Run this copy of jsonator, even if another one is installed
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join(filter(None, (ROOT, os.getenv("PYTHONPATH")))),
+    }
+    start = time.perf_counter()
+    with subprocess.Popen(  # noqa: S603
+        command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=env
+    ) as process:
+        rusage = None
+        if hasattr(os, "wait4"):
+            _, status, rusage = os.wait4(process.pid, 0)
+            process.returncode = exit_code(status)
+        else:
+            process.wait()
+        elapsed = time.perf_counter() - start
+
+    if process.returncode not in SUCCESS_STATUSES:
+        raise BenchError(f"{' '.join(command)} exited with status {process.returncode}")
+    if rusage is None:
+        return elapsed, None
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return elapsed, rusage.ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+
+
+def run_case(
+    source: Path, work: Path, mode: str, repeat: int, options: list[str]
+) -> tuple[float, int | None]:
+    """Format fresh copies of `source` `repeat` times. Return the best time and peak RSS."""
+    command = [sys.executable, "-m", "jsonator", str(work), "--recursive", "--no-cache"]
+    command += MODES[mode] + options
+    timings = []
+    peak_rss = None
+    for _ in range(repeat):
+        shutil.rmtree(work, ignore_errors=True)
+        shutil.copytree(source, work)
+        elapsed, rss = run_process(command)
+        timings.append(elapsed)
+        if rss is not None:
+            peak_rss = max(rss, peak_rss or 0)
+    shutil.rmtree(work, ignore_errors=True)
+    return min(timings), peak_rss
+
+
+def run_suite(
+    corpora: list[str], modes: list[str], scale: float, repeat: int, options: list[str]
+) -> Iterator[Result]:
+    """Generate the corpora and yield the measurements of every case."""
+    with tempfile.TemporaryDirectory(prefix="jsonator-bench-") as tmp_dir:
+        for corpus in corpora:
+            for state in STATES:
+                source = Path(tmp_dir, corpus, state)
+                files, size = write_corpus(source, corpus, scale, state == "formatted")
+                for mode in modes:
+                    seconds, peak_rss = run_case(
+                        source, Path(tmp_dir, "work"), mode, repeat, options
+                    )
+                    yield Result(
+                        corpus,
+                        state,
+                        mode,
+                        files,
+                        size,
+                        seconds,
+                        files / seconds,
+                        size / MB / seconds,
+                        peak_rss,
+                    )
+                shutil.rmtree(source)
+
+
+def compare_results(results: list[Result], baseline_file: Path) -> None:
+    """Print the throughput of every case relative to a previous export."""
+    baseline = {
+        (old["corpus"], old["state"], old["mode"]): old
+        for old in json.loads(baseline_file.read_text(encoding="utf-8"))["results"]
+    }
+    for result in results:
+        old = baseline.get((result.corpus, result.state, result.mode))
+        if old is None:
+            continue
+        ratio = result.files_per_second / old["files_per_second"]
+        print(  # noqa: T201
+            f"{result.corpus:<8} {result.state:<9} {result.mode:<5} "
+            f"x{ratio:.2f} ({'faster' if ratio >= 1 else 'slower'})"
+        )
+
+
+def make_parser() -> argparse.ArgumentParser:
+    """Build the command line parser"""
+    arg_parser = argparse.ArgumentParser(
+        prog="jsonator bench", description="Measure the throughput of jsonator."
+    )
+    arg_parser.add_argument(
+        "--corpus",
+        action="append",
+        choices=tuple(CORPORA),
+        help="Corpus to run. Can be given several times. Default: all",
+    )
+    arg_parser.add_argument(
+        "--mode",
+        action="append",
+        choices=tuple(MODES),
+        help="Mode to run. Can be given several times. Default: all",
+    )
+    arg_parser.add_argument(
+        "--scale", type=float, default=1.0, help="Multiply the size of the corpora. Default: 1"
+    )
+    arg_parser.add_argument(
+        "--repeat", type=int, default=3, help="Number of runs, the best is kept. Default: 3"
+    )
+    arg_parser.add_argument(
+        "--jobs", "-j", type=int, default=1, help="Number of worker processes. Default: 1"
+    )
+    arg_parser.add_argument("--backend", help="JSON backend passed to jsonator.")
+    arg_parser.add_argument("--output", "-o", type=Path, help="Export the results as JSON.")
+    arg_parser.add_argument(
+        "--compare", type=Path, help="Compare the throughput with results exported before."
+    )
+    arg_parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Only compare the check of formatted documents with re-serialization.",
+    )
+    return arg_parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmarks"""
+    args = make_parser().parse_args(argv)
+    if args.verify:
+        bench_verify(max(1, int(args.scale)))
+        return 0
+
+    options = ["--jobs", str(args.jobs)]
+    if args.backend:
+        options += ["--backend", args.backend]
+
+    results = []
+    try:
+        for result in run_suite(
+            args.corpus or list(CORPORA), args.mode or list(MODES), args.scale, args.repeat, options
+        ):
+            print(result)  # noqa: T201
+            results.append(result)
+    except BenchError as exc:
+        print(f"error: {exc}", file=sys.stderr)  # noqa: T201
+        return ReturnCode.INTERNAL_ERROR.value
+
+    if args.output:
+        export = {
+            "jsonator": get_version(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "scale": args.scale,
+            "repeat": args.repeat,
+            "options": options,
+            "results": [asdict(result) for result in results],
+        }
+        args.output.write_text(json.dumps(export, indent=4) + "\n", encoding="utf-8")
+
+    if args.compare:
+        compare_results(results, args.compare)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""
+Persistent cache of files known to be well formatted.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable
+
+from jsonator.version import __version__
+
+CACHE_DIR_ENV = "JSONATOR_CACHE_DIR"
+
+
+def get_version() -> str:
+    """Return the jsonator version."""
+    # Not read from the package metadata: importlib.metadata takes longer to import
+    # than a whole run on a few files
+    return __version__
+
+
+def get_cache_dir() -> Path:
+    """
+    Return the default cache directory.
+    `JSONATOR_CACHE_DIR` takes precedence over `XDG_CACHE_HOME` and `~/.cache`.
+    Each jsonator version gets its own subdirectory.
+    """
+    cache_dir = os.environ.get(CACHE_DIR_ENV)
+    if cache_dir:
+        return Path(cache_dir)
+
+    xdg_cache_home = os.environ.get("XDG_CACHE_HOME")
+    base = Path(xdg_cache_home) if xdg_cache_home else Path.home() / ".cache"
+    return base / "jsonator" / get_version()
+
+
+def get_cache_key(dump_args: dict[str, Any]) -> str:
+    """Return a key that changes whenever the version or the formatting options change."""
+    options = json.dumps([get_version(), dump_args], sort_keys=True)
+    return hashlib.sha256(options.encode()).hexdigest()[:32]
+
+
+def hash_digest(path: Path) -> str:
+    """Return the hash digest of the file contents."""
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+@dataclass
+class FileData:
+    """Cached file metadata"""
+
+    st_mtime: float
+    st_size: int
+    hash: str
+
+
+@dataclass
+class Cache:
+    """Cache of well formatted files for one set of formatting options."""
+
+    cache_file: Path
+    file_data: dict[str, FileData] = field(default_factory=dict)
+
+    @classmethod
+    def read(cls, dump_args: dict[str, Any], cache_dir: Path | None = None) -> Cache:
+        """Read the cache if it exists and is valid, otherwise return an empty cache."""
+        cache_dir = cache_dir or get_cache_dir()
+        cache_file = cache_dir / f"cache.{get_cache_key(dump_args)}.json"
+        try:
+            raw = json.loads(cache_file.read_text(encoding="utf-8"))
+            file_data = {key: FileData(*value) for key, value in raw.items()}
+        except (OSError, ValueError, TypeError):
+            file_data = {}
+
+        return cls(cache_file, file_data)
+
+    @staticmethod
+    def get_file_data(path: Path) -> FileData:
+        """Return file data for the file at `path`."""
+        stat = path.stat()
+        return FileData(stat.st_mtime, stat.st_size, hash_digest(path))
+
+    def is_changed(self, source: Path) -> bool:
+        """Check if the file has changed since it was cached."""
+        old = self.file_data.get(str(source.resolve()))
+        if old is None:
+            return True
+
+        stat = source.stat()
+        if stat.st_size != old.st_size:
+            return True
+
+        if stat.st_mtime != old.st_mtime:
+            return hash_digest(source) != old.hash
+
+        return False
+
+    def filtered_cached(self, sources: Iterable[Path]) -> tuple[list[Path], list[Path]]:
+        """Split `sources` into files that changed since they were cached and those that didn't."""
+        changed: list[Path] = []
+        done: list[Path] = []
+        for source in sources:
+            try:
+                (changed if self.is_changed(source) else done).append(source)
+            except OSError:
+                changed.append(source)
+
+        return changed, done
+
+    def write(self, sources: Iterable[Path]) -> None:
+        """Update the cache file with the given well formatted files."""
+        for source in sources:
+            try:
+                self.file_data[str(source.resolve())] = self.get_file_data(source)
+            except OSError:
+                continue
+
+        raw = {
+            key: [data.st_mtime, data.st_size, data.hash] for key, data in self.file_data.items()
+        }
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                "w", dir=self.cache_file.parent, delete=False, encoding="utf-8"
+            ) as tmp_file:
+                json.dump(raw, tmp_file)
+            os.replace(tmp_file.name, self.cache_file)
+        except OSError:
+            pass
@@ -0,0 +1,797 @@
+"""
+Command line interface.
+
+Modules only needed by some options or paths (directories, git, config files, schemas,
+reports, timings, the process pool, the cache, the asyncio engine, the diffs, watch mode)
+are imported when they are used.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import signal
+import sys
+from contextlib import nullcontext
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, ContextManager, TextIO
+
+from jsonator.backend import AUTO, BACKENDS, select_backend
+from jsonator.enum import ReturnCode
+from jsonator.jsonator import STDIN, format_stdin
+from jsonator.models import (
+    DEFAULT_EXCLUDES,
+    DEFAULT_INCLUDES,
+    DIFF_STRUCTURAL,
+    DIFF_TEXT,
+    REPORT_FORMATS,
+    ModeArgs,
+)
+from jsonator.report import Report
+from jsonator.version import __version__
+from jsonator.write import FSYNC_NEVER, FSYNC_POLICIES
+
+if TYPE_CHECKING:
+    from jsonator.config import ConfigResolver
+    from jsonator.reporters import Reporter
+    from jsonator.stats import Stats
+
+# Options of config files are parsed as unset first, to tell the given ones from the defaults
+UNSET = object()
+
+LOG_LEVELS = {
+    0: logging.CRITICAL,
+    1: logging.ERROR,
+    2: logging.WARNING,
+    3: logging.INFO,
+    4: logging.DEBUG,
+}
+
+
+def schema_mapping(value: str) -> tuple[str, str]:
+    """Parse a GLOB=PATH schema mapping."""
+    pattern, separator, path = value.partition("=")
+    if not separator or not pattern or not path:
+        raise argparse.ArgumentTypeError(f"expected GLOB=PATH, got {value!r}")
+    return pattern, path
+
+
+def make_parser() -> argparse.ArgumentParser:
+    """Build the command line parser"""
+    arg_parser = argparse.ArgumentParser(
+        prog="jsonator", formatter_class=argparse.RawTextHelpFormatter
+    )
+    arg_parser.add_argument(
+        "paths",
+        nargs="*",
+        type=Path,
+        metavar="path",
+        help="Paths to the JSON files or directories. - formats the standard input to the\n"
+        "standard output.",
+    )
+    arg_parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    arg_parser.add_argument(
+        "--files-from",
+        type=Path,
+        default=None,
+        metavar="FILE",
+        help="Also format the paths listed in FILE, separated by NUL characters\n"
+        "(e.g. `git ls-files -z`). - reads them from the standard input.",
+    )
+    arg_parser.add_argument("--recursive", "-r", action="store_true", help="Scan subdirectories")
+    arg_parser.add_argument(
+        "--check",
+        action="store_true",
+        default=False,
+        help="""Don't write the files back, just return the status.
+Return code 0 means nothing would change.
+Return code 1 means some files would be reformatted.
+Return code 122 means file not found.
+Return code 123 means there was an internal error.""",
+    )
+    arg_parser.add_argument(
+        "--diff",
+        action="store_true",
+        default=False,
+        help="Don't write the files back, just output a diff for each file on stdout.",
+    )
+    arg_parser.add_argument(
+        f"--diff={DIFF_STRUCTURAL}",
+        dest="diff",
+        action="store_const",
+        const=DIFF_STRUCTURAL,
+        help="Like `--diff`, but compare the documents by JSON path: only changed values "
+        "and reordered keys are output, not whitespace.",
+    )
+    arg_parser.add_argument(
+        "--color",
+        action="store_true",
+        default=False,
+        help="Show colored diff. Only applies when `--diff` is given.",
+    )
+    arg_parser.add_argument(
+        "--stream",
+        action="store_true",
+        default=False,
+        help="Format files with the streaming formatter to keep memory usage flat on huge files.",
+    )
+    arg_parser.add_argument(
+        "--sort-keys",
+        action="store_true",
+        default=False,
+        help="Sort the output of dictionaries alphabetically by key.",
+    )
+    arg_parser.add_argument(
+        "--no-ensure-ascii",
+        dest="ensure_ascii",
+        action="store_false",
+        help="Disable escaping of non-ASCII characters.",
+    )
+    group = arg_parser.add_mutually_exclusive_group()
+    group.add_argument(
+        "--indent",
+        type=int,
+        default=4,
+        help="Separate items with newlines and use this number of spaces for indentation.",
+    )
+    group.add_argument(
+        "--tab",
+        dest="indent",
+        action="store_const",
+        const="\t",
+        help="Separate items with newlines and use tabs for indentation.",
+    )
+    group.add_argument(
+        "--no-indent",
+        dest="indent",
+        action="store_const",
+        const=None,
+        help="Separate items with spaces rather than newlines.",
+    )
+    group.add_argument(
+        "--compact", action="store_true", help="Suppress all whitespace separation (most compact)."
+    )
+    arg_parser.add_argument(
+        "--backend",
+        choices=(AUTO, *BACKENDS),
+        default=AUTO,
+        help="JSON library used to parse and serialize documents. The output is the same, "
+        "the standard library\nis used when the backend can't produce it. Default: the "
+        "fastest installed one.",
+    )
+    arg_parser.add_argument(
+        "--schema",
+        type=Path,
+        default=None,
+        metavar="PATH",
+        help="Validate every document against this JSON Schema. Requires jsonschema.",
+    )
+    arg_parser.add_argument(
+        "--schema-map",
+        action="append",
+        type=schema_mapping,
+        metavar="GLOB=PATH",
+        help="Validate the files matching GLOB against the JSON Schema at PATH instead.\n"
+        "Can be given several times, the first matching GLOB wins.",
+    )
+    arg_parser.add_argument(
+        "--strict",
+        action="store_true",
+        help="Fail on duplicate keys and numbers which can't be represented exactly,\n"
+        "which formatting would drop or round. Parses with the standard library.",
+    )
+    arg_parser.add_argument(
+        "--no-config",
+        dest="config",
+        action="store_false",
+        help="Don't read the options of pyproject.toml ([tool.jsonator]) and .jsonator.toml\n"
+        "files in the directories of the files and their parents.",
+    )
+    arg_parser.add_argument(
+        "--include",
+        action="append",
+        metavar="GLOB",
+        help="Format files matching the pattern (.gitignore syntax). Can be given several times."
+        f" Default: {' '.join(DEFAULT_INCLUDES)}",
+    )
+    arg_parser.add_argument(
+        "--exclude",
+        action="append",
+        metavar="GLOB",
+        help="Skip files and directories matching the pattern (.gitignore syntax)."
+        " Can be given several times. Replaces the default excludes:\n"
+        + " ".join(DEFAULT_EXCLUDES),
+    )
+    arg_parser.add_argument(
+        "--extend-exclude",
+        action="append",
+        metavar="GLOB",
+        help="Like --exclude, but adds the patterns to the default excludes.",
+    )
+    arg_parser.add_argument(
+        "--no-gitignore",
+        dest="gitignore",
+        action="store_false",
+        default=True,
+        help="Don't skip files ignored by .gitignore files.",
+    )
+    git_group = arg_parser.add_mutually_exclusive_group()
+    git_group.add_argument(
+        "--changed-since",
+        metavar="REV",
+        default=None,
+        help="Only format JSON files changed since the git revision, including uncommitted ones.",
+    )
+    git_group.add_argument(
+        "--staged",
+        action="store_true",
+        default=False,
+        help="Only format JSON files staged for commit in git.",
+    )
+    arg_parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=None,
+        help="Number of parallel worker processes. Defaults to the number of CPUs.",
+    )
+    arg_parser.add_argument(
+        "--io-concurrency",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Read and write up to N files at once with asyncio, while --jobs processes parse\n"
+        "and serialize them. Useful on slow network filesystems. Not used with --stream.",
+    )
+    arg_parser.add_argument(
+        "--no-cache",
+        dest="cache",
+        action="store_false",
+        help="Don't read or write the cache of well formatted files.",
+    )
+    arg_parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        help="""Directory of the cache of well formatted files.
+Defaults to $JSONATOR_CACHE_DIR or the user cache directory.""",
+    )
+    arg_parser.add_argument(
+        "--watch",
+        action="store_true",
+        default=False,
+        help="Keep running and format the files again when they change.",
+    )
+    arg_parser.add_argument(
+        "--debounce",
+        type=float,
+        default=0.2,
+        metavar="SECONDS",
+        help="With --watch, wait until no file changed for this long before formatting.\n"
+        "Default: 0.2",
+    )
+    arg_parser.add_argument(
+        "--fsync",
+        choices=FSYNC_POLICIES,
+        default=FSYNC_NEVER,
+        help="When to flush reformatted files to the disk: never (leave it to the system),\n"
+        "per-file (after every file) or batched (all together, once the files are written).\n"
+        "Default: never",
+    )
+    arg_parser.add_argument(
+        "--stats",
+        action="store_true",
+        default=False,
+        help="Print the time spent in every phase (discovery, reading, parsing, dumping,\n"
+        "diffing, writing) and the slowest files.",
+    )
+    arg_parser.add_argument(
+        "--slowest",
+        type=int,
+        default=10,
+        metavar="N",
+        help="Number of the slowest files printed by --stats. Default: 10",
+    )
+    arg_parser.add_argument(
+        "--profile-output",
+        type=Path,
+        default=None,
+        metavar="PATH",
+        help="Write the timings of every phase of every file as a Chrome trace (JSON).",
+    )
+    arg_parser.add_argument(
+        "--report-format",
+        choices=REPORT_FORMATS,
+        default=None,
+        help="Write a report of every file: its status, the position of its error, "
+        "the bytes read and written and the time spent.",
+    )
+    arg_parser.add_argument(
+        "--report-file",
+        default="-",
+        metavar="PATH",
+        help='Write the report to PATH instead of the standard output ("-").',
+    )
+    arg_parser.add_argument(
+        "--verbosity",
+        "-v",
+        type=int,
+        default=3,
+        choices=range(5),
+        metavar="[0-4]",
+        help="Set verbosity level. 0=quiet, 1=error, 2=warn, 3=info (default), 4=debug",
+    )
+
+    return arg_parser
+
+
+def collect_files(args: argparse.Namespace) -> list[Path]:
+    """Return the JSON files to format. Raises `GitError` if git can't list changed files."""
+    files: list[Path] = []
+    for path in args.paths:
+        if args.changed_since is not None or args.staged:
+            from jsonator.git import (  # pylint: disable=import-outside-toplevel  # noqa: PLC0415
+                changed_files,
+            )
+
+            files.extend(
+                changed_files(
+                    path,
+                    args.changed_since,
+                    args.staged,
+                    args.recursive,
+                    include=args.include or DEFAULT_INCLUDES,
+                    exclude=DEFAULT_EXCLUDES if args.exclude is None else args.exclude,
+                    extend_exclude=args.extend_exclude or (),
+                )
+            )
+        elif path.is_dir():
+            # pylint: disable-next=import-outside-toplevel
+            from jsonator.discovery import iter_files  # noqa: PLC0415
+
+            files.extend(
+                iter_files(
+                    path,
+                    recursive=args.recursive,
+                    include=args.include or DEFAULT_INCLUDES,
+                    exclude=DEFAULT_EXCLUDES if args.exclude is None else args.exclude,
+                    extend_exclude=args.extend_exclude or (),
+                    gitignore=args.gitignore,
+                )
+            )
+        else:
+            files.append(path)
+
+    # Overlapping paths give the same files
+    return list(dict.fromkeys(files)) if len(args.paths) > 1 else files
+
+
+def read_files_from(path: Path) -> list[Path]:
+    """Return the NUL separated paths listed in the file, or the standard input for -."""
+    data = sys.stdin.buffer.read() if path == STDIN else path.read_bytes()
+    return [Path(os.fsdecode(name)) for name in data.split(b"\0") if name]
+
+
+def resolve_paths(parser: argparse.ArgumentParser, args: argparse.Namespace) -> list[Path]:
+    """Return the paths given on the command line and in --files-from."""
+    paths = list(args.paths)
+    if args.files_from is None:
+        if not paths:
+            parser.error("the following arguments are required: path")
+        elif STDIN in paths and (
+            len(paths) > 1 or args.watch or args.changed_since is not None or args.staged
+        ):
+            parser.error("- can't be combined with other paths, --watch or git options")
+        return paths
+
+    if args.files_from == STDIN and STDIN in paths:
+        parser.error("- can't be combined with --files-from -")
+    try:
+        paths.extend(read_files_from(args.files_from))
+    except OSError as exc:
+        parser.error(f"can't read --files-from: {exc}")
+    if STDIN in paths:
+        parser.error("- can't be combined with --files-from")
+    return paths
+
+
+def make_dump_args(args: argparse.Namespace) -> dict[str, Any]:
+    """Return the arguments of `json.dumps` for the command line options"""
+    dump_args: dict[str, Any] = {
+        "sort_keys": args.sort_keys,
+        "indent": args.indent,
+        "ensure_ascii": args.ensure_ascii,
+    }
+
+    if args.compact:
+        dump_args["indent"] = None
+        dump_args["separators"] = ",", ":"
+
+    return dump_args
+
+
+def parse_args(parser: argparse.ArgumentParser, argv: list[str]) -> argparse.Namespace:
+    """
+    Parse the command line. `overrides` gets the options also set by config files which
+    are given on the command line, the others get their defaults.
+    """
+    from jsonator.config import OPTIONS  # pylint: disable=import-outside-toplevel  # noqa: PLC0415
+
+    # --schema-map is appended to, so it starts from None, which it can't be given as
+    unset = {dest: UNSET for dest in OPTIONS.values() if dest != "schema_map"}
+    args = parser.parse_args(argv, argparse.Namespace(**unset))
+    args.overrides = {}
+    for dest in OPTIONS.values():
+        value = getattr(args, dest)
+        if value is UNSET:
+            setattr(args, dest, parser.get_default(dest))
+        elif value is not None or dest != "schema_map":
+            args.overrides[dest] = value
+    return args
+
+
+def configure(args: argparse.Namespace, options: dict[str, Any]) -> argparse.Namespace:
+    """Return the options of the command line over the `options` of config files."""
+    values = {**vars(args), **options, **args.overrides}
+    # --indent, --tab and --no-indent are exclusive with --compact: the one given wins over
+    # the other one of config files
+    if "indent" in args.overrides and "compact" not in args.overrides:
+        values["compact"] = False
+    elif "compact" in args.overrides and "indent" not in args.overrides:
+        values["indent"] = args.indent
+    return argparse.Namespace(**values)
+
+
+def group_files(
+    args: argparse.Namespace, files: list[Path], resolver: ConfigResolver | None
+) -> list[tuple[argparse.Namespace, list[Path]]]:
+    """
+    Group the files by the options of their config files, resolved once per directory.
+    Raises `ConfigError` if a config file is invalid.
+    """
+    if resolver is None:
+        return [(args, files)]
+
+    # Not resolved: symbolic links get the options of the directory they are in, and the
+    # standard input the ones of the current directory. Strings hash faster than paths.
+    directories: dict[str, list[Path]] = {}
+    for path in files:
+        directories.setdefault(os.path.dirname(path), []).append(path)
+
+    groups: dict[tuple[tuple[str, Any], ...], tuple[argparse.Namespace, list[Path]]] = {}
+    for directory, paths in directories.items():
+        options = resolver.options(Path(os.path.abspath(directory)))
+        key = tuple(sorted(options.items()))
+        if key not in groups:
+            groups[key] = configure(args, options), []
+        groups[key][1].extend(paths)
+
+    if len(groups) == 1:
+        # Keep the order of the files
+        return [(group_args, files) for group_args, _ in groups.values()]
+    return list(groups.values())
+
+
+def discovery_errors() -> tuple[type[Exception], ...]:
+    """Return the errors of listing the files and reading their config files."""
+    # Imported here, once an error is raised: most runs don't use git
+    from jsonator.config import (  # pylint: disable=import-outside-toplevel  # noqa: PLC0415
+        ConfigError,
+    )
+    from jsonator.git import GitError  # pylint: disable=import-outside-toplevel  # noqa: PLC0415
+
+    return GitError, ConfigError
+
+
+def make_settings(
+    args: argparse.Namespace, reporter: Reporter | None = None
+) -> tuple[ModeArgs, dict[str, Any]]:
+    """
+    Return the mode and dump arguments of the options. Raises `ImportError` if the
+    requested backend is not installed.
+    """
+    dump_args = make_dump_args(args)
+    backend = select_backend(args.backend, dump_args)
+    logging.getLogger(__name__).debug("Using the %s backend", backend)
+    jobs = args.jobs
+    if jobs is None:
+        # pylint: disable-next=import-outside-toplevel
+        from jsonator.concurrency import default_jobs  # noqa: PLC0415
+
+        jobs = default_jobs()
+
+    mode_args = ModeArgs(
+        args.check,
+        bool(args.diff),
+        args.color,
+        args.stream,
+        backend,
+        stats=args.stats or args.profile_output is not None,
+        trace=args.profile_output is not None,
+        fsync=args.fsync,
+        diff_mode=DIFF_STRUCTURAL if args.diff == DIFF_STRUCTURAL else DIFF_TEXT,
+        jobs=jobs,
+        report=reporter is not None,
+        schema=None if args.schema is None else str(args.schema),
+        schema_map=tuple(args.schema_map or ()),
+        strict=args.strict,
+    )
+    return mode_args, dump_args
+
+
+def output_stats(stats: Stats, args: argparse.Namespace) -> None:
+    """Print the timings summary and write the trace, as requested"""
+    if args.stats:
+        logging.getLogger(__name__).warning(stats.summary(args.slowest))
+    if args.profile_output is not None:
+        stats.write_trace(args.profile_output)
+
+
+def cache_options(mode_args: ModeArgs, dump_args: dict[str, Any]) -> dict[str, Any]:
+    """
+    Return the options the cache of well formatted files depends on: files checked strictly
+    or against other schemas, or schemas whose content changed, are cached apart.
+    """
+    from jsonator.schema import (  # pylint: disable=import-outside-toplevel  # noqa: PLC0415
+        schema_paths,
+    )
+
+    options = dict(dump_args)
+    if mode_args.strict:
+        options["strict"] = True
+    schemas = schema_paths(mode_args)
+    if schemas:
+        from jsonator.cache import (  # pylint: disable=import-outside-toplevel  # noqa: PLC0415
+            hash_digest,
+        )
+
+        options["schemas"] = [
+            mode_args.schema,
+            mode_args.schema_map,
+            [hash_digest(Path(schema)) for schema in schemas],
+        ]
+    return options
+
+
+def format_cached_files(
+    args: argparse.Namespace,
+    files: list[Path],
+    report: Report,
+    mode_args: ModeArgs,
+    dump_args: dict[str, Any],
+) -> None:
+    """Format the files, skipping the ones the cache knows to be well formatted"""
+    cache = None
+    if args.cache:
+        from jsonator.cache import Cache  # pylint: disable=import-outside-toplevel  # noqa: PLC0415
+
+        cache = Cache.read(cache_options(mode_args, dump_args), args.cache_dir)
+    cached: frozenset[Path] = frozenset()
+    if cache is not None:
+        with report.phase(None, "cache"):
+            cached = frozenset(cache.filtered_cached(files)[1])
+
+    # Files of other options may already be in the report
+    start = len(report.well_formatted)
+    with report.phase(None, "format"):
+        format_files(args, files, report, mode_args, dump_args, cached=cached)
+
+    if cache is not None:
+        with report.phase(None, "cache"):
+            cache.write(path for path in report.well_formatted[start:] if path not in cached)
+
+
+def format_files(  # pylint: disable=too-many-arguments
+    args: argparse.Namespace,
+    files: list[Path],
+    report: Report,
+    mode_args: ModeArgs,
+    dump_args: dict[str, Any],
+    *,
+    cached: frozenset[Path] = frozenset(),
+) -> None:
+    """
+    Format the files with the engine selected on the command line. The `cached` ones are
+    known to be well formatted and only reported, in their place.
+    """
+    if args.io_concurrency and not args.stream:
+        # pylint: disable-next=import-outside-toplevel
+        from jsonator.aio import format_many_async  # noqa: PLC0415
+
+        format_many_async(
+            files,
+            report,
+            mode_args,
+            dump_args,
+            jobs=mode_args.jobs,
+            io_concurrency=args.io_concurrency,
+            cached=cached,
+        )
+    else:
+        # pylint: disable-next=import-outside-toplevel
+        from jsonator.concurrency import format_many  # noqa: PLC0415
+
+        format_many(files, report, mode_args, dump_args, mode_args.jobs, cached=cached)
+
+
+def log_report(report: Report) -> None:
+    """Write out the summary of the run"""
+    log = logging.getLogger(__name__)
+    if report.failure_count > 0:
+        log.error(report)
+
+    if report.change_count > 0:
+        log.warning(report)
+
+    else:
+        log.info(report)
+
+
+def watch(args: argparse.Namespace, report: Report, resolver: ConfigResolver | None) -> int:
+    """Format the files again as they change, until interrupted"""
+    # pylint: disable=import-outside-toplevel
+    from jsonator.config import ConfigError  # noqa: PLC0415
+    from jsonator.discovery import PatternSet  # noqa: PLC0415
+    from jsonator.watch import PollingWatcher, Watch, make_watcher  # noqa: PLC0415
+
+    # pylint: enable=import-outside-toplevel
+
+    status = report.status
+
+    def format_batch(files: list[Path]) -> list[Path]:
+        nonlocal status
+        batch = Report(args.check, args.diff)
+        try:
+            groups = group_files(args, files, resolver)
+        except ConfigError as exc:
+            logging.getLogger(__name__).error("error: %s", exc)
+            status = ReturnCode.INTERNAL_ERROR.value
+            return []
+        for group_args, group in groups:
+            format_files(args, group, batch, *make_settings(group_args))
+        log_report(batch)
+        status = batch.status
+        return batch.written
+
+    def collect() -> list[Path]:
+        return collect_files(args)
+
+    excludes = PatternSet(
+        [
+            *(DEFAULT_EXCLUDES if args.exclude is None else args.exclude),
+            *(args.extend_exclude or ()),
+        ]
+    )
+    watcher = (
+        make_watcher(args.paths[0], collect, excludes)
+        if len(args.paths) == 1
+        else PollingWatcher(collect)
+    )
+    # Stop the same way on kill as on Ctrl+C
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    logging.getLogger(__name__).info(
+        "Watching %s for changes", ", ".join(str(path) for path in args.paths)
+    )
+    try:
+        Watch(collect, format_batch, args.debounce).run(watcher)
+    except KeyboardInterrupt:
+        pass
+    return status
+
+
+def load_schemas(mode_args: ModeArgs) -> bool:
+    """Load the schemas of the run, so their errors are reported once. Return whether they load."""
+    # pylint: disable-next=import-outside-toplevel
+    from jsonator.schema import SchemaError, load_validator, schema_paths  # noqa: PLC0415
+
+    log = logging.getLogger(__name__)
+    try:
+        for schema in schema_paths(mode_args):
+            load_validator(schema)
+    except ImportError:
+        log.error("error: jsonschema is not installed, install jsonator[schema]")
+        return False
+    except SchemaError as exc:
+        log.error("error: %s", exc)
+        return False
+    return True
+
+
+def finish_report(report: Report, reporter: Reporter | None, status: int) -> int:
+    """Close the report of the run, which exits with `status`, and return `status`."""
+    if reporter is not None:
+        reporter.finish(report, status)
+    return status
+
+
+def open_report_file(path: str) -> ContextManager[TextIO]:
+    """Open the report file for writing, or return stdout for "-"."""
+    if path == "-":
+        return nullcontext(sys.stdout)
+    return open(path, "w", encoding="utf-8")
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Main function"""
+    if argv is None:
+        argv = sys.argv[1:]
+
+    if argv[:1] == ["bench"]:
+        from jsonator import bench  # pylint: disable=import-outside-toplevel  # noqa: PLC0415
+
+        return bench.main(argv[1:])
+
+    parser = make_parser()
+    args = parse_args(parser, argv)
+    args.paths = resolve_paths(parser, args)
+
+    logging.basicConfig(format="%(message)s")
+    logging.getLogger().setLevel(LOG_LEVELS.get(args.verbosity, 3))
+
+    missing = [path for path in args.paths if path != STDIN and not path.exists()]
+    for path in missing:
+        logging.getLogger(__name__).error("error: %s does not exist", path)
+    if missing:
+        return ReturnCode.FILE_NOT_FOUND.value
+
+    if args.report_format is None:
+        return run(args)
+    from jsonator.reporters import (  # pylint: disable=import-outside-toplevel  # noqa: PLC0415
+        REPORTERS,
+    )
+
+    with open_report_file(args.report_file) as stream:
+        return run(args, REPORTERS[args.report_format](stream))
+
+
+def run(args: argparse.Namespace, reporter: Reporter | None = None) -> int:
+    """Format the files of the command line, passing their results to `reporter`"""
+    log = logging.getLogger(__name__)
+    stats = None
+    if args.stats or args.profile_output is not None:
+        from jsonator.stats import Stats  # pylint: disable=import-outside-toplevel  # noqa: PLC0415
+
+        stats = Stats(trace=args.profile_output is not None)
+    report = Report(args.check, args.diff, stats, reporter=reporter)
+    resolver = None
+    if args.config:
+        # pylint: disable-next=import-outside-toplevel
+        from jsonator.config import ConfigResolver  # noqa: PLC0415
+
+        resolver = ConfigResolver()
+
+    try:
+        with report.phase(None, "discover"):
+            files_to_scan = collect_files(args)
+            groups = group_files(args, files_to_scan, resolver)
+    # Evaluated only when an exception is raised
+    except discovery_errors() as exc:
+        log.error("error: %s", exc)
+        return finish_report(report, reporter, ReturnCode.INTERNAL_ERROR.value)
+
+    try:
+        batches = [(*make_settings(group_args, reporter), files) for group_args, files in groups]
+    except ImportError:
+        log.error("error: %s is not installed", args.backend)
+        return finish_report(report, reporter, ReturnCode.INTERNAL_ERROR.value)
+    if not all(load_schemas(mode_args) for mode_args, _, _ in batches):
+        return finish_report(report, reporter, ReturnCode.INTERNAL_ERROR.value)
+
+    for mode_args, dump_args, files in batches:
+        if args.paths == [STDIN]:
+            with report.phase(None, "format"):
+                format_stdin(report, mode_args, dump_args)
+        else:
+            format_cached_files(args, files, report, mode_args, dump_args)
+
+    if stats is not None:
+        output_stats(stats, args)
+
+    log_report(report)
+    finish_report(report, reporter, report.status)
+
+    if args.watch:
+        return watch(args, report, resolver)
+
+    return report.status
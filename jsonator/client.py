@@ -0,0 +1,124 @@
+"""
+Thin client of jsonatord.
+
+Run with `jsonatorc` and the same arguments as `jsonator`. The command line is forwarded
+to the daemon given by `$JSONATOR_DAEMON`: `unix:/path/to/socket` or `host:port`
+(default: `localhost:45485`). If no daemon is running, or the command reads the standard
+input, it runs in this process. Daemons on a port are sent the token they wrote to a file
+of the cache directory, which only their owner can read.
+"""
+
+from __future__ import annotations
+
+import http.client
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+
+DAEMON_ENV = "JSONATOR_DAEMON"
+DEFAULT_ADDRESS = "localhost:45485"
+UNIX_PREFIX = "unix:"
+TIMEOUT = 600
+TOKEN_HEADER = "X-Jsonator-Token"
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTP connection over a Unix socket."""
+
+    def __init__(self, path: str, timeout: float = TIMEOUT) -> None:
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = path
+
+    def connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        self.sock = sock
+
+
+def connect(address: str) -> http.client.HTTPConnection:
+    """Return a connection to the daemon listening on `address`."""
+    if address.startswith(UNIX_PREFIX):
+        return UnixHTTPConnection(address[len(UNIX_PREFIX) :])
+    address = address.split("://", 1)[-1].rstrip("/")
+    return http.client.HTTPConnection(address, timeout=TIMEOUT)
+
+
+def token_path(port: int) -> Path:
+    """Return the file holding the token of the daemon listening on `port`."""
+    from jsonator.cache import (  # pylint: disable=import-outside-toplevel  # noqa: PLC0415
+        get_cache_dir,
+    )
+
+    return get_cache_dir() / f"jsonatord-{port}.token"
+
+
+def read_token(address: str) -> str | None:
+    """Return the token of the daemon listening on `address`, None if it has none."""
+    if address.startswith(UNIX_PREFIX):
+        return None
+    _, _, port = address.split("://", 1)[-1].rstrip("/").rpartition(":")
+    try:
+        return token_path(int(port)).read_text(encoding="ascii")
+    except (OSError, ValueError):
+        return None
+
+
+def forward(argv: list[str], address: str) -> dict[str, object]:
+    """
+    Run the command line on the daemon and return its result.
+    Raises `OSError` if the daemon is not reachable.
+    """
+    connection = connect(address)
+    try:
+        body = json.dumps({"argv": argv, "cwd": os.getcwd()})
+        headers = {"Content-Type": "application/json"}
+        token = read_token(address)
+        if token is not None:
+            headers[TOKEN_HEADER] = token
+        connection.request("POST", "/run", body, headers)
+        response = connection.getresponse()
+        data = response.read()
+    finally:
+        connection.close()
+    if response.status != http.client.OK:
+        raise OSError(f"jsonatord: {data.decode('utf-8', 'replace')}")
+    result: dict[str, object] = json.loads(data)
+    return result
+
+
+def uses_stdin(argv: list[str]) -> bool:
+    """Return whether the command line reads the document or the paths from stdin."""
+    return "-" in argv or "--files-from=-" in argv
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Forward the command line to the daemon, or run it here"""
+    if argv is None:
+        argv = sys.argv[1:]
+
+    result = None
+    if not uses_stdin(argv):
+        try:
+            result = forward(argv, os.environ.get(DAEMON_ENV) or DEFAULT_ADDRESS)
+        except (OSError, http.client.HTTPException):
+            pass
+    if result is None:
+        from jsonator import main as run  # pylint: disable=import-outside-toplevel  # noqa: PLC0415
+
+        return run(argv)
+
+    sys.stdout.write(str(result["stdout"]))
+    sys.stderr.write(str(result["stderr"]))
+    status = result["status"]
+    return status if isinstance(status, int) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,198 @@
+"""
+Format files in parallel using a process pool.
+
+Workers don't write to the terminal: the log records and the diffs of a batch are kept
+in order and replayed by the main process in the order of the files, so the output is
+the same as with a single process.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sys
+from dataclasses import replace
+from itertools import repeat
+from typing import TYPE_CHECKING, Any, Tuple
+
+from jsonator.jsonator import format_json_file
+from jsonator.report import Report
+from jsonator.write import FSYNC_BATCHED, FSYNC_NEVER, sync_files
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from jsonator.models import ModeArgs
+
+# Number of files handed to a worker at once. Keeps the pickling overhead low
+# for trees with many tiny files while still spreading the work evenly.
+BATCH_SIZE = 64
+
+# What a worker would have written, in order: log records, and diffs for stdout
+Event = Tuple[str, Any]
+LOG = "log"
+STDOUT = "stdout"
+
+
+def default_jobs() -> int:
+    """Return the default number of worker processes."""
+    return os.cpu_count() or 1
+
+
+def format_many(  # pylint: disable=too-many-arguments
+    files: list[Path],
+    report: Report,
+    mode_args: ModeArgs,
+    dump_args: dict[str, Any],
+    jobs: int,
+    *,
+    cached: frozenset[Path] = frozenset(),
+) -> None:
+    """
+    Format `files` using up to `jobs` worker processes.
+    Results of every worker are merged into `report` in the order of `files`, where the
+    `cached` ones, known to be well formatted, are reported without formatting them.
+    Falls back to the serial path if a single worker is requested,
+    there is only one file to format, or the platform doesn't support process pools.
+    """
+    jobs = min(jobs, len(files) - len(cached))
+    if jobs <= 1:
+        format_serial(files, report, mode_args, dump_args, cached)
+        return
+
+    # Imported here: a run on a single file doesn't need them
+    # pylint: disable-next=import-outside-toplevel
+    import multiprocessing  # noqa: PLC0415
+    from concurrent.futures import (  # pylint: disable=import-outside-toplevel  # noqa: PLC0415
+        ProcessPoolExecutor,
+    )
+
+    try:
+        executor = ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_init_worker,
+            initargs=(logging.getLogger().level, multiprocessing.Lock()),
+        )
+    except (ImportError, NotImplementedError, OSError):
+        # Platforms without a working multiprocessing implementation (e.g. AWS Lambda)
+        format_serial(files, report, mode_args, dump_args, cached)
+        return
+
+    # The workers don't start processes of their own for the records of JSON Lines files,
+    # and leave batched flushes to this process
+    batched = mode_args.fsync == FSYNC_BATCHED
+    worker_args = replace(mode_args, jobs=1, fsync=FSYNC_NEVER if batched else mode_args.fsync)
+    written = len(report.written)
+    with executor:
+        results = executor.map(
+            _format_batch, *split(files, jobs, cached), repeat(worker_args), repeat(dump_args)
+        )
+        for batch_report, events in results:
+            replay(events)
+            report.merge(batch_report)
+
+    if batched:
+        with report.phase(None, "fsync"):
+            sync_files(report.written[written:])
+
+
+def split(
+    files: list[Path], jobs: int, cached: frozenset[Path] = frozenset()
+) -> tuple[list[list[Path]], list[frozenset[Path]]]:
+    """
+    Split `files` in batches of up to `BATCH_SIZE`, at least one per job. Return them with
+    the `cached` files of every batch, so each worker only gets its own.
+    """
+    batch_size = max(1, min(BATCH_SIZE, len(files) // jobs))
+    batches = [files[i : i + batch_size] for i in range(0, len(files), batch_size)]
+    return batches, [cached.intersection(batch) for batch in batches]
+
+
+def format_serial(
+    files: list[Path],
+    report: Report,
+    mode_args: ModeArgs,
+    dump_args: dict[str, Any],
+    cached: frozenset[Path] = frozenset(),
+) -> None:
+    """Format `files` one by one in the current process, reporting the `cached` ones."""
+    written = len(report.written)
+    for file_to_scan in files:
+        if file_to_scan in cached:
+            report.done(file_to_scan, changed=False)
+        else:
+            format_json_file(file_to_scan, report, mode_args, dump_args)
+
+    if mode_args.fsync == FSYNC_BATCHED:
+        with report.phase(None, "fsync"):
+            sync_files(report.written[written:])
+
+
+def replay(events: list[Event]) -> None:
+    """Write out the log records and the diffs of a worker in the main process."""
+    for kind, payload in events:
+        if kind == LOG:
+            logging.getLogger(payload.name).handle(payload)
+        else:
+            sys.stdout.write(payload)
+    sys.stdout.flush()
+
+
+class _Recorder:
+    """The queue of a `QueueHandler` and a stdout keeping what a worker writes, in order."""
+
+    def __init__(self) -> None:
+        self.events: list[Event] = []
+
+    def put_nowait(self, record: logging.LogRecord) -> None:
+        """Keep a log record, formatted by the handler so that it can be pickled."""
+        self.events.append((LOG, record))
+
+    def write(self, text: str) -> int:
+        """Keep text written to stdout."""
+        self.events.append((STDOUT, text))
+        return len(text)
+
+    def flush(self) -> None:
+        """Nothing to flush: the events are written by the main process."""
+
+
+def _init_worker(level: int, diff_lock: Any) -> None:
+    """
+    Log at the level of the main process in a worker process, and share the lock which
+    keeps the diffs of the workers apart.
+    """
+    from jsonator import output  # pylint: disable=import-outside-toplevel  # noqa: PLC0415
+
+    logging.getLogger().setLevel(level)
+    output.DIFF_LOCK = diff_lock
+
+
+def _format_batch(
+    files: list[Path], cached: frozenset[Path], mode_args: ModeArgs, dump_args: dict[str, Any]
+) -> tuple[Report, list[Event]]:
+    """
+    Format a batch of files in a worker process and return its own report, with the log
+    records and the diffs for the main process to write out.
+    """
+    # Imported here: they are only needed in the worker processes
+    # pylint: disable=import-outside-toplevel
+    from logging.handlers import QueueHandler  # noqa: PLC0415
+
+    from jsonator.stats import Stats  # noqa: PLC0415
+
+    # pylint: enable=import-outside-toplevel
+    stats = Stats(mode_args.trace) if mode_args.stats else None
+    report = Report(mode_args.check, mode_args.diff, stats, record=mode_args.report)
+
+    recorder = _Recorder()
+    root = logging.getLogger()
+    handlers, stdout = root.handlers, sys.stdout
+    # Forked workers inherit the handlers of the main process
+    root.handlers = [QueueHandler(recorder)]  # type: ignore[arg-type]
+    sys.stdout = recorder
+    try:
+        format_serial(files, report, mode_args, dump_args, cached)
+    finally:
+        root.handlers, sys.stdout = handlers, stdout
+    return report, recorder.events
@@ -0,0 +1,139 @@
+"""
+Configuration files.
+
+Options are read from the `[tool.jsonator]` table of pyproject.toml files and from
+.jsonator.toml files, in the directory of each file and in its parents up to the root of
+the project (the directory holding .git or .hg). Nearer files override the options of
+farther ones, .jsonator.toml the pyproject.toml next to it, and options given on the
+command line override them all:
+
+    [tool.jsonator]
+    indent = 2
+    sort-keys = true
+    schema = "schemas/config.json"
+    schema-map = { "locales/*.json" = "schemas/locale.json" }
+
+Every directory is resolved once per run, so the files of a big tree cost a dictionary
+lookup each and config files are read once. Paths are relative to the config file.
+
+TOML is parsed with tomllib, or tomli before Python 3.11.
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from typing import Any
+
+CONFIG_FILE = ".jsonator.toml"
+PYPROJECT = "pyproject.toml"
+# Config files above the root of the project don't apply
+PROJECT_MARKERS = (".git", ".hg")
+
+# Options of the config files and their command line destinations
+OPTIONS = {
+    "indent": "indent",
+    "sort-keys": "sort_keys",
+    "ensure-ascii": "ensure_ascii",
+    "compact": "compact",
+    "strict": "strict",
+    "schema": "schema",
+    "schema-map": "schema_map",
+}
+FLAGS = ("sort-keys", "ensure-ascii", "compact", "strict")
+
+
+class ConfigError(Exception):
+    """A config file can't be read or has invalid options."""
+
+
+def load_toml(path: Path) -> dict[str, Any]:
+    """Parse a TOML file. Raises `ConfigError` if it's invalid."""
+    # Imported here: most runs have no config file to read
+    if sys.version_info >= (3, 11):
+        import tomllib  # pylint: disable=import-outside-toplevel  # noqa: PLC0415
+    else:
+        import tomli as tomllib  # pylint: disable=import-outside-toplevel  # noqa: PLC0415
+
+    try:
+        with path.open("rb") as stream:
+            return tomllib.load(stream)
+    except (OSError, UnicodeDecodeError, tomllib.TOMLDecodeError) as exc:
+        raise ConfigError(f"cannot read {path}: {exc}") from None
+
+
+def parse_options(table: Any, path: Path) -> dict[str, Any]:
+    """
+    Return the options of a config file as command line destinations, with the schema
+    paths joined to the directory of the file. Raises `ConfigError` if one is invalid.
+    """
+    if not isinstance(table, dict):
+        raise ConfigError(f"{path}: expected a table of options")
+
+    options: dict[str, Any] = {}
+    for key, value in table.items():
+        if key not in OPTIONS:
+            raise ConfigError(f"{path}: unknown option {key!r}")
+        if key in FLAGS:
+            valid = isinstance(value, bool)
+        elif key == "indent":
+            valid = isinstance(value, str) or (
+                isinstance(value, int) and not isinstance(value, bool) and value >= 0
+            )
+        elif key == "schema":
+            valid = isinstance(value, str)
+        else:
+            valid = isinstance(value, dict) and all(
+                isinstance(schema, str) for schema in value.values()
+            )
+        if not valid:
+            raise ConfigError(f"{path}: invalid value for {key!r}: {value!r}")
+
+        if key == "schema":
+            value = str(path.parent / value)
+        elif key == "schema-map":
+            value = tuple((glob, str(path.parent / schema)) for glob, schema in value.items())
+        options[OPTIONS[key]] = value
+    return options
+
+
+def read_options(directory: Path) -> dict[str, Any]:
+    """Return the options set by the config files of `directory`, not its parents."""
+    options: dict[str, Any] = {}
+    pyproject = directory / PYPROJECT
+    if pyproject.is_file():
+        table = load_toml(pyproject).get("tool", {}).get("jsonator")
+        if table is not None:
+            options.update(parse_options(table, pyproject))
+
+    config_file = directory / CONFIG_FILE
+    if config_file.is_file():
+        options.update(parse_options(load_toml(config_file), config_file))
+    return options
+
+
+def is_project_root(directory: Path) -> bool:
+    """Return whether `directory` is the root of a repository."""
+    return any((directory / marker).exists() for marker in PROJECT_MARKERS)
+
+
+class ConfigResolver:  # pylint: disable=too-few-public-methods
+    """Options of the directories of a run, resolved once per directory."""
+
+    def __init__(self) -> None:
+        self._options: dict[Path, dict[str, Any]] = {}
+
+    def options(self, directory: Path) -> dict[str, Any]:
+        """
+        Return the options of the files of `directory`: the ones of its config files over
+        the ones of its parents. Raises `ConfigError` if a config file is invalid.
+        """
+        options = self._options.get(directory)
+        if options is None:
+            parent = directory.parent
+            inherited = (
+                {} if parent == directory or is_project_root(directory) else self.options(parent)
+            )
+            options = {**inherited, **read_options(directory)}
+            self._options[directory] = options
+        return options
@@ -0,0 +1,320 @@
+"""
+jsonatord, a resident formatting server.
+
+Run with `jsonatord` or `python -m jsonator.daemon`. It listens on a local HTTP port
+or a Unix socket, so editors and hooks don't pay for the interpreter startup:
+
+* `POST /` formats the request body, like blackd. The options are passed in headers
+  (`X-Indent`, `X-Sort-Keys`, ...). The response is 200 with the formatted document
+  (or the diff if `X-Diff` is set, by JSON path if it's `structural`), 204 if it's already
+  well formatted, 400 if it's not valid JSON or the headers are invalid and 500 on
+  unexpected errors.
+* `POST /run` runs the command line with the JSON body `{"argv": [...], "cwd": "..."}`
+  and returns `{"status": ..., "stdout": "...", "stderr": "..."}`. It's used by the
+  thin client, see `jsonator.client`.
+
+`/run` reads and writes files with the permissions of the owner of the daemon. The Unix
+socket is only accessible by its owner. On a port, which every local user can connect to,
+requests must carry the token the daemon writes to a file only its owner can read
+(`X-Jsonator-Token`). Requests must be `application/json`, which browsers don't send to
+another origin without a preflight request, and the daemon doesn't answer those.
+Command lines reading the standard input or watching files are refused: they would never
+finish.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hmac
+import io
+import json
+import logging
+import os
+import secrets
+import signal
+import socketserver
+import sys
+import threading
+from contextlib import redirect_stderr, redirect_stdout, suppress
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+from jsonator.api import Formatter, get_formatter
+from jsonator.backend import AUTO
+from jsonator.client import TOKEN_HEADER, token_path
+from jsonator.models import DIFF_STRUCTURAL
+from jsonator.output import color_diff, diff, document_diff
+
+DEFAULT_HOST = "localhost"
+DEFAULT_PORT = 45485
+PROTOCOL_VERSION = "1"
+TRUE_VALUES = ("1", "true", "yes")
+JSON_TYPE = "application/json"
+
+# The command line changes the process state (working directory, logging, stdout),
+# so only one runs at a time
+RUN_LOCK = threading.Lock()
+
+
+class HeaderError(ValueError):
+    """Invalid formatting options in the request headers."""
+
+
+def parse_headers(headers: Any) -> Formatter:
+    """Return the formatter for the options of the request headers."""
+    version = headers.get("X-Protocol-Version", PROTOCOL_VERSION)
+    if version != PROTOCOL_VERSION:
+        raise HeaderError(f"Unsupported protocol version: {version}")
+
+    indent: int | str | None = 4
+    value = headers.get("X-Indent")
+    if value is not None:
+        if value == "tab":
+            indent = "\t"
+        elif value == "none":
+            indent = None
+        else:
+            try:
+                indent = int(value)
+            except ValueError:
+                raise HeaderError(f"Invalid X-Indent: {value}") from None
+
+    backend = headers.get("X-Backend", AUTO)
+    try:
+        return get_formatter(
+            indent=indent,
+            sort_keys=headers.get("X-Sort-Keys", "").lower() in TRUE_VALUES,
+            ensure_ascii=headers.get("X-Ensure-Ascii", "true").lower() in TRUE_VALUES,
+            compact=headers.get("X-Compact", "").lower() in TRUE_VALUES,
+            backend=backend,
+        )
+    except ValueError as exc:
+        raise HeaderError(str(exc)) from None
+    except ImportError:
+        raise HeaderError(f"{backend} is not installed") from None
+
+
+def unsupported(argv: list[str]) -> str | None:
+    """Return why the command line can't run in the daemon, None if it can."""
+    from jsonator import cli  # pylint: disable=import-outside-toplevel  # noqa: PLC0415
+
+    try:
+        with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+            args, _ = cli.make_parser().parse_known_args(argv)
+    except SystemExit:
+        # Invalid command lines report their error when they run
+        return None
+    if args.watch:
+        return "--watch can't run in jsonatord"
+    if cli.STDIN in args.paths or args.files_from == cli.STDIN:
+        return "jsonatord can't read the standard input"
+    return None
+
+
+def run_command(argv: list[str], cwd: str) -> dict[str, Any]:
+    """Run the command line in `cwd` and return its exit code and output."""
+    from jsonator import main as run  # pylint: disable=import-outside-toplevel  # noqa: PLC0415
+
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    handler = logging.StreamHandler(stderr)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    root = logging.getLogger()
+
+    with RUN_LOCK:
+        saved = root.handlers, root.level, os.getcwd()
+        root.handlers = [handler]
+        try:
+            os.chdir(cwd)
+            with redirect_stdout(stdout), redirect_stderr(stderr):
+                # Worker processes would log to the terminal of the daemon
+                status = run([*argv, "--jobs", "1"])
+        except SystemExit as exc:
+            status = exc.code if isinstance(exc.code, int) else int(exc.code is not None)
+        finally:
+            root.handlers, level, cwd = saved
+            root.setLevel(level)
+            os.chdir(cwd)
+
+    return {"status": status, "stdout": stdout.getvalue(), "stderr": stderr.getvalue()}
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Handle the formatting requests."""
+
+    server_version = "jsonatord"
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self) -> None:  # pylint: disable=invalid-name  # noqa: N802
+        """Format a document or run a command line."""
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        try:
+            if self.path == "/run":
+                self.run_body(body)
+            elif self.path == "/":
+                self.format_body(body)
+            else:
+                self.respond(HTTPStatus.NOT_FOUND, b"Not found")
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            self.log_error("%s", exc)
+            self.respond(HTTPStatus.INTERNAL_SERVER_ERROR, str(exc).encode())
+
+    def run_body(self, body: bytes) -> None:
+        """Respond with the result of the command line of the body."""
+        token = getattr(self.server, "token", None)
+        if token is not None and not hmac.compare_digest(
+            self.headers.get(TOKEN_HEADER, "").encode(), token.encode()
+        ):
+            self.respond(HTTPStatus.FORBIDDEN, b"Invalid token")
+            return
+        if self.headers.get_content_type() != JSON_TYPE:
+            self.respond(HTTPStatus.UNSUPPORTED_MEDIA_TYPE, f"Expected {JSON_TYPE}".encode())
+            return
+
+        request = json.loads(body)
+        argv, cwd = request.get("argv"), request.get("cwd", os.getcwd())
+        if not isinstance(argv, list) or not all(isinstance(arg, str) for arg in argv):
+            self.respond(HTTPStatus.BAD_REQUEST, b"argv must be a list of strings")
+            return
+        error = unsupported(argv)
+        if error is not None:
+            self.respond(HTTPStatus.BAD_REQUEST, error.encode())
+            return
+        result = run_command(argv, str(cwd))
+        self.respond(HTTPStatus.OK, json.dumps(result).encode(), JSON_TYPE)
+
+    def format_body(self, body: bytes) -> None:
+        """Respond with the formatted document, or its diff."""
+        try:
+            formatter = parse_headers(self.headers)
+            text = body.decode("utf-8")
+            formatted = formatter.format_str(text)
+        except (HeaderError, UnicodeDecodeError) as exc:
+            self.respond(HTTPStatus.BAD_REQUEST, str(exc).encode())
+            return
+        except json.JSONDecodeError as exc:
+            self.respond(HTTPStatus.BAD_REQUEST, f"Cannot parse: {exc}".encode())
+            return
+
+        if formatted == text:
+            self.respond(HTTPStatus.NO_CONTENT, b"")
+            return
+
+        diff_mode = self.headers.get("X-Diff", "").lower()
+        if diff_mode in TRUE_VALUES or diff_mode == DIFF_STRUCTURAL:
+            name = self.headers.get("X-File-Name", "In")
+            make_diff = document_diff if diff_mode == DIFF_STRUCTURAL else diff
+            formatted = make_diff(text, formatted, name, "formatted file")
+            if self.headers.get("X-Color", "").lower() in TRUE_VALUES:
+                formatted = color_diff(formatted)
+        self.respond(HTTPStatus.OK, formatted.encode("utf-8"))
+
+    def respond(self, status: HTTPStatus, body: bytes, content_type: str = "") -> None:
+        """Send the response."""
+        self.send_response(status)
+        self.send_header("Content-Type", content_type or "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-Protocol-Version", PROTOCOL_VERSION)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self) -> str:
+        # Unix sockets have no client address
+        return str(self.client_address[0]) if self.client_address else "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logging.getLogger(__name__).info("%s - %s", self.address_string(), format % args)
+
+
+class TokenHTTPServer(ThreadingHTTPServer):
+    """
+    Server on a port, whose `/run` requests must carry the token written to a file only
+    the owner can read, see `jsonator.client.token_path`. The file is removed on close.
+    """
+
+    def __init__(self, address: tuple[str, int]) -> None:
+        super().__init__(address, Handler)
+        self.token = secrets.token_hex(32)
+        self.token_file = token_path(self.server_address[1])
+        self.token_file.parent.mkdir(parents=True, exist_ok=True)
+        # Created again, so that nobody else can have opened it
+        with suppress(FileNotFoundError):
+            self.token_file.unlink()
+        descriptor = os.open(self.token_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(descriptor, "w", encoding="ascii") as stream:
+            stream.write(self.token)
+
+    def server_close(self) -> None:
+        super().server_close()
+        with suppress(FileNotFoundError):
+            self.token_file.unlink()
+
+
+def make_server(
+    host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, socket_path: Path | None = None
+) -> socketserver.BaseServer:
+    """Create the server, listening on the Unix socket if given, or on the port."""
+    if socket_path is None:
+        return TokenHTTPServer((host, port))
+
+    if socket_path.is_socket():
+        socket_path.unlink()
+    # Only the owner may connect: requests read and write files with its permissions
+    umask = os.umask(0o177)
+    try:
+        server = socketserver.ThreadingUnixStreamServer(str(socket_path), Handler)
+    finally:
+        os.umask(umask)
+    server.daemon_threads = True
+    return server
+
+
+def make_parser() -> argparse.ArgumentParser:
+    """Build the command line parser"""
+    arg_parser = argparse.ArgumentParser(
+        prog="jsonatord", description="Serve jsonator formatting over HTTP."
+    )
+    arg_parser.add_argument(
+        "--bind-host", default=DEFAULT_HOST, help=f"Address to listen on. Default: {DEFAULT_HOST}"
+    )
+    arg_parser.add_argument(
+        "--bind-port", type=int, default=DEFAULT_PORT, help=f"Port. Default: {DEFAULT_PORT}"
+    )
+    arg_parser.add_argument(
+        "--socket", type=Path, help="Listen on this Unix socket instead of a port."
+    )
+    arg_parser.add_argument(
+        "--verbose", "-v", action="store_true", help="Log every request on stderr."
+    )
+    return arg_parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the daemon until interrupted"""
+    args = make_parser().parse_args(argv)
+    # Not through the root logger, which captures the output of the command lines
+    log = logging.getLogger(__name__)
+    log.addHandler(logging.StreamHandler())
+    log.propagate = False
+    log.setLevel(logging.INFO if args.verbose else logging.WARNING)
+
+    server = make_server(args.bind_host, args.bind_port, args.socket)
+    address = args.socket or f"http://{args.bind_host}:{args.bind_port}"
+    print(f"jsonatord listening on {address}", file=sys.stderr)  # noqa: T201
+    # Stop the same way on kill as on Ctrl+C, removing the socket
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if args.socket is not None and args.socket.is_socket():
+            args.socket.unlink()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,271 @@
+"""
+Line diff in the unified format of `difflib.unified_diff`.
+
+Common leading and trailing lines are skipped, then lines appearing once on both sides
+anchor the alignment (patience diff) and the regions between anchors are diffed with
+Myers' O(ND) algorithm. Regions without common lines, too many edits, or a run over the
+time budget are output as replaced, so the result is always a valid diff.
+"""
+
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+from typing import Iterator, Sequence, Tuple
+
+# Edit distance above which a region is output as replaced
+MAX_EDITS = 2000
+DEFAULT_TIMEOUT = 5.0
+
+Opcode = Tuple[str, int, int, int, int]
+# Lines alo:ahi of a and blo:bhi of b
+Region = Tuple[int, int, int, int]
+
+
+def line_ids(a_lines: Sequence[str], b_lines: Sequence[str]) -> tuple[list[int], list[int]]:
+    """Replace the lines with integers, equal for equal lines."""
+    ids: dict[str, int] = {}
+    a_ids = [ids.setdefault(line, len(ids)) for line in a_lines]
+    b_ids = [ids.setdefault(line, len(ids)) for line in b_lines]
+    return a_ids, b_ids
+
+
+def unique_pairs(a: list[int], b: list[int], region: Region) -> list[tuple[int, int]]:
+    """Return the positions of the lines appearing once on both sides, in the order of a."""
+    alo, ahi, blo, bhi = region
+    counts: dict[int, int] = {}
+    for line in a[alo:ahi]:
+        counts[line] = counts.get(line, 0) + 1
+    b_index: dict[int, int] = {}
+    for j in range(blo, bhi):
+        line = b[j]
+        if counts.get(line) == 1:
+            # Mark lines seen twice in b with -1
+            b_index[line] = -1 if line in b_index else j
+    return [(i, b_index[a[i]]) for i in range(alo, ahi) if b_index.get(a[i], -1) >= 0]
+
+
+def unique_anchors(a: list[int], b: list[int], region: Region) -> list[tuple[int, int]]:
+    """Return the longest increasing sequence of the lines appearing once on both sides."""
+    pairs = unique_pairs(a, b, region)
+    if not pairs:
+        return []
+
+    # Patience sorting on the positions in b
+    tails: list[int] = []
+    tail_pairs: list[int] = []
+    previous = [-1] * len(pairs)
+    for index, (_, j) in enumerate(pairs):
+        pile = bisect_left(tails, j)
+        if pile:
+            previous[index] = tail_pairs[pile - 1]
+        if pile == len(tails):
+            tails.append(j)
+            tail_pairs.append(index)
+        else:
+            tails[pile] = j
+            tail_pairs[pile] = index
+
+    anchors = []
+    index = tail_pairs[-1]
+    while index >= 0:
+        anchors.append(pairs[index])
+        index = previous[index]
+    anchors.reverse()
+    return anchors
+
+
+def myers(  # pylint: disable=too-many-locals
+    a: list[int], b: list[int], region: Region, deadline: float
+) -> list[tuple[int, int]] | None:
+    """
+    Return the matching lines of the shortest edit script as `(i, j)` pairs,
+    or None if it needs more than `MAX_EDITS` edits or takes too long.
+    """
+    alo, ahi, blo, bhi = region
+    n = ahi - alo
+    m = bhi - blo
+    max_edits = min(n + m, MAX_EDITS)
+    offset = max_edits + 1
+    v = [0] * (2 * max_edits + 3)
+    trace = []
+    for edits in range(max_edits + 1):
+        if time.monotonic() >= deadline:
+            return None
+        trace.append(v[offset - edits : offset + edits + 1])
+        for k in range(-edits, edits + 1, 2):
+            if k == -edits or (k != edits and v[offset + k - 1] < v[offset + k + 1]):
+                x = v[offset + k + 1]
+            else:
+                x = v[offset + k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[alo + x] == b[blo + y]:
+                x += 1
+                y += 1
+            v[offset + k] = x
+            if x >= n and y >= m:
+                return _backtrack(alo, blo, trace, x, y)
+    return None
+
+
+def _backtrack(alo: int, blo: int, trace: list[list[int]], x: int, y: int) -> list[tuple[int, int]]:
+    """Follow the edit path back from the end, collecting the diagonal moves."""
+    matches = []
+    for edits in range(len(trace) - 1, 0, -1):
+        # Furthest x on the diagonals -edits..edits before the round `edits`
+        v = trace[edits]
+        k = x - y
+        if k == -edits or (k != edits and v[k - 1 + edits] < v[k + 1 + edits]):
+            previous_k = k + 1
+        else:
+            previous_k = k - 1
+        previous_x = v[previous_k + edits]
+        previous_y = previous_x - previous_k
+        while x > previous_x and y > previous_y:
+            x -= 1
+            y -= 1
+            matches.append((alo + x, blo + y))
+        x, y = previous_x, previous_y
+
+    while x > 0 and y > 0:
+        x -= 1
+        y -= 1
+        matches.append((alo + x, blo + y))
+    matches.reverse()
+    return matches
+
+
+def matching_lines(a: list[int], b: list[int], deadline: float) -> list[tuple[int, int]] | None:
+    """Return the aligned lines as `(i, j)` pairs, or None if the time budget is exceeded."""
+    matches: list[tuple[int, int]] = []
+    stack = [(0, len(a), 0, len(b))]
+    while stack:
+        if time.monotonic() >= deadline:
+            return None
+        alo, ahi, blo, bhi = stack.pop()
+
+        # Common leading and trailing lines
+        while alo < ahi and blo < bhi and a[alo] == b[blo]:
+            matches.append((alo, blo))
+            alo += 1
+            blo += 1
+        while alo < ahi and blo < bhi and a[ahi - 1] == b[bhi - 1]:
+            ahi -= 1
+            bhi -= 1
+            matches.append((ahi, bhi))
+        if alo == ahi or blo == bhi:
+            continue
+
+        anchors = unique_anchors(a, b, (alo, ahi, blo, bhi))
+        if anchors:
+            for i, j in anchors:
+                stack.append((alo, i, blo, j))
+                matches.append((i, j))
+                alo, blo = i + 1, j + 1
+            stack.append((alo, ahi, blo, bhi))
+            continue
+
+        if set(a[alo:ahi]).isdisjoint(b[blo:bhi]):
+            # Replaced
+            continue
+        aligned = myers(a, b, (alo, ahi, blo, bhi), deadline)
+        if aligned is None:
+            if time.monotonic() >= deadline:
+                return None
+            continue
+        matches.extend(aligned)
+
+    matches.sort()
+    return matches
+
+
+def opcodes(a_lines: Sequence[str], b_lines: Sequence[str], timeout: float) -> list[Opcode]:
+    """
+    Return the operations turning `a_lines` into `b_lines`, like
+    `difflib.SequenceMatcher.get_opcodes`. Everything is replaced after `timeout` seconds.
+    """
+    a, b = line_ids(a_lines, b_lines)
+    matches = matching_lines(a, b, time.monotonic() + timeout) or []
+
+    codes: list[Opcode] = []
+    i = j = 0
+    for match_i, match_j in [*matches, (len(a), len(b))]:
+        if i < match_i and j < match_j:
+            codes.append(("replace", i, match_i, j, match_j))
+        elif i < match_i:
+            codes.append(("delete", i, match_i, j, j))
+        elif j < match_j:
+            codes.append(("insert", i, i, j, match_j))
+        if match_i < len(a):
+            if codes and codes[-1][0] == "equal":
+                tag, i1, _, j1, _ = codes[-1]
+                codes[-1] = tag, i1, match_i + 1, j1, match_j + 1
+            else:
+                codes.append(("equal", match_i, match_i + 1, match_j, match_j + 1))
+        i, j = match_i + 1, match_j + 1
+    return codes
+
+
+def grouped_opcodes(codes: list[Opcode], context: int) -> Iterator[list[Opcode]]:
+    """Group the changes with `context` lines around, like `get_grouped_opcodes`."""
+    if not codes:
+        codes = [("equal", 0, 1, 0, 1)]
+    if codes[0][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[0]
+        codes[0] = tag, max(i1, i2 - context), i2, max(j1, j2 - context), j2
+    if codes[-1][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[-1]
+        codes[-1] = tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context)
+
+    group: list[Opcode] = []
+    for tag, i1, i2, j1, j2 in codes:
+        if tag == "equal" and i2 - i1 > 2 * context:
+            group.append((tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context)))
+            yield group
+            group = []
+            i1, j1 = max(i1, i2 - context), max(j1, j2 - context)
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == "equal"):
+        yield group
+
+
+def _format_range(start: int, stop: int) -> str:
+    length = stop - start
+    if length == 1:
+        return str(start + 1)
+    return f"{start + 1 if length else start},{length}"
+
+
+def _hunk(group: list[Opcode], a_lines: Sequence[str], b_lines: Sequence[str]) -> Iterator[str]:
+    first, last = group[0], group[-1]
+    yield f"@@ -{_format_range(first[1], last[2])} +{_format_range(first[3], last[4])} @@\n"
+    for tag, i1, i2, j1, j2 in group:
+        if tag == "equal":
+            for line in a_lines[i1:i2]:
+                yield " " + line
+            continue
+        if tag in ("replace", "delete"):
+            for line in a_lines[i1:i2]:
+                yield "-" + line
+        if tag in ("replace", "insert"):
+            for line in b_lines[j1:j2]:
+                yield "+" + line
+
+
+def unified_diff(  # pylint: disable=too-many-arguments
+    a_lines: Sequence[str],
+    b_lines: Sequence[str],
+    fromfile: str,
+    tofile: str,
+    *,
+    context: int = 3,
+    timeout: float = DEFAULT_TIMEOUT,
+) -> Iterator[str]:
+    """Yield the lines of the unified diff, like `difflib.unified_diff` without dates."""
+    started = False
+    for group in grouped_opcodes(opcodes(a_lines, b_lines, timeout), context):
+        if not started:
+            started = True
+            yield f"--- {fromfile}\n"
+            yield f"+++ {tofile}\n"
+        yield from _hunk(group, a_lines, b_lines)
@@ -0,0 +1,250 @@
+"""
+Discover JSON files in directory trees.
+
+Directories are walked with `os.scandir`, excluded subtrees are pruned before descending
+and files are yielded as soon as they are found. Patterns use the `.gitignore` syntax.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, Sequence
+
+from jsonator.models import DEFAULT_EXCLUDES, DEFAULT_INCLUDES
+
+GITIGNORE = ".gitignore"
+PROJECT_ROOT_MARKERS = (".git", ".hg")
+
+
+def translate(glob: str) -> str:
+    """Translate a `.gitignore` glob without the leading and trailing slashes to a regex."""
+    parts = []
+    index = 0
+    while index < len(glob):
+        char = glob[index]
+        index += 1
+        if char == "*":
+            if glob.startswith("*/", index) and (index == 1 or glob[index - 2] == "/"):
+                parts.append("(?:.*/)?")
+                index += 2
+            elif glob.startswith("*", index) and index == len(glob) - 1 and glob[index - 2] == "/":
+                parts.append(".*")
+                index += 1
+            else:
+                parts.append("[^/]*")
+        elif char == "?":
+            parts.append("[^/]")
+        elif char == "[":
+            end = glob.find("]", index + 1 if glob.startswith(("!", "^", "]"), index) else index)
+            if end == -1:
+                parts.append(r"\[")
+                continue
+            chars = glob[index:end].replace("\\", "\\\\")
+            if chars.startswith("!"):
+                chars = "^" + chars[1:]
+            parts.append(f"[{chars}]")
+            index = end + 1
+        elif char == "\\" and index < len(glob):
+            parts.append(re.escape(glob[index]))
+            index += 1
+        else:
+            parts.append(re.escape(char))
+
+    return "".join(parts)
+
+
+@dataclass(frozen=True)
+class Rule:
+    """A single `.gitignore` pattern."""
+
+    regex: str
+    negate: bool
+    dir_only: bool
+
+    @classmethod
+    def parse(cls, line: str) -> Rule | None:
+        """Parse a line of a `.gitignore` file. Return None for blank lines and comments."""
+        line = line.rstrip("\n")
+        if not line.endswith("\\ "):
+            line = line.rstrip(" ")
+        if not line or line.startswith("#"):
+            return None
+
+        negate = line.startswith("!")
+        if negate or line.startswith(("\\!", "\\#")):
+            line = line[1:]
+
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            return None
+
+        anchored = "/" in line
+        regex = translate(line.lstrip("/"))
+        if not anchored:
+            regex = "(?:.*/)?" + regex
+        return cls(regex, negate, dir_only)
+
+
+def _combine(rules: Iterable[Rule]) -> re.Pattern[str] | None:
+    regexes = [f"(?:{rule.regex})" for rule in rules]
+    return re.compile("|".join(regexes)) if regexes else None
+
+
+class PatternSet:
+    """Patterns matched against paths relative to `base`. The last matching pattern decides."""
+
+    def __init__(self, lines: Iterable[str], base: str = "") -> None:
+        self.base = base
+        self.rules = [rule for rule in map(Rule.parse, lines) if rule is not None]
+        self._negated = any(rule.negate for rule in self.rules)
+        self._dir_regex = _combine(self.rules)
+        self._file_regex = _combine(rule for rule in self.rules if not rule.dir_only)
+        self._compiled = [re.compile(rule.regex) for rule in self.rules]
+
+    @classmethod
+    def read(cls, path: Path, base: str = "") -> PatternSet:
+        """Read the patterns from a `.gitignore` file."""
+        with path.open(encoding="utf-8", errors="surrogateescape") as lines:
+            return cls(lines, base)
+
+    def __bool__(self) -> bool:
+        return bool(self.rules)
+
+    def match(self, path: str, is_dir: bool) -> bool | None:
+        """
+        Return True if a pattern matches the path, False if the last matching pattern
+        is negated and None if no pattern matches.
+        """
+        if not path.startswith(self.base):
+            return None
+        path = path[len(self.base) :]
+
+        if not self._negated:
+            regex = self._dir_regex if is_dir else self._file_regex
+            return True if regex is not None and regex.fullmatch(path) else None
+
+        for rule, regex in zip(reversed(self.rules), reversed(self._compiled)):
+            if (is_dir or not rule.dir_only) and regex.fullmatch(path):
+                return not rule.negate
+        return None
+
+
+def is_ignored(pattern_sets: Sequence[PatternSet], path: str, is_dir: bool) -> bool:
+    """Check the path against `.gitignore` files, the deepest ones take precedence."""
+    for pattern_set in reversed(pattern_sets):
+        matched = pattern_set.match(path, is_dir)
+        if matched is not None:
+            return matched
+    return False
+
+
+def is_selected(rel_path: str, includes: PatternSet, excludes: PatternSet) -> bool:
+    """
+    Return whether the file at `rel_path` would be found by `iter_files`, .gitignore files
+    aside: it matches `includes`, and neither it nor its directories match `excludes`.
+    """
+    end = rel_path.find("/")
+    while end != -1:
+        if excludes.match(rel_path[:end], True):
+            return False
+        end = rel_path.find("/", end + 1)
+    return bool(includes.match(rel_path, False)) and not excludes.match(rel_path, False)
+
+
+def find_project_root(directory: Path) -> Path:
+    """Return the closest directory containing `.git` or `.hg`, or `directory` itself."""
+    for parent in (directory, *directory.parents):
+        if any((parent / marker).exists() for marker in PROJECT_ROOT_MARKERS):
+            return parent
+    return directory
+
+
+def parent_gitignores(directory: Path) -> tuple[str, list[PatternSet]]:
+    """
+    Return the path of `directory` relative to its project root, with a trailing slash,
+    and the `.gitignore` files of the directories above it inside the project.
+    """
+    directory = directory.resolve()
+    root = find_project_root(directory)
+    prefix = directory.relative_to(root).as_posix()
+    prefix = "" if prefix == "." else prefix + "/"
+
+    gitignores = []
+    parent = root
+    base = ""
+    for part in directory.relative_to(root).parts:
+        gitignore = parent / GITIGNORE
+        if gitignore.is_file():
+            gitignores.append(PatternSet.read(gitignore, base))
+        parent = parent / part
+        base += part + "/"
+    return prefix, gitignores
+
+
+def _scandir(path: str) -> list[os.DirEntry[str]]:
+    try:
+        with os.scandir(path) as scan:
+            return list(scan)
+    except OSError:
+        return []
+
+
+def _kind(entry: os.DirEntry[str]) -> bool | None:
+    """Return True for a directory, False for a file and None for anything else."""
+    try:
+        if entry.is_dir(follow_symlinks=False):
+            return True
+        return False if entry.is_file() else None
+    except OSError:
+        return None
+
+
+def iter_files(  # pylint: disable=too-many-arguments,too-many-locals
+    directory: Path,
+    *,
+    recursive: bool = True,
+    include: Iterable[str] = DEFAULT_INCLUDES,
+    exclude: Iterable[str] = DEFAULT_EXCLUDES,
+    extend_exclude: Iterable[str] = (),
+    gitignore: bool = True,
+) -> Iterator[Path]:
+    """
+    Yield the files under `directory` matching the `include` patterns. Files and
+    directories matching the `exclude` patterns or ignored by `.gitignore` files
+    are skipped, as are symlinks to directories.
+    """
+    includes = PatternSet(include)
+    excludes = PatternSet([*exclude, *extend_exclude])
+    prefix, gitignores = parent_gitignores(directory) if gitignore else ("", [])
+
+    stack = [(os.fspath(directory), "", gitignores)]
+    while stack:
+        path, rel_dir, pattern_sets = stack.pop()
+        entries = _scandir(path)
+        if gitignore and any(entry.name == GITIGNORE for entry in entries):
+            local = PatternSet.read(Path(path, GITIGNORE), prefix + rel_dir)
+            if local:
+                pattern_sets = [*pattern_sets, local]
+
+        subdirs = []
+        for entry in entries:
+            rel_path = rel_dir + entry.name
+            is_dir = _kind(entry)
+            if (
+                is_dir is None
+                or excludes.match(rel_path, is_dir)
+                or (pattern_sets and is_ignored(pattern_sets, prefix + rel_path, is_dir))
+            ):
+                continue
+
+            if not is_dir:
+                if includes.match(rel_path, False):
+                    yield Path(entry.path)
+            elif recursive:
+                subdirs.append((entry.path, rel_path + "/", pattern_sets))
+
+        stack.extend(reversed(subdirs))
@@ -0,0 +1,75 @@
+"""
+Format a document held in memory.
+
+This is the pipeline shared by the files, the standard input, asyncio and the API: parse,
+validate against a schema, compare with the canonical layout and serialize if needed.
+The front ends only read the document and write out the result.
+"""
+
+from __future__ import annotations
+
+import json
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Any, Callable, ContextManager, Tuple
+
+from jsonator.backend import dumps, get_backend, loads
+from jsonator.models import DIFF_STRUCTURAL
+from jsonator.verify import is_formatted
+
+if TYPE_CHECKING:
+    from jsonator.models import ModeArgs
+
+# Message, line and column of an invalid document. Schema errors have no position: 0, 0
+DocumentError = Tuple[str, int, int]
+
+
+def untimed(name: str) -> ContextManager[None]:  # pylint: disable=unused-argument
+    """Phase of a document which isn't timed."""
+    return nullcontext()
+
+
+def format_document(
+    text: str,
+    mode_args: ModeArgs,
+    dump_args: dict[str, Any],
+    *,
+    schema: str | None = None,
+    phase: Callable[[str], ContextManager[None]] = untimed,
+) -> tuple[bool, str | None, DocumentError | None, Any]:
+    """
+    Return whether the document would change, the formatted document if it changes and
+    the mode needs it, the error if it's invalid JSON or doesn't match `schema`, and the
+    parsed document when a structural diff will be made of it. `phase` times the steps.
+    """
+    try:
+        with phase("parse"):
+            document, backend = loads(text, get_backend(mode_args.backend), mode_args.strict)
+    except json.JSONDecodeError as exc:
+        return False, None, (exc.msg, exc.lineno, exc.colno), None
+
+    if schema is not None:
+        # Imported here: the API and most runs don't validate
+        from jsonator.schema import (  # pylint: disable=import-outside-toplevel  # noqa: PLC0415
+            validate,
+        )
+
+        with phase("validate"):
+            error = validate(document, schema)
+        if error is not None:
+            return False, None, (error, 0, 0), None
+
+    # Kept for the structural diff, which would parse the input again otherwise
+    structural = mode_args.diff and mode_args.diff_mode == DIFF_STRUCTURAL
+    diff_document = document if structural else None
+    # Compare the input with the canonical layout without building the output if possible
+    with phase("verify"):
+        is_identical = is_formatted(text, document, dump_args)
+    need_output = not mode_args.check or mode_args.diff
+    if is_identical or (is_identical is False and not need_output):
+        return not is_identical, None, None, diff_document
+
+    with phase("dump"):
+        output = dumps(document, dump_args, backend) + "\n"
+    if output == text:
+        return False, None, None, diff_document
+    return True, output, None, diff_document
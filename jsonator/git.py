@@ -0,0 +1,87 @@
+"""
+Find JSON files changed in a git repository.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterable
+
+from jsonator.discovery import DEFAULT_EXCLUDES, DEFAULT_INCLUDES, PatternSet, is_selected
+
+
+class GitError(Exception):
+    """Git is not available or the path is not inside a git repository."""
+
+
+def run_git(directory: Path, *args: str) -> list[str]:
+    """Run a git command in `directory` and return the NUL-separated output."""
+    # Imported here: runs without git options don't need it
+    import subprocess  # pylint: disable=import-outside-toplevel  # noqa: PLC0415
+
+    try:
+        process = subprocess.run(
+            ["git", "-C", str(directory), *args],
+            capture_output=True,
+            check=True,
+            text=True,
+            encoding="utf-8",
+        )
+    except FileNotFoundError as exc:
+        msg = "git is not installed"
+        raise GitError(msg) from exc
+    except subprocess.CalledProcessError as exc:
+        raise GitError(exc.stderr.strip()) from exc
+
+    return [name for name in process.stdout.split("\0") if name]
+
+
+def changed_files(  # pylint: disable=too-many-arguments
+    path: Path,
+    since: str | None = None,
+    staged: bool = False,
+    recursive: bool = True,
+    *,
+    include: Iterable[str] = DEFAULT_INCLUDES,
+    exclude: Iterable[str] = DEFAULT_EXCLUDES,
+    extend_exclude: Iterable[str] = (),
+) -> list[Path]:
+    """
+    Return JSON files under `path` that changed since the `since` revision
+    (including uncommitted and untracked files), or that are staged for commit.
+    Files in a directory are selected by the patterns of directory discovery.
+    Raises `GitError` if git fails or `since` isn't a revision.
+    """
+    directory = path if path.is_dir() else path.parent
+    if since is not None and since.startswith("-"):
+        # It would be read as an option of git diff. Revisions can't start with "-"
+        raise GitError(f"invalid revision: {since!r}")
+
+    if staged:
+        names = run_git(
+            directory, "diff", "--cached", "--name-only", "--relative", "--diff-filter=ACMR", "-z"
+        )
+    else:
+        names = run_git(
+            directory,
+            "diff",
+            "--name-only",
+            "--relative",
+            "--diff-filter=ACMR",
+            "-z",
+            since or "HEAD",
+            "--",
+        )
+        names += run_git(directory, "ls-files", "--others", "--exclude-standard", "-z")
+
+    if not path.is_dir():
+        # A file given by name is formatted whatever its name, like without git
+        return [path] if path.name in names else []
+
+    includes = PatternSet(include)
+    excludes = PatternSet([*exclude, *extend_exclude])
+    return [
+        directory / name
+        for name in dict.fromkeys(names)
+        if (recursive or "/" not in name) and is_selected(name, includes, excludes)
+    ]
@@ -6,17 +6,30 @@ from __future__ import annotations
 
 import json
 import logging
-from typing import TYPE_CHECKING, Any
+import mmap
+import os
+import sys
+import tempfile
+from functools import partial
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any
 
-from jsonator import output
+from jsonator.document import DocumentError, format_document
+from jsonator.models import DIFF_STRUCTURAL
+from jsonator.ndjson import PARALLEL_THRESHOLD, format_ndjson, is_ndjson
+from jsonator.schema import schema_for
+from jsonator.stream import CHUNK_SIZE, StreamFallback, StreamFormatter
+from jsonator.write import replace, resolve_link, write_atomic
 
 if TYPE_CHECKING:
-    from pathlib import Path
-
     from jsonator.models import ModeArgs
     from jsonator.report import Report
 
 UTF_8 = "utf-8"
+# Formats the standard input to the standard output
+STDIN = Path("-")
+# Smaller files are read at once, bigger ones decoded from a memory map
+MMAP_THRESHOLD = 256 * 1024
 
 
 def format_json_file(
@@ -26,39 +39,351 @@ def format_json_file(
     This function formats the file in JSON format.
     It uses the json.tool module, built into Python, to create a readable JSON format.
     """
-    log = logging.getLogger(__name__)
+    if is_ndjson(json_file):
+        format_ndjson_file(json_file, report, mode_args, dump_args)
+        return
+    schema = schema_for(json_file, mode_args)
+    # The streaming formatter doesn't build the document to validate or check
+    if (
+        mode_args.stream
+        and schema is None
+        and not mode_args.strict
+        and format_json_file_stream(json_file, report, mode_args, dump_args)
+    ):
+        return
+
     try:
-        input_json_data = json_file.read_text(encoding=UTF_8)
+        with report.phase(json_file, "read"):
+            input_json_data, size = read_text(json_file)
 
     except FileNotFoundError:
         report.failed(json_file, "File not found")
         return
 
+    report.count_bytes(json_file, read=size)
+
+    changed, output_json_data, error, input_json = format_document(
+        input_json_data, mode_args, dump_args, schema=schema, phase=partial(report.phase, json_file)
+    )
+    if error is not None:
+        report_error(report, json_file, error)
+        return
+
+    if output_json_data is not None and not mode_args.check:
+        try:
+            with report.phase(json_file, "write"):
+                size = write_atomic(json_file, output_json_data, mode_args.fsync)
+        except OSError as exc:
+            report_os_error(report, json_file, exc)
+            return
+        report.count_bytes(json_file, written=size)
+
+    report.done(json_file, changed)
+
+    if mode_args.diff and output_json_data is not None:
+        with report.phase(json_file, "diff"):
+            log_diff(json_file, input_json_data, output_json_data, mode_args, input_json)
+
+
+def report_error(report: Report, src: Path, error: DocumentError) -> None:
+    """Report a document which can't be formatted, with the position of the error if any."""
+    message, line, column = error
+    report.failed(src, message, (line, column) if line else None)
+
+
+def report_os_error(report: Report, src: Path, exc: OSError) -> None:
+    """
+    Report a file which can't be written, like one removed since it was read or one in a
+    read-only directory, where no temporary file can be created.
+    """
+    if isinstance(exc, FileNotFoundError):
+        report.failed(src, "File not found")
+    else:
+        report.failed(src, str(exc.strerror or exc))
+
+
+def open_tmp_file(json_file: Path, mode_args: ModeArgs, mode: str) -> IO[Any]:
+    """Open the temporary file which gets the output of `json_file`, in `mode`."""
+    # In check mode the directory may be read-only, so use the system temp directory
+    tmp_dir = None if mode_args.check else resolve_link(json_file).parent
+    return tempfile.NamedTemporaryFile(
+        mode,
+        encoding=None if "b" in mode else UTF_8,
+        dir=tmp_dir,
+        prefix=f".{json_file.name}.",
+        delete=False,
+    )
+
+
+def format_stdin(report: Report, mode_args: ModeArgs, dump_args: dict[str, Any]) -> None:
+    """
+    Format the document of the standard input to the standard output. Nothing is written
+    if it's invalid, or in check and diff modes.
+    """
+    with report.phase(STDIN, "read"):
+        data = sys.stdin.buffer.read()
+    report.count_bytes(STDIN, read=len(data))
+
     try:
-        input_json = json.loads(input_json_data)
+        # Universal newlines, like the files
+        input_json_data = data.decode(UTF_8).replace("\r\n", "\n").replace("\r", "\n")
+    except UnicodeDecodeError as exc:
+        report.failed(STDIN, exc.reason)
+        return
 
-    except json.decoder.JSONDecodeError as exc:
-        report.failed(json_file, exc.msg)
+    changed, output_json_data, error, input_json = format_document(
+        input_json_data,
+        mode_args,
+        dump_args,
+        schema=mode_args.schema,
+        phase=partial(report.phase, STDIN),
+    )
+    if error is not None:
+        report_error(report, STDIN, error)
         return
 
-    output_json_data = json.dumps(input_json, **dump_args) + "\n"
-    is_identical = input_json_data == output_json_data
+    if not mode_args.check and not mode_args.diff:
+        with report.phase(STDIN, "write"):
+            encoded = (input_json_data if output_json_data is None else output_json_data).encode(
+                UTF_8
+            )
+            sys.stdout.buffer.write(encoded)
+            sys.stdout.buffer.flush()
+        report.count_bytes(STDIN, written=len(encoded))
+
+    report.done(STDIN, changed)
+
+    if mode_args.diff and output_json_data is not None:
+        with report.phase(STDIN, "diff"):
+            log_diff(STDIN, input_json_data, output_json_data, mode_args, input_json)
+
+
+def format_json_file_stream(  # pylint: disable=too-many-return-statements
+    json_file: Path, report: Report, mode_args: ModeArgs, dump_args: dict[str, Any]
+) -> bool:
+    """
+    Format the file with the streaming formatter, keeping memory usage flat.
+    The output is written to a temporary file, which replaces the original one if needed.
+    Return False if the file can't be streamed and has to be formatted in memory.
+    """
+    try:
+        formatter = StreamFormatter(dump_args)
+        src = json_file.open(encoding=UTF_8)
+
+    except StreamFallback:
+        return False
+
+    except FileNotFoundError:
+        report.failed(json_file, "File not found")
+        return True
+
+    try:
+        dst = open_tmp_file(json_file, mode_args, "w")
+    except OSError as exc:
+        src.close()
+        report_os_error(report, json_file, exc)
+        return True
+
+    with src, dst:
+        tmp_file = Path(dst.name)
+        try:
+            with report.phase(json_file, "stream"):
+                formatter.format(src, dst)
+
+        except StreamFallback:
+            dst.close()
+            tmp_file.unlink()
+            return False
+
+        except json.decoder.JSONDecodeError as exc:
+            dst.close()
+            tmp_file.unlink()
+            report.failed(json_file, exc.msg, (exc.lineno, exc.colno))
+            return True
+
+    try:
+        with report.phase(json_file, "compare"):
+            is_identical = same_text(json_file, tmp_file)
+        diff_texts = None
+
+        if mode_args.diff and not is_identical:
+            diff_texts = read_text(json_file)[0], read_text(tmp_file)[0]
+
+        # Sizes are only looked up if they are counted
+        if report.stats is not None or report.results is not None:
+            written = 0 if is_identical or mode_args.check else tmp_file.stat().st_size
+            report.count_bytes(json_file, json_file.stat().st_size, written)
+
+        if not is_identical and not mode_args.check:
+            with report.phase(json_file, "write"):
+                replace(tmp_file, json_file, mode_args.fsync)
+
+    except OSError as exc:
+        report_os_error(report, json_file, exc)
+        return True
 
-    if not is_identical and not mode_args.check:
-        json_file.write_text(output_json_data, encoding=UTF_8)
+    finally:
+        if tmp_file.exists():
+            tmp_file.unlink()
 
     report.done(json_file, not is_identical)
 
-    if mode_args.diff:
-        diff_contents = output.diff(
-            input_json_data,
-            output_json_data,
-            json_file.name,
-            "formatted file",
+    if diff_texts is not None:
+        with report.phase(json_file, "diff"):
+            log_diff(json_file, *diff_texts, mode_args)
+
+    return True
+
+
+def format_ndjson_file(
+    json_file: Path, report: Report, mode_args: ModeArgs, dump_args: dict[str, Any]
+) -> None:
+    """
+    Format a JSON Lines file record by record, see `jsonator.ndjson`.
+    The output is written to a temporary file, which replaces the original one if needed.
+    """
+    try:
+        src = json_file.open("rb")
+    except FileNotFoundError:
+        report.failed(json_file, "File not found")
+        return
+
+    size = os.fstat(src.fileno()).st_size
+    jobs = mode_args.jobs if size > PARALLEL_THRESHOLD else 1
+    need_output = not mode_args.check or mode_args.diff
+    try:
+        dst = open_tmp_file(json_file, mode_args, "w+b")
+    except OSError as exc:
+        src.close()
+        report_os_error(report, json_file, exc)
+        return
+
+    with src, dst:
+        tmp_file = Path(dst.name)
+        with report.phase(json_file, "format"):
+            changed, error = format_ndjson(
+                src,
+                dst if need_output else None,
+                dump_args,
+                mode_args.backend,
+                jobs,
+                schema=schema_for(json_file, mode_args),
+                strict=mode_args.strict,
+            )
+
+    try:
+        if error is not None:
+            report.failed(json_file, error[0], error[1:])
+            return
+
+        diff_texts = None
+        if mode_args.diff and changed:
+            diff_texts = read_text(json_file)[0], read_text(tmp_file)[0]
+
+        written = 0
+        if changed and not mode_args.check:
+            written = tmp_file.stat().st_size
+            with report.phase(json_file, "write"):
+                replace(tmp_file, json_file, mode_args.fsync)
+        report.count_bytes(json_file, size, written)
+
+    except OSError as exc:
+        report_os_error(report, json_file, exc)
+        return
+
+    finally:
+        if tmp_file.exists():
+            tmp_file.unlink()
+
+    report.done(json_file, changed)
+
+    if diff_texts is not None:
+        with report.phase(json_file, "diff"):
+            log_diff(json_file, *diff_texts, mode_args)
+
+
+def read_text(path: Path) -> tuple[str, int]:
+    """
+    Return the text of the file with universal newlines, like `Path.read_text`, and its
+    size in bytes. Big files are decoded straight from a memory map of the file, without
+    a full-size copy of their bytes.
+    """
+    with path.open("rb") as src:
+        if os.fstat(src.fileno()).st_size < MMAP_THRESHOLD:
+            # Also special files, which report no size and can't be mapped
+            data = src.read()
+            text, size = data.decode(UTF_8), len(data)
+        else:
+            with mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                text, size = str(mapped, UTF_8), len(mapped)
+
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text, size
+
+
+def same_bytes(a_file: Path, b_file: Path) -> bool:
+    """Compare the bytes of two files chunk by chunk."""
+    if a_file.stat().st_size != b_file.stat().st_size:
+        return False
+    with a_file.open("rb") as a_stream, b_file.open("rb") as b_stream:
+        while True:
+            a_chunk = a_stream.read(CHUNK_SIZE)
+            if a_chunk != b_stream.read(CHUNK_SIZE):
+                return False
+            if not a_chunk:
+                return True
+
+
+def has_carriage_return(path: Path) -> bool:
+    """Return whether the file contains a carriage return."""
+    with path.open("rb") as stream:
+        return any(b"\r" in chunk for chunk in iter(lambda: stream.read(CHUNK_SIZE), b""))
+
+
+def same_text(a_file: Path, b_file: Path) -> bool:
+    """Compare the text of two files chunk by chunk, their bytes first."""
+    if same_bytes(a_file, b_file):
+        return True
+    # Without line endings to translate, different bytes are different texts
+    if not has_carriage_return(a_file) and not has_carriage_return(b_file):
+        return False
+
+    with a_file.open(encoding=UTF_8) as a_stream, b_file.open(encoding=UTF_8) as b_stream:
+        while True:
+            a_chunk = a_stream.read(CHUNK_SIZE)
+            if a_chunk != b_stream.read(CHUNK_SIZE):
+                return False
+            if not a_chunk:
+                return True
+
+
+def log_diff(
+    json_file: Path,
+    input_json_data: str,
+    output_json_data: str,
+    mode_args: ModeArgs,
+    input_json: Any = None,
+) -> None:
+    """
+    Write out the diff between the input and the formatted output on stdout. The structural
+    diff uses the parsed `input_json` if given.
+    """
+    if not logging.getLogger(__name__).isEnabledFor(logging.WARNING):
+        return
+
+    from jsonator import output  # pylint: disable=import-outside-toplevel  # noqa: PLC0415
+
+    if mode_args.diff_mode == DIFF_STRUCTURAL:
+        diff_lines = output.iter_document_diff(
+            input_json_data, output_json_data, json_file.name, "formatted file", input_json
+        )
+    else:
+        diff_lines = output.iter_diff(
+            input_json_data, output_json_data, json_file.name, "formatted file"
         )
 
-        if mode_args.color:
-            diff_contents = output.color_diff(diff_contents)
+    if mode_args.color:
+        diff_lines = output.iter_color(diff_lines)
 
-        if diff_contents:
-            log.warning(diff_contents)
+    output.write_diff(diff_lines)
@@ -1,12 +1,50 @@
 """Models"""
 
 from dataclasses import dataclass
+from typing import Optional, Tuple
+
+DIFF_TEXT = "text"
+DIFF_STRUCTURAL = "structural"
+REPORT_FORMATS = ("json", "sarif", "junit")
+# Patterns of the files found in directories, and of the files and directories skipped
+DEFAULT_INCLUDES = ("*.json", "*.jsonl", "*.ndjson")
+DEFAULT_EXCLUDES = (
+    ".direnv/",
+    ".eggs/",
+    ".git/",
+    ".hg/",
+    ".mypy_cache/",
+    ".nox/",
+    ".pytest_cache/",
+    ".svn/",
+    ".tox/",
+    ".venv/",
+    "__pycache__/",
+    "_build/",
+    "build/",
+    "dist/",
+    "node_modules/",
+    "venv/",
+)
 
 
 @dataclass
-class ModeArgs:
+class ModeArgs:  # pylint: disable=too-many-instance-attributes
     """Mode args"""
 
     check: bool
     diff: bool
     color: bool
+    stream: bool = False
+    backend: str = "json"
+    stats: bool = False
+    trace: bool = False
+    fsync: str = "never"
+    diff_mode: str = DIFF_TEXT
+    jobs: int = 1
+    report: bool = False
+    # Path of the default JSON Schema, and (glob, path) pairs of the schemas of some files
+    schema: Optional[str] = None
+    schema_map: Tuple[Tuple[str, str], ...] = ()
+    # Reject duplicate keys and numbers which can't be represented exactly
+    strict: bool = False
@@ -0,0 +1,172 @@
+"""
+JSON Lines (NDJSON) files: one document per line.
+
+Records are read in chunks of whole lines and written back compact, one per line, with
+the keys sorted if requested. Blank lines are dropped. Memory use doesn't depend on the
+size of the file, and the chunks of big files are formatted in worker processes.
+Errors give the position of the first invalid record.
+"""
+
+from __future__ import annotations
+
+import json
+from collections import deque
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, BinaryIO, Iterable, Iterator, Optional, Tuple
+
+from jsonator.backend import STDLIB, dumps, get_backend, loads
+from jsonator.schema import validate
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor, Future
+
+SUFFIXES = (".jsonl", ".ndjson")
+CHUNK_SIZE = 1024 * 1024
+# Smaller files are formatted in the current process
+PARALLEL_THRESHOLD = 4 * CHUNK_SIZE
+
+# The message, line and column of an error
+RecordError = Tuple[str, int, int]
+# A chunk formatted, or the error of its first invalid record
+Result = Tuple[bytes, Optional[RecordError]]
+
+
+def is_ndjson(path: Path) -> bool:
+    """Return whether the file holds JSON Lines."""
+    return path.suffix.lower() in SUFFIXES
+
+
+def record_args(dump_args: dict[str, Any]) -> dict[str, Any]:
+    """Return the dump arguments of the records: compact, with the other options kept."""
+    return {
+        "sort_keys": bool(dump_args.get("sort_keys")),
+        "indent": None,
+        "ensure_ascii": dump_args.get("ensure_ascii", True),
+        "separators": (",", ":"),
+    }
+
+
+def read_chunks(stream: BinaryIO, size: int = CHUNK_SIZE) -> Iterator[tuple[int, bytes]]:
+    """Yield chunks of about `size` bytes of whole lines, with the number of their first line."""
+    line = 1
+    while True:
+        chunk = stream.read(size)
+        if not chunk:
+            return
+        if not chunk.endswith(b"\n"):
+            chunk += stream.readline()
+        yield line, chunk
+        line += chunk.count(b"\n")
+
+
+def format_records(  # pylint: disable=too-many-arguments
+    chunk: bytes,
+    first_line: int,
+    args: dict[str, Any],
+    backend: str,
+    *,
+    schema: str | None = None,
+    strict: bool = False,
+) -> Result:
+    """
+    Format the records of a chunk, one per line, validating them against `schema`.
+    With `strict`, records with duplicate keys or lossy numbers are errors.
+    """
+    codec = get_backend(backend)
+    records = []
+    for number, line in enumerate(chunk.split(b"\n"), first_line):
+        try:
+            text = line.decode("utf-8")
+        except UnicodeDecodeError as exc:
+            return b"", (exc.reason, number, exc.start + 1)
+        if not text.strip():
+            continue
+
+        try:
+            document, record_codec = loads(text, codec, strict)
+        except json.JSONDecodeError as exc:
+            return b"", (exc.msg, number, exc.colno)
+        if schema is not None:
+            error = validate(document, schema)
+            if error is not None:
+                return b"", (error, number, 1)
+        records.append(dumps(document, args, record_codec))
+
+    if not records:
+        return b"", None
+    return ("\n".join(records) + "\n").encode("utf-8"), None
+
+
+def format_chunks(  # pylint: disable=too-many-arguments
+    chunks: Iterable[tuple[int, bytes]],
+    args: dict[str, Any],
+    backend: str,
+    jobs: int,
+    *,
+    schema: str | None = None,
+    strict: bool = False,
+) -> Iterator[tuple[bytes, Result]]:
+    """
+    Yield every chunk with its result, in order. With several `jobs`, up to twice as many
+    chunks are formatted at once in worker processes.
+    """
+    executor: Executor | None = None
+    if jobs > 1:
+        # pylint: disable-next=import-outside-toplevel
+        from concurrent.futures import ProcessPoolExecutor  # noqa: PLC0415
+
+        try:
+            executor = ProcessPoolExecutor(max_workers=jobs)
+        except (ImportError, NotImplementedError, OSError):
+            executor = None
+
+    if executor is None:
+        for first_line, chunk in chunks:
+            yield chunk, format_records(
+                chunk, first_line, args, backend, schema=schema, strict=strict
+            )
+        return
+
+    with executor:
+        pending: deque[tuple[bytes, Future[Result]]] = deque()
+        for first_line, chunk in chunks:
+            future = executor.submit(
+                format_records, chunk, first_line, args, backend, schema=schema, strict=strict
+            )
+            pending.append((chunk, future))
+            if len(pending) >= 2 * jobs:
+                chunk, future = pending.popleft()
+                yield chunk, future.result()
+        while pending:
+            chunk, future = pending.popleft()
+            yield chunk, future.result()
+
+
+def format_ndjson(  # pylint: disable=too-many-arguments
+    src: BinaryIO,
+    dst: IO[bytes] | None,
+    dump_args: dict[str, Any],
+    backend: str,
+    jobs: int = 1,
+    *,
+    schema: str | None = None,
+    strict: bool = False,
+) -> tuple[bool, RecordError | None]:
+    """
+    Format the records of `src` into `dst`, if given, with `backend` or the standard
+    library if it can't write them compact. Return whether the records change and the
+    error if one is invalid, doesn't match `schema` or, with `strict`, would lose data.
+    """
+    args = record_args(dump_args)
+    if not get_backend(backend).supports(args):
+        backend = STDLIB
+
+    changed = False
+    results = format_chunks(read_chunks(src), args, backend, jobs, schema=schema, strict=strict)
+    for chunk, (formatted, error) in results:
+        if error is not None:
+            return changed, error
+        changed = changed or formatted != chunk
+        if dst is not None:
+            dst.write(formatted)
+    return changed, None
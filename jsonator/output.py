@@ -1,41 +1,121 @@
 """
 Output features
+
+Diffs are generated line by line and written to stdout in buffered chunks, so output
+starts right away and memory doesn't grow with the size of the diff.
 """
 
+from __future__ import annotations
+
+import json
+import sys
+import threading
+from typing import Any, Iterable, Iterator, TextIO
+
+from jsonator.diff import DEFAULT_TIMEOUT, unified_diff
+from jsonator.structural import iter_structural_diff
+
+WRITE_SIZE = 64 * 1024
+
+# Keeps the diffs of files formatted at the same time apart. Worker processes get a
+# lock shared with the other workers.
+DIFF_LOCK: Any = threading.Lock()
 
-def diff(a_text: str, b_text: str, a_name: str, b_name: str) -> str:
-    """Return a unified diff string between strings `a` and `b`."""
-    import difflib  # pylint: disable=import-outside-toplevel  # noqa: PLC0415
 
+def iter_diff(
+    a_text: str, b_text: str, a_name: str, b_name: str, timeout: float = DEFAULT_TIMEOUT
+) -> Iterator[str]:
+    """
+    Yield the lines of the unified diff between strings `a` and `b`. After `timeout`
+    seconds, the diff replaces the whole file.
+    """
     a_lines = a_text.splitlines(keepends=True)
     b_lines = b_text.splitlines(keepends=True)
-    diff_lines = []
 
-    for line in difflib.unified_diff(a_lines, b_lines, fromfile=a_name, tofile=b_name, n=5):
+    for line in unified_diff(a_lines, b_lines, a_name, b_name, context=5, timeout=timeout):
         # Work around https://bugs.python.org/issue2142
         # See:
         # https://www.gnu.org/software/diffutils/manual/html_node/Incomplete-Lines.html
         if line[-1] == "\n":
-            diff_lines.append(line)
+            yield line
         else:
-            diff_lines.extend((line + "\n", "\\ No newline at end of file\n"))
+            yield line + "\n"
+            yield "\\ No newline at end of file\n"
+
+
+def diff(
+    a_text: str, b_text: str, a_name: str, b_name: str, timeout: float = DEFAULT_TIMEOUT
+) -> str:
+    """Return a unified diff string between strings `a` and `b`."""
+    return "".join(iter_diff(a_text, b_text, a_name, b_name, timeout))
+
+
+def iter_document_diff(
+    a_text: str, b_text: str, a_name: str, b_name: str, a_document: Any = None
+) -> Iterator[str]:
+    """
+    Yield the lines of the structural diff between the documents `a` and `b`. `a_text` is
+    parsed again unless its document is given.
+    """
+    if a_document is None:
+        a_document = json.loads(a_text)
+    return iter_structural_diff(a_document, json.loads(b_text), a_name, b_name)
 
-    return "".join(diff_lines)
+
+def document_diff(a_text: str, b_text: str, a_name: str, b_name: str) -> str:
+    """Return the structural diff between the documents `a` and `b` by JSON path."""
+    return "".join(iter_document_diff(a_text, b_text, a_name, b_name))
+
+
+def color_line(line: str) -> str:
+    """Inject the ANSI color codes to a diff line without its line break."""
+    if line.startswith(("+++", "---")):
+        return "\033[1m" + line + "\033[0m"  # bold, reset
+    if line.startswith("@@"):
+        return "\033[36m" + line + "\033[0m"  # cyan, reset
+    if line.startswith("+"):
+        return "\033[32m" + line + "\033[0m"  # green, reset
+    if line.startswith("-"):
+        return "\033[31m" + line + "\033[0m"  # red, reset
+    return line
+
+
+def iter_color(lines: Iterable[str]) -> Iterator[str]:
+    """Inject the ANSI color codes to the diff lines."""
+    for line in lines:
+        if line.endswith("\n"):
+            yield color_line(line[:-1]) + "\n"
+        else:
+            yield color_line(line)
 
 
 def color_diff(contents: str) -> str:
     """Inject the ANSI color codes to the diff."""
-    lines = contents.split("\n")
-    for i, line in enumerate(lines):
-        if line.startswith(("+++", "---")):
-            new_line = "\033[1m" + line + "\033[0m"  # bold, reset
-        elif line.startswith("@@"):
-            new_line = "\033[36m" + line + "\033[0m"  # cyan, reset
-        elif line.startswith("+"):
-            new_line = "\033[32m" + line + "\033[0m"  # green, reset
-        elif line.startswith("-"):
-            new_line = "\033[31m" + line + "\033[0m"  # red, reset
-        else:
-            new_line = line
-        lines[i] = new_line
-    return "\n".join(lines)
+    return "\n".join(color_line(line) for line in contents.split("\n"))
+
+
+def iter_chunks(lines: Iterable[str]) -> Iterator[str]:
+    """Join the lines in chunks of `WRITE_SIZE`."""
+    chunk: list[str] = []
+    size = 0
+    for line in lines:
+        chunk.append(line)
+        size += len(line)
+        if size >= WRITE_SIZE:
+            yield "".join(chunk)
+            chunk.clear()
+            size = 0
+    if chunk:
+        yield "".join(chunk)
+
+
+def write_diff(lines: Iterable[str], stream: TextIO | None = None) -> None:
+    """
+    Write the diff lines to `stream`, stdout by default, in chunks of `WRITE_SIZE` as they
+    are generated. `DIFF_LOCK` is held throughout, so the diff comes out in one piece.
+    """
+    with DIFF_LOCK:
+        stream = stream or sys.stdout
+        for chunk in iter_chunks(lines):
+            stream.write(chunk)
+        stream.flush()
@@ -2,38 +2,166 @@
 Summarize runs.
 """
 
+from __future__ import annotations
+
 import logging
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
 from pathlib import Path
+from typing import TYPE_CHECKING, ContextManager, Iterator
 
 from jsonator.enum import ReturnCode
 
+if TYPE_CHECKING:
+    from jsonator.reporters import Reporter
+    from jsonator.stats import Stats
+
+UNCHANGED = "unchanged"
+REFORMATTED = "reformatted"
+WOULD_REFORMAT = "would-reformat"
+FAILED = "failed"
+# Phases which run after the result of the file is recorded
+LATE_PHASES = ("diff",)
+
+
+@dataclass
+class FileResult:  # pylint: disable=too-many-instance-attributes
+    """The outcome of formatting a file, for the machine-readable reports."""
+
+    path: str
+    status: str
+    message: str | None = None
+    line: int | None = None
+    column: int | None = None
+    bytes_read: int = 0
+    bytes_written: int = 0
+    seconds: float = 0.0
+
 
-class Report:
+class Report:  # pylint: disable=too-many-instance-attributes
     """Provides a reformatting counter. Can be rendered with `str(report)`."""
 
-    def __init__(self, check: bool, diff: bool) -> None:
+    def __init__(
+        self,
+        check: bool,
+        diff: bool,
+        stats: Stats | None = None,
+        *,
+        record: bool = False,
+        reporter: Reporter | None = None,
+    ) -> None:
+        """
+        With `record` set, the result of every file is kept in `results`, or passed to
+        `reporter` if given.
+        """
         self.check = check
         self.diff = diff
+        self.stats = stats
+        self.reporter = reporter
+        self.results: list[FileResult] | None = [] if record or reporter else None
+        # Metrics of the files being formatted
+        self._pending: dict[Path, FileResult] = {}
         self.change_count = 0
         self.same_count = 0
         self.failure_count = 0
+        self.well_formatted: list[Path] = []
+        self.written: list[Path] = []
         self._log = logging.getLogger(self.__class__.__name__)
 
     def done(self, src: Path, changed: bool) -> None:
         """Increment the counter for successful reformatting. Write out a message."""
+        if not changed or not self.check:
+            self.well_formatted.append(src)
+
         if changed:
+            if not self.check:
+                self.written.append(src)
             reformatted = "would reformat" if self.check or self.diff else "reformatted"
             self._log.warning("%s %s", reformatted, src)
             self.change_count += 1
+            self._record(src, WOULD_REFORMAT if self.check or self.diff else REFORMATTED)
 
         else:
             self._log.info("%s already well formatted, good job.", src)
             self.same_count += 1
+            self._record(src, UNCHANGED)
 
-    def failed(self, src: Path, message: str) -> None:
-        """Increment the counter for failed reformatting. Write out a message."""
-        self._log.error("error: cannot format %s: %s", src, message)
+    def failed(self, src: Path, message: str, position: tuple[int, int] | None = None) -> None:
+        """
+        Increment the counter for failed reformatting. Write out a message.
+        `position` is the line and column of the error.
+        """
+        line, column = position or (None, None)
+        if position:
+            self._log.error(
+                "error: cannot format %s: line %d, column %d: %s", src, *position, message
+            )
+        else:
+            self._log.error("error: cannot format %s: %s", src, message)
         self.failure_count += 1
+        self._record(src, FAILED, message=message, line=line, column=column)
+
+    def _record(self, src: Path, status: str, **details: str | int | None) -> None:
+        if self.results is None:
+            return
+        result = self._pending.pop(src, None) or FileResult(str(src), status)
+        result.status = status
+        for name, value in details.items():
+            setattr(result, name, value)
+        self.add_result(result)
+
+    def add_result(self, result: FileResult) -> None:
+        """Pass the result of a file to the reporter, or keep it."""
+        if self.reporter is not None:
+            self.reporter.add(result)
+        elif self.results is not None:
+            self.results.append(result)
+
+    def _pending_result(self, src: Path) -> FileResult:
+        result = self._pending.get(src)
+        if result is None:
+            result = self._pending[src] = FileResult(str(src), "")
+        return result
+
+    def phase(self, src: Path | None, name: str) -> ContextManager[None]:
+        """Time a phase of processing `src`, or of the run if None, if timings are collected."""
+        if self.results is not None and src is not None and name not in LATE_PHASES:
+            return self._timed_phase(src, name)
+        if self.stats is None:
+            return nullcontext()
+        return self.stats.phase(src, name)
+
+    @contextmanager
+    def _timed_phase(self, src: Path, name: str) -> Iterator[None]:
+        result = self._pending_result(src)
+        start = time.perf_counter()
+        try:
+            with nullcontext() if self.stats is None else self.stats.phase(src, name):
+                yield
+        finally:
+            result.seconds += time.perf_counter() - start
+
+    def count_bytes(self, src: Path, read: int = 0, written: int = 0) -> None:
+        """Count the bytes read from and written to `src` if timings are collected."""
+        if self.stats is not None:
+            self.stats.count_bytes(src, read, written)
+        if self.results is not None:
+            result = self._pending_result(src)
+            result.bytes_read += read
+            result.bytes_written += written
+
+    def merge(self, other: Report) -> None:
+        """Add the counters of another report (e.g. from a worker process) to this one."""
+        self.change_count += other.change_count
+        self.same_count += other.same_count
+        self.failure_count += other.failure_count
+        self.well_formatted.extend(other.well_formatted)
+        self.written.extend(other.written)
+        for result in other.results or ():
+            self.add_result(result)
+        if self.stats is not None and other.stats is not None:
+            self.stats.merge(other.stats)
 
     @property
     def status(self) -> int:
@@ -0,0 +1,191 @@
+"""
+Machine-readable reports of a run: JSON, SARIF 2.1.0 or JUnit XML.
+
+Every file gets an entry with its status, the position of its error, the bytes read and
+written and the time spent on it. Entries are written as soon as files are done, so the
+memory use doesn't grow with the number of files.
+"""
+
+from __future__ import annotations
+
+import abc
+import json
+from typing import TYPE_CHECKING, Any, TextIO
+
+from jsonator.enum import ReturnCode
+from jsonator.report import FAILED, UNCHANGED, FileResult
+
+if TYPE_CHECKING:
+    from jsonator.report import Report
+
+# Like xml.sax.saxutils.quoteattr, which imports urllib.request
+XML_ESCAPES = str.maketrans(
+    {
+        "&": "&amp;",
+        "<": "&lt;",
+        ">": "&gt;",
+        '"': "&quot;",
+        "\n": "&#10;",
+        "\r": "&#13;",
+        "\t": "&#9;",
+    }
+)
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+INFORMATION_URI = "https://github.com/sfominx/jsonator"
+
+
+def quoteattr(value: str) -> str:
+    """Return `value` escaped and quoted as an XML attribute value."""
+    return f'"{value.translate(XML_ESCAPES)}"'
+
+
+def metrics(result: FileResult) -> dict[str, Any]:
+    """Return the metrics of a file."""
+    return {
+        "bytes_read": result.bytes_read,
+        "bytes_written": result.bytes_written,
+        "seconds": round(result.seconds, 6),
+    }
+
+
+def summary(report: Report, status: int) -> dict[str, int]:
+    """Return the counters of the run and its exit status."""
+    return {
+        "changed": report.change_count,
+        "unchanged": report.same_count,
+        "failed": report.failure_count,
+        "status": status,
+    }
+
+
+class Reporter(abc.ABC):
+    """Write the entries of the files to `stream` as they come."""
+
+    def __init__(self, stream: TextIO) -> None:
+        self.stream = stream
+        self.count = 0
+        self.start()
+
+    def start(self) -> None:
+        """Write what comes before the entries."""
+
+    def add(self, result: FileResult) -> None:
+        """Write the entry of a file."""
+        self.write_entry(result)
+        self.count += 1
+
+    @abc.abstractmethod
+    def write_entry(self, result: FileResult) -> None:
+        """Write the entry of a file, after `count` others."""
+
+    def finish(self, report: Report, status: int) -> None:  # pylint: disable=unused-argument
+        """Write what comes after the entries, with the counters of `report` and `status`."""
+        self.stream.flush()
+
+
+class JsonReporter(Reporter):
+    """A JSON document: `{"files": [...], "summary": {...}}`, with an entry per line."""
+
+    def start(self) -> None:
+        self.stream.write('{"files": [')
+
+    def write_entry(self, result: FileResult) -> None:
+        entry: dict[str, Any] = {"path": result.path, "status": result.status}
+        if result.message is not None:
+            entry["error"] = {
+                "message": result.message,
+                "line": result.line,
+                "column": result.column,
+            }
+        entry.update(metrics(result))
+        self.stream.write(("\n" if not self.count else ",\n") + json.dumps(entry))
+
+    def finish(self, report: Report, status: int) -> None:
+        self.stream.write(f'\n], "summary": {json.dumps(summary(report, status))}}}\n')
+        super().finish(report, status)
+
+
+class SarifReporter(Reporter):
+    """
+    A SARIF log with a result per file: an error for files which can't be parsed,
+    a warning for files to reformat, a pass for the others.
+    """
+
+    def start(self) -> None:
+        driver = {
+            "name": "jsonator",
+            "informationUri": INFORMATION_URI,
+            "rules": [
+                {"id": "format", "shortDescription": {"text": "File is not well formatted"}},
+                {"id": "parse", "shortDescription": {"text": "File is not valid JSON"}},
+            ],
+        }
+        # The run is left open for its results
+        self.stream.write(
+            f'{{"$schema": {json.dumps(SARIF_SCHEMA)}, "version": "2.1.0", '
+            f'"runs": [{{"tool": {json.dumps({"driver": driver})}, "results": ['
+        )
+
+    def write_entry(self, result: FileResult) -> None:
+        location: dict[str, Any] = {"artifactLocation": {"uri": result.path}}
+        entry: dict[str, Any]
+        if result.status == FAILED:
+            entry = {"ruleId": "parse", "level": "error", "message": {"text": result.message}}
+            if result.line is not None:
+                location["region"] = {"startLine": result.line, "startColumn": result.column}
+        elif result.status == UNCHANGED:
+            entry = {"ruleId": "format", "kind": "pass", "message": {"text": "Well formatted"}}
+        else:
+            entry = {"ruleId": "format", "level": "warning", "message": {"text": result.status}}
+        entry["locations"] = [{"physicalLocation": location}]
+        entry["properties"] = metrics(result)
+        self.stream.write(("\n" if not self.count else ",\n") + json.dumps(entry))
+
+    def finish(self, report: Report, status: int) -> None:
+        invocation = {
+            # Files which can't be parsed are results, not a failure of the run
+            "executionSuccessful": bool(report.failure_count)
+            or status != ReturnCode.INTERNAL_ERROR.value,
+            "exitCode": status,
+            "properties": summary(report, status),
+        }
+        self.stream.write(f'\n], "invocations": [{json.dumps(invocation)}]}}]}}\n')
+        super().finish(report, status)
+
+
+class JUnitReporter(Reporter):
+    """
+    A JUnit XML test suite with a test case per file: an error for files which can't be
+    parsed, a failure for files to reformat.
+    """
+
+    def start(self) -> None:
+        self.stream.write('<?xml version="1.0" encoding="utf-8"?>\n')
+        self.stream.write('<testsuites>\n<testsuite name="jsonator">\n')
+
+    def write_entry(self, result: FileResult) -> None:
+        self.stream.write(
+            f'<testcase classname="jsonator" name={quoteattr(result.path)}'
+            f' time="{result.seconds:.6f}">\n<properties>\n'
+        )
+        for name, value in metrics(result).items():
+            self.stream.write(f'<property name="{name}" value="{value}"/>\n')
+        self.stream.write("</properties>\n")
+        if result.status == FAILED:
+            message = f"line {result.line}, column {result.column}: " if result.line else ""
+            message += result.message or ""
+            self.stream.write(f'<error type="parse" message={quoteattr(message)}/>\n')
+        elif result.status != UNCHANGED:
+            self.stream.write(f'<failure type="format" message={quoteattr(result.status)}/>\n')
+        self.stream.write("</testcase>\n")
+
+    def finish(self, report: Report, status: int) -> None:
+        self.stream.write("</testsuite>\n</testsuites>\n")
+        super().finish(report, status)
+
+
+REPORTERS: dict[str, type[Reporter]] = {
+    "json": JsonReporter,
+    "sarif": SarifReporter,
+    "junit": JUnitReporter,
+}
@@ -0,0 +1,85 @@
+"""
+JSON Schema validation.
+
+A schema is loaded and checked once per process, then its validator is reused for every
+document, in the main process and in every worker. Files are mapped to schemas with
+globs, the first matching one wins, the default schema applies to the other files.
+
+jsonschema is an optional dependency: `pip install jsonator[schema]`.
+"""
+
+from __future__ import annotations
+
+import json
+from functools import lru_cache
+from pathlib import Path, PurePath
+from typing import TYPE_CHECKING, Any, Iterable
+
+if TYPE_CHECKING:
+    from jsonator.models import ModeArgs
+
+
+class SchemaError(Exception):
+    """The schema can't be read or is not a valid JSON Schema."""
+
+
+def json_pointer(path: Iterable[str | int]) -> str:
+    """Return the JSON pointer (RFC 6901) of the keys and indexes in `path`."""
+    return "".join(f"/{str(key).replace('~', '~0').replace('/', '~1')}" for key in path)
+
+
+@lru_cache(maxsize=None)
+def load_validator(schema_path: str) -> Any:
+    """
+    Return the validator of the schema, created once per process.
+    Raises `ImportError` if jsonschema is not installed, `SchemaError` if the schema
+    can't be used.
+    """
+    # Imported here: runs without schemas don't need it
+    import jsonschema  # pylint: disable=import-outside-toplevel  # noqa: PLC0415
+
+    try:
+        schema = json.loads(Path(schema_path).read_text(encoding="utf-8"))
+        validator_class = jsonschema.validators.validator_for(schema)
+        validator_class.check_schema(schema)
+    except (OSError, ValueError, jsonschema.SchemaError) as exc:
+        message = getattr(exc, "message", None) or str(exc)
+        raise SchemaError(f"cannot load schema {schema_path}: {message}") from None
+    return validator_class(schema, format_checker=validator_class.FORMAT_CHECKER)
+
+
+def schema_paths(mode_args: ModeArgs) -> list[str]:
+    """Return all the schemas of the run."""
+    paths = [schema for _, schema in mode_args.schema_map]
+    if mode_args.schema is not None:
+        paths.append(mode_args.schema)
+    return list(dict.fromkeys(paths))
+
+
+def schema_for(path: Path, mode_args: ModeArgs) -> str | None:
+    """Return the schema of the file, None if it has none."""
+    for pattern, schema in mode_args.schema_map:
+        if PurePath(path).match(pattern):
+            return schema
+    return mode_args.schema
+
+
+def validate(document: Any, schema_path: str) -> str | None:
+    """Return the error message of the document if it doesn't match the schema."""
+    validator = load_validator(schema_path)
+    errors = list(validator.iter_errors(document))
+    if not errors:
+        return None
+
+    from jsonschema.exceptions import (  # pylint: disable=import-outside-toplevel  # noqa: PLC0415
+        best_match,
+    )
+
+    # The first error in the order of the document, or the most relevant of its causes
+    error = best_match(errors[:1])
+    pointer = json_pointer(error.absolute_path)
+    location = f"at {pointer}" if pointer else "at the root"
+    message = f"does not match {Path(schema_path).name} {location}: {error.message}"
+    if len(errors) > 1:
+        message += f" ({len(errors) - 1} more error{'s'[:len(errors) - 2]})"
+    return message
@@ -0,0 +1,138 @@
+"""
+Per-phase timings of a run.
+
+Every phase of processing a file (reading, parsing, dumping, diffing, writing...) is timed
+with the wall and CPU clocks. The timings are summarized with the slowest files, and can be
+exported as a Chrome trace (chrome://tracing, https://ui.perfetto.dev).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator
+
+MB = 1024 * 1024
+
+
+@dataclass
+class FileStats:
+    """Timings and byte counts of a file, or of the whole run for the global phases."""
+
+    bytes_read: int = 0
+    bytes_written: int = 0
+    wall: dict[str, float] = field(default_factory=dict)
+    cpu: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def total_wall(self) -> float:
+        """Wall time of all the phases."""
+        return sum(self.wall.values())
+
+    def add(self, other: FileStats) -> None:
+        """Add the counters of another instance."""
+        self.bytes_read += other.bytes_read
+        self.bytes_written += other.bytes_written
+        for phase, seconds in other.wall.items():
+            self.wall[phase] = self.wall.get(phase, 0.0) + seconds
+        for phase, seconds in other.cpu.items():
+            self.cpu[phase] = self.cpu.get(phase, 0.0) + seconds
+
+
+class Stats:
+    """Collect the timings of every file, and trace events if `trace` is set."""
+
+    def __init__(self, trace: bool = False) -> None:
+        self.trace = trace
+        self.files: dict[Path | None, FileStats] = {}
+        self.events: list[dict[str, Any]] = []
+
+    def get(self, src: Path | None) -> FileStats:
+        """Return the stats of a file, or of the run if `src` is None."""
+        stats = self.files.get(src)
+        if stats is None:
+            stats = self.files[src] = FileStats()
+        return stats
+
+    @contextmanager
+    def phase(self, src: Path | None, name: str) -> Iterator[None]:
+        """Time a phase of processing a file, or of the run if `src` is None."""
+        start_ns = time.perf_counter_ns()
+        start_cpu = time.process_time()
+        try:
+            yield
+        finally:
+            duration_ns = time.perf_counter_ns() - start_ns
+            stats = self.get(src)
+            stats.wall[name] = stats.wall.get(name, 0.0) + duration_ns / 1e9
+            stats.cpu[name] = stats.cpu.get(name, 0.0) + time.process_time() - start_cpu
+            if self.trace:
+                self.events.append(
+                    {
+                        "name": name,
+                        "cat": "run" if src is None else "file",
+                        "ph": "X",
+                        "ts": start_ns / 1e3,
+                        "dur": duration_ns / 1e3,
+                        "pid": os.getpid(),
+                        "tid": threading.get_ident(),
+                        "args": {} if src is None else {"file": str(src)},
+                    }
+                )
+
+    def count_bytes(self, src: Path, read: int = 0, written: int = 0) -> None:
+        """Count the bytes read from and written to a file."""
+        stats = self.get(src)
+        stats.bytes_read += read
+        stats.bytes_written += written
+
+    def merge(self, other: Stats) -> None:
+        """Add the timings and events of another instance (e.g. from a worker process)."""
+        for src, stats in other.files.items():
+            self.get(src).add(stats)
+        self.events.extend(other.events)
+
+    def summary(self, slowest: int) -> str:
+        """Render the time spent in every phase and the slowest files."""
+        totals = FileStats()
+        for src, stats in self.files.items():
+            if src is not None:
+                totals.add(stats)
+        run = self.files.get(None, FileStats())
+
+        lines = [f"{'phase':<10} {'wall':>10} {'cpu':>10}"]
+        for stats in (run, totals):
+            lines.extend(
+                f"{phase:<10} {seconds:>9.3f}s {stats.cpu[phase]:>9.3f}s"
+                for phase, seconds in stats.wall.items()
+            )
+
+        files = [(src, stats) for src, stats in self.files.items() if src is not None]
+        lines.append(
+            f"{len(files)} file{'s'[:len(files) ^ 1]}, {totals.bytes_read / MB:.1f} MB read, "
+            f"{totals.bytes_written / MB:.1f} MB written"
+        )
+
+        files.sort(key=lambda item: item[1].total_wall, reverse=True)
+        if files and slowest:
+            lines.append(f"slowest {min(slowest, len(files))}:")
+        for src, stats in files[:slowest]:
+            phases = ", ".join(
+                f"{phase} {seconds:.3f}s"
+                for phase, seconds in sorted(stats.wall.items(), key=lambda item: -item[1])
+            )
+            lines.append(
+                f"{stats.total_wall:>9.3f}s {src} ({stats.bytes_read / MB:.1f} MB: {phases})"
+            )
+
+        return "\n".join(lines)
+
+    def write_trace(self, path: Path) -> None:
+        """Write the events in the Chrome trace event format."""
+        trace = {"traceEvents": self.events, "displayTimeUnit": "ms"}
+        path.write_text(json.dumps(trace), encoding="utf-8")
@@ -0,0 +1,384 @@
+"""
+Streaming JSON formatter.
+
+Tokenizes the input incrementally and writes the reformatted output chunk by chunk,
+so memory usage stays flat regardless of the file size. The output is identical to
+`json.dumps(json.loads(data), **dump_args)`.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from json.decoder import JSONDecodeError, scanstring  # type: ignore[attr-defined]
+from json.encoder import encode_basestring, encode_basestring_ascii
+from typing import IO, Any, Callable
+
+CHUNK_SIZE = 1024 * 1024
+SUPPORTED_DUMP_ARGS = frozenset(("sort_keys", "indent", "ensure_ascii", "separators"))
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+# The closing quote of a string, or a control character, which can't be in one
+STRING_STOP_RE = re.compile(r'["\x00-\x1f]')
+NUMBER_RE = re.compile(r"(-?(?:0|[1-9]\d*))(\.\d+)?([eE][-+]?\d+)?")
+LITERALS = (
+    ("null", "null", None),
+    ("true", "true", True),
+    ("false", "false", False),
+    ("NaN", "NaN", float("nan")),
+    ("Infinity", "Infinity", float("inf")),
+    ("-Infinity", "-Infinity", float("-inf")),
+)
+NUMBER_LOOKAHEAD = 3
+MAX_LITERAL_LENGTH = max(len(literal) for literal, _, _ in LITERALS)
+
+
+class StreamFallback(Exception):
+    """The document can't be streamed with identical output, use the in-memory path."""
+
+
+def float_str(value: float) -> str:
+    """Render a float the same way `json.dumps` does."""
+    if value != value:  # pylint: disable=comparison-with-itself  # noqa: PLR0124
+        return "NaN"
+    if value == float("inf"):
+        return "Infinity"
+    if value == float("-inf"):
+        return "-Infinity"
+    return float.__repr__(value)
+
+
+class _Reader:  # pylint: disable=too-many-instance-attributes
+    """Incremental reader over a text stream, keeping only the unconsumed tail in memory."""
+
+    def __init__(self, stream: IO[str], chunk_size: int) -> None:
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._offset = 0
+        self._lineno = 1
+        self._line_start = 0
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self, size: int = 0) -> bool:
+        """Read at least `size` more characters. Return False at the end of the stream."""
+        if self.eof:
+            return False
+
+        chunk = self._stream.read(max(size, self._chunk_size))
+        if not chunk:
+            self.eof = True
+            return False
+
+        if self.pos:
+            consumed = self.buf[: self.pos]
+            newlines = consumed.count("\n")
+            if newlines:
+                self._lineno += newlines
+                self._line_start = self._offset + consumed.rindex("\n") + 1
+            self._offset += self.pos
+            self.buf = self.buf[self.pos :]
+            self.pos = 0
+
+        self.buf += chunk
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character without consuming it ("" at EOF)."""
+        while True:
+            self.pos = WHITESPACE.match(self.buf, self.pos).end()  # type: ignore[union-attr]
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return ""
+
+    def error(self, msg: str, pos: int | None = None) -> JSONDecodeError:
+        """Build a decode error pointing to the absolute position in the stream."""
+        pos = self.pos if pos is None else pos
+        newlines = self.buf.count("\n", 0, pos)
+        if newlines:
+            lineno = self._lineno + newlines
+            colno = pos - self.buf.rindex("\n", 0, pos)
+        else:
+            lineno = self._lineno
+            colno = self._offset + pos - self._line_start + 1
+
+        exc = JSONDecodeError(msg, "", 0)
+        exc.pos = self._offset + pos
+        exc.lineno = lineno
+        exc.colno = colno
+        exc.args = (f"{msg}: line {lineno} column {colno} (char {exc.pos})",)
+        return exc
+
+    def string(self) -> str:
+        """Consume a string token starting at the current position and return its value."""
+        end = self.pos + 1
+        while True:
+            match = STRING_STOP_RE.search(self.buf, end)
+            if match is None:
+                scanned = len(self.buf) - self.pos
+                if not self.fill(len(self.buf)):
+                    raise self.error("Unterminated string starting at")
+                end = self.pos + scanned
+                continue
+
+            end = match.start()
+            if self.buf[end] != '"':
+                # scanstring reports the control character like json.loads
+                break
+            backslash = end - 1
+            while self.buf[backslash] == "\\":
+                backslash -= 1
+            if (end - 1 - backslash) % 2 == 0:
+                break
+            end += 1
+
+        try:
+            value, self.pos = scanstring(self.buf, self.pos + 1)
+        except JSONDecodeError as exc:
+            raise self.error(exc.msg, exc.pos) from None
+
+        return value
+
+    def number(self) -> re.Match[str] | None:
+        """Match a number token at the current position, reading more input if needed."""
+        while True:
+            match = NUMBER_RE.match(self.buf, self.pos)
+            # A fraction or an exponent may continue the number in the next chunk
+            end = self.pos if match is None else match.end()
+            if end + NUMBER_LOOKAHEAD <= len(self.buf) or not self.fill():
+                return match
+
+    def literal(self) -> tuple[str, Any] | None:
+        """Consume one of the literal tokens (null, true, NaN...) if present."""
+        while len(self.buf) - self.pos < MAX_LITERAL_LENGTH and self.fill():
+            pass
+
+        for literal, text, value in LITERALS:
+            if self.buf.startswith(literal, self.pos):
+                self.pos += len(literal)
+                return text, value
+
+        return None
+
+
+class _Writer:
+    """Collect output parts and write them to the stream in large chunks."""
+
+    def __init__(self, stream: IO[str], chunk_size: int) -> None:
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._parts: list[str] = []
+        self._size = 0
+
+    def write(self, text: str) -> None:
+        """Buffer `text`, flushing if the buffer is full."""
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size >= self._chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write out the buffered parts."""
+        self._stream.write("".join(self._parts))
+        self._parts = []
+        self._size = 0
+
+
+class StreamFormatter:  # pylint: disable=too-many-instance-attributes,too-few-public-methods
+    """Reformat a JSON document from one text stream to another."""
+
+    def __init__(self, dump_args: dict[str, Any], chunk_size: int = CHUNK_SIZE) -> None:
+        if not SUPPORTED_DUMP_ARGS.issuperset(dump_args):
+            raise StreamFallback(", ".join(sorted(set(dump_args) - SUPPORTED_DUMP_ARGS)))
+
+        indent = dump_args.get("indent")
+        if indent is not None and not isinstance(indent, str):
+            indent = " " * indent
+
+        separators = dump_args.get("separators")
+        if separators is not None:
+            item_separator, key_separator = separators
+        elif indent is not None:
+            item_separator, key_separator = ",", ": "
+        else:
+            item_separator, key_separator = ", ", ": "
+
+        self.dump_args = dump_args
+        self.chunk_size = chunk_size
+        self.indent: str | None = indent
+        self.item_separator: str = item_separator
+        self.key_separator: str = key_separator
+        self.sort_keys = bool(dump_args.get("sort_keys"))
+        self.encode: Callable[[str], str] = (
+            encode_basestring_ascii if dump_args.get("ensure_ascii", True) else encode_basestring
+        )
+        self._reader: _Reader
+        self._writer: _Writer
+
+    def format(self, src: IO[str], dst: IO[str]) -> None:
+        """
+        Read a JSON document from `src` and write it reformatted to `dst`, followed by a newline.
+        Raises `JSONDecodeError` on invalid input and `StreamFallback` if the output
+        can't be produced without loading the whole document (duplicate keys).
+        """
+        self._reader = _Reader(src, self.chunk_size)
+        self._writer = _Writer(dst, self.chunk_size)
+
+        self._reader.fill()
+        if self._reader.buf.startswith("\ufeff"):
+            raise self._reader.error("Unexpected UTF-8 BOM (decode using utf-8-sig)", 0)
+
+        self._value(0)
+        if self._reader.peek():
+            raise self._reader.error("Extra data")
+
+        self._writer.write("\n")
+        self._writer.flush()
+
+    def _newline_indent(self, depth: int) -> str:
+        return "" if self.indent is None else "\n" + self.indent * depth
+
+    def _value(self, depth: int) -> None:
+        reader = self._reader
+        char = reader.peek()
+        if char == "{":
+            if self.sort_keys:
+                self._buffered(depth)
+            else:
+                self._object(depth)
+        elif char == "[":
+            self._array(depth)
+        elif char == '"':
+            self._writer.write(self.encode(reader.string()))
+        else:
+            self._writer.write(self._scalar()[0])
+
+    def _scalar(self) -> tuple[str, Any]:
+        reader = self._reader
+        match = reader.number()
+        if match is not None:
+            integer, frac, exp = match.groups()
+            reader.pos = match.end()
+            if frac or exp:
+                value: Any = float(integer + (frac or "") + (exp or ""))
+                return float_str(value), value
+            value = int(integer)
+            return int.__repr__(value), value
+
+        literal = reader.literal()
+        if literal is None:
+            raise reader.error("Expecting value")
+        return literal
+
+    def _object(self, depth: int) -> None:
+        reader = self._reader
+        write = self._writer.write
+        reader.pos += 1
+        if reader.peek() == "}":
+            reader.pos += 1
+            write("{}")
+            return
+
+        newline_indent = self._newline_indent(depth + 1)
+        separator = "{" + newline_indent
+        keys = set()
+        while True:
+            if reader.peek() != '"':
+                raise reader.error("Expecting property name enclosed in double quotes")
+            key = reader.string()
+            if key in keys:
+                raise StreamFallback(f"duplicate key {key!r}")
+            keys.add(key)
+
+            if reader.peek() != ":":
+                raise reader.error("Expecting ':' delimiter")
+            reader.pos += 1
+
+            write(separator + self.encode(key) + self.key_separator)
+            self._value(depth + 1)
+            separator = self.item_separator + newline_indent
+
+            char = reader.peek()
+            reader.pos += 1
+            if char == "}":
+                break
+            if char != ",":
+                raise reader.error("Expecting ',' delimiter", reader.pos - 1)
+
+        write(self._newline_indent(depth) + "}")
+
+    def _array(self, depth: int) -> None:
+        reader = self._reader
+        write = self._writer.write
+        reader.pos += 1
+        if reader.peek() == "]":
+            reader.pos += 1
+            write("[]")
+            return
+
+        newline_indent = self._newline_indent(depth + 1)
+        write("[" + newline_indent)
+        separator = self.item_separator + newline_indent
+        while True:
+            self._value(depth + 1)
+            char = reader.peek()
+            reader.pos += 1
+            if char == "]":
+                break
+            if char != ",":
+                raise reader.error("Expecting ',' delimiter", reader.pos - 1)
+            write(separator)
+
+        write(self._newline_indent(depth) + "]")
+
+    def _buffered(self, depth: int) -> None:
+        """Load a whole value into memory and dump it with `json.dumps` at the given depth."""
+        text = json.dumps(self._load(), **self.dump_args)
+        if self.indent is not None and depth:
+            # Strings never contain raw newlines, so every newline is a line break
+            text = text.replace("\n", "\n" + self.indent * depth)
+        self._writer.write(text)
+
+    def _load(self) -> Any:
+        """Load the next value the same way `json.loads` does."""
+        reader = self._reader
+        char = reader.peek()
+        if char == '"':
+            return reader.string()
+        if char == "" or char not in "{[":
+            return self._scalar()[1]
+
+        reader.pos += 1
+        closing = "}" if char == "{" else "]"
+        if reader.peek() == closing:
+            reader.pos += 1
+            return {} if char == "{" else []
+
+        if char == "[":
+            items = []
+            while True:
+                items.append(self._load())
+                char = reader.peek()
+                reader.pos += 1
+                if char == "]":
+                    return items
+                if char != ",":
+                    raise reader.error("Expecting ',' delimiter", reader.pos - 1)
+
+        pairs = {}
+        while True:
+            if reader.peek() != '"':
+                raise reader.error("Expecting property name enclosed in double quotes")
+            key = reader.string()
+            if reader.peek() != ":":
+                raise reader.error("Expecting ':' delimiter")
+            reader.pos += 1
+            pairs[key] = self._load()
+            char = reader.peek()
+            reader.pos += 1
+            if char == "}":
+                return pairs
+            if char != ",":
+                raise reader.error("Expecting ',' delimiter", reader.pos - 1)
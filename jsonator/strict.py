@@ -0,0 +1,124 @@
+"""
+Strict parsing: documents which formatting would silently change are rejected.
+
+`json.loads` keeps the last value of a duplicate key and rounds numbers to the nearest
+float, so `{"a": 1, "a": 2}` would be written `{"a": 2}` and `0.10000000000000000001`
+would be written `0.1`. The strict parse checks every object with `object_pairs_hook`
+and every number with a fraction or an exponent with `parse_float`. The C scanner still
+does the tokenizing, and most floats are checked with a single string comparison.
+Integers are exact in Python and need no check.
+
+The position of the offending key or number is looked for only once one is found.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from json.decoder import JSONObject  # type: ignore[attr-defined]
+from json.scanner import py_make_scanner  # type: ignore[attr-defined]
+from typing import Any, Callable
+
+# Strings are matched whole, so that numbers inside them are skipped
+TOKEN_RE = re.compile(r'"(?:[^"\\]|\\.)*"|-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?', re.DOTALL)
+
+
+class LossyDocumentError(json.JSONDecodeError):
+    """The document has a duplicate key or a number which can't be represented exactly."""
+
+
+class DuplicateKey(Exception):
+    """Raised by the object hook, located before being reported."""
+
+    def __init__(self, key: str, pos: int | None = None) -> None:
+        super().__init__(key)
+        self.key = key
+        self.pos = pos
+
+
+class LossyNumber(Exception):
+    """Raised by the float hook, located before being reported."""
+
+    def __init__(self, literal: str) -> None:
+        super().__init__(literal)
+        self.literal = literal
+
+
+def check_pairs(pairs: list[tuple[str, Any]]) -> dict[str, Any]:
+    """Build the object, raise `DuplicateKey` if a key is repeated."""
+    document = dict(pairs)
+    if len(document) != len(pairs):
+        seen = set()
+        for key, _ in pairs:
+            if key in seen:
+                raise DuplicateKey(key)
+            seen.add(key)
+    return document
+
+
+def is_exact(literal: str, value: float) -> bool:
+    """Return whether `value`, written back as its repr, is the number of `literal`."""
+    # Imported here: only numbers not written in their shortest form get there
+    from decimal import Decimal  # pylint: disable=import-outside-toplevel  # noqa: PLC0415
+
+    # Infinity and NaN compare unequal to any number written in the document
+    return Decimal(literal) == Decimal(repr(value))
+
+
+def check_float(literal: str) -> float:
+    """Parse a number, raise `LossyNumber` if the float doesn't represent it exactly."""
+    value = float(literal)
+    if repr(value) != literal and not is_exact(literal, value):
+        raise LossyNumber(literal)
+    return value
+
+
+def find_number(text: str, literal: str) -> int:
+    """Return the position of the first number `literal` in `text` outside of strings."""
+    for match in TOKEN_RE.finditer(text):
+        if match.group() == literal:
+            return match.start()
+    return 0
+
+
+def find_duplicate(text: str) -> int:
+    """
+    Parse `text` again with the pure Python scanner, which tells where each object starts,
+    and return the position of the object with the first duplicate key.
+    """
+
+    def parse_object(s_and_end: tuple[str, int], *args: Any) -> tuple[dict[str, Any], int]:
+        try:
+            return JSONObject(s_and_end, *args)
+        except DuplicateKey as exc:
+            # Set by the innermost object only
+            if exc.pos is None:
+                exc.pos = s_and_end[1] - 1
+            raise
+
+    decoder = json.JSONDecoder(object_pairs_hook=check_pairs)
+    decoder.parse_object = parse_object  # type: ignore[attr-defined]
+    scan_once: Callable[[str, int], tuple[Any, int]] = py_make_scanner(decoder)
+    try:
+        scan_once(text, len(text) - len(text.lstrip(" \t\n\r")))
+    except DuplicateKey as exc:
+        return exc.pos or 0
+    except RecursionError:
+        # Nested deeper than the pure Python scanner goes
+        pass
+    return 0
+
+
+def strict_loads(text: str) -> Any:
+    """
+    Parse `text` with the standard library. Raises `LossyDocumentError`, a
+    `JSONDecodeError`, with the position of the first duplicate key or lossy number.
+    """
+    try:
+        return json.loads(text, object_pairs_hook=check_pairs, parse_float=check_float)
+    except DuplicateKey as exc:
+        message = f"Duplicate key {exc.key!r}"
+        raise LossyDocumentError(message, text, find_duplicate(text)) from None
+    except LossyNumber as exc:
+        message = f"Number {exc.literal} can't be represented exactly"
+        raise LossyDocumentError(message, text, find_number(text, exc.literal)) from None
@@ -0,0 +1,165 @@
+"""
+Structural diff: compare parsed documents by JSON path.
+
+Subtrees are compared with `==`, computed in C, then for the order of their keys and the
+types of their values, which `==` ignores. Only the children which are objects or arrays
+are walked in Python, and the result is kept for every pair of subtrees compared, so a
+subtree is checked once however deep it is. Array items are aligned on the digests of
+their content. Only the changed values and the objects whose keys were reordered are
+reported: reindenting a document gives an empty diff.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from hashlib import blake2b
+from typing import Any, Dict, Iterator, Tuple
+
+from jsonator.diff import DEFAULT_TIMEOUT, opcodes
+
+DIGEST_SIZE = 16
+IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_]*\Z")
+CONTAINERS = frozenset((dict, list))
+
+# Whether the subtrees are the same, by the id() of both
+Checked = Dict[Tuple[int, int], bool]
+
+
+def content_digest(node: Any) -> str:
+    """Return the digest of a subtree, regardless of the order of the keys."""
+    text = json.dumps(node, sort_keys=True, separators=(",", ":"))
+    return blake2b(text.encode("ascii"), digest_size=DIGEST_SIZE).hexdigest()
+
+
+def same_value(a_node: Any, b_node: Any, checked: Checked) -> bool:
+    """
+    Return whether two subtrees are equal, including the order of the keys. The subtrees
+    already compared are looked up in `checked`.
+    """
+    if type(a_node) is not type(b_node):
+        # 1, 1.0 and true are different values
+        return False
+    if not isinstance(a_node, (dict, list)):
+        return bool(a_node == b_node) or repr(a_node) == repr(b_node)
+
+    same = checked.get((id(a_node), id(b_node)))
+    if same is None:
+        same = bool(a_node == b_node) and _same_layout(a_node, b_node, checked)
+    return same
+
+
+def _same_layout(a_node: Any, b_node: Any, checked: Checked) -> bool:
+    # The subtrees are equal: compare the order of the keys and the types of the values
+    key = id(a_node), id(b_node)
+    same = checked.get(key)
+    if same is not None:
+        return same
+
+    if isinstance(a_node, dict):
+        a_values, b_values = list(a_node.values()), list(b_node.values())
+        same = list(a_node) == list(b_node)
+    else:
+        a_values, b_values = a_node, b_node
+        same = True
+    if same:
+        a_types = list(map(type, a_values))
+        same = a_types == list(map(type, b_values)) and (
+            CONTAINERS.isdisjoint(a_types)
+            or all(
+                _same_layout(a_value, b_value, checked)
+                for a_value, b_value in zip(a_values, b_values)
+                if type(a_value) in CONTAINERS
+            )
+        )
+    checked[key] = same
+    return same
+
+
+def key_path(path: str, key: str) -> str:
+    """Return the path of the member `key` of the object at `path`."""
+    if IDENTIFIER.match(key):
+        return f"{path}.{key}"
+    return f"{path}[{json.dumps(key, ensure_ascii=False)}]"
+
+
+def _value(node: Any) -> str:
+    return json.dumps(node, ensure_ascii=False)
+
+
+def compare(
+    a_node: Any, b_node: Any, path: str = "$", checked: Checked | None = None
+) -> Iterator[str]:
+    """Yield the differences between two documents, one line each."""
+    if checked is None:
+        checked = {}
+    if same_value(a_node, b_node, checked):
+        return
+
+    if isinstance(a_node, dict) and isinstance(b_node, dict):
+        yield from _compare_objects(a_node, b_node, path, checked)
+    elif isinstance(a_node, list) and isinstance(b_node, list):
+        yield from _compare_arrays(a_node, b_node, path, checked)
+    else:
+        yield f"- {path}: {_value(a_node)}"
+        yield f"+ {path}: {_value(b_node)}"
+
+
+def _compare_objects(
+    a_node: dict[str, Any], b_node: dict[str, Any], path: str, checked: Checked
+) -> Iterator[str]:
+    if [key for key in a_node if key in b_node] != [key for key in b_node if key in a_node]:
+        yield f"~ {path}: key order changed"
+    for key, value in a_node.items():
+        if key not in b_node:
+            yield f"- {key_path(path, key)}: {_value(value)}"
+        else:
+            yield from compare(value, b_node[key], key_path(path, key), checked)
+    for key, value in b_node.items():
+        if key not in a_node:
+            yield f"+ {key_path(path, key)}: {_value(value)}"
+
+
+def _compare_arrays(
+    a_node: list[Any], b_node: list[Any], path: str, checked: Checked
+) -> Iterator[str]:
+    if len(a_node) == len(b_node):
+        # Compare the items in place
+        for index, a_item in enumerate(a_node):
+            yield from compare(a_item, b_node[index], f"{path}[{index}]", checked)
+        return
+
+    # Align the items on their content, then compare the changed ones in place
+    codes = opcodes(
+        [content_digest(item) for item in a_node],
+        [content_digest(item) for item in b_node],
+        DEFAULT_TIMEOUT,
+    )
+    for _, i1, i2, j1, j2 in codes:
+        paired = min(i2 - i1, j2 - j1)
+        for offset in range(paired):
+            yield from compare(
+                a_node[i1 + offset], b_node[j1 + offset], f"{path}[{i1 + offset}]", checked
+            )
+        for i in range(i1 + paired, i2):
+            yield f"- {path}[{i}]: {_value(a_node[i])}"
+        for j in range(j1 + paired, j2):
+            yield f"+ {path}[{j}]: {_value(b_node[j])}"
+
+
+def iter_structural_diff(
+    a_document: Any, b_document: Any, a_name: str, b_name: str
+) -> Iterator[str]:
+    """Yield the lines of the differences between the documents by JSON path, if any."""
+    started = False
+    for line in compare(a_document, b_document):
+        if not started:
+            started = True
+            yield f"--- {a_name}\n"
+            yield f"+++ {b_name}\n"
+        yield f"{line}\n"
+
+
+def structural_diff(a_document: Any, b_document: Any, a_name: str, b_name: str) -> str:
+    """Return the differences between the documents by JSON path, empty if there is none."""
+    return "".join(iter_structural_diff(a_document, b_document, a_name, b_name))
@@ -0,0 +1,220 @@
+"""
+Check whether a document is already well formatted without re-serializing it.
+
+With indentation `json.dumps` runs the pure Python encoder and builds the whole output,
+only for it to be compared with the input and thrown away in most `--check` runs.
+Instead, the parsed document is walked alongside the input text, which is compared with
+the canonical layout piece by piece, stopping at the first deviation. Containers without
+nested containers are encoded at once with the C encoder.
+"""
+
+from __future__ import annotations
+
+from json.encoder import (  # type: ignore[attr-defined]
+    c_make_encoder,
+    encode_basestring,
+    encode_basestring_ascii,
+)
+from typing import Any, Callable
+
+from jsonator.stream import float_str
+
+CONTAINERS = frozenset((dict, list))
+
+
+class _Mismatch(Exception):
+    """The input text deviates from the canonical layout."""
+
+
+def _null(_: None) -> str:
+    return "null"
+
+
+def _bool(value: bool) -> str:
+    return "true" if value else "false"
+
+
+class _Verifier:
+    """Walk a parsed document and compare the input text with its canonical layout."""
+
+    def __init__(self, text: str, indent: str, sort_keys: bool, ensure_ascii: bool) -> None:
+        self.text = text
+        self.indent = indent
+        self.sort_keys = sort_keys
+        self.encode_string = encode_basestring_ascii if ensure_ascii else encode_basestring
+        self.scalars: dict[type, Callable[[Any], str]] = {
+            type(None): _null,
+            bool: _bool,
+            int: int.__repr__,
+            float: float_str,
+            str: self.encode_string,
+        }
+        self._newlines: dict[int, str] = {}
+        self._encoders: dict[int, Callable[[Any, int], Any]] = {}
+
+    def newline(self, depth: int) -> str:
+        """Return the line break followed by the indentation for `depth`."""
+        newline = self._newlines.get(depth)
+        if newline is None:
+            newline = self._newlines[depth] = "\n" + self.indent * depth
+        return newline
+
+    def encoder(self, depth: int) -> Callable[[Any, int], Any]:
+        """Return a C encoder that lays out the items of a container at `depth` - 1."""
+        encoder = self._encoders.get(depth)
+        if encoder is None:
+            encoder = self._encoders[depth] = c_make_encoder(
+                None,
+                None,
+                self.encode_string,
+                None,
+                ": ",
+                "," + self.newline(depth),
+                self.sort_keys,
+                False,
+                True,
+            )
+        return encoder
+
+    def check(self, value: Any, pos: int, depth: int) -> int:
+        """Compare `value` with the text at `pos`. Return the position after it."""
+        text = self.text
+        value_type = type(value)
+        if value_type is dict:
+            values = value.values()
+        elif value_type is list:
+            values = value
+        else:
+            chunk = self.scalars[value_type](value)
+            if not text.startswith(chunk, pos):
+                raise _Mismatch
+            return pos + len(chunk)
+
+        if not value:
+            chunk = "{}" if value_type is dict else "[]"
+            if not text.startswith(chunk, pos):
+                raise _Mismatch
+            return pos + 2
+
+        inner = self.newline(depth + 1)
+        if CONTAINERS.isdisjoint(map(type, values)):
+            return self._check_leaf(value, pos, depth, inner)
+
+        if value_type is dict:
+            pos = self._check_dict(value, pos, depth, inner)
+            closing = self.newline(depth) + "}"
+        else:
+            pos = self._check_list(value, pos, depth, inner)
+            closing = self.newline(depth) + "]"
+
+        if not text.startswith(closing, pos):
+            raise _Mismatch
+        return pos + len(closing)
+
+    def _check_dict(self, value: dict[str, Any], pos: int, depth: int, inner: str) -> int:
+        """Compare the opening bracket and the members of a dict."""
+        text = self.text
+        if text[pos] != "{" or not text.startswith(inner, pos + 1):
+            raise _Mismatch
+        pos += 1 + len(inner)
+
+        separator = "," + inner
+        scalars = self.scalars
+        encode_string = self.encode_string
+        first = True
+        for key, item in sorted(value.items()) if self.sort_keys else value.items():
+            if first:
+                first = False
+            elif text.startswith(separator, pos):
+                pos += len(separator)
+            else:
+                raise _Mismatch
+
+            item_type = type(item)
+            if item_type is dict or item_type is list:
+                chunk = encode_string(key) + ": "
+                if not text.startswith(chunk, pos):
+                    raise _Mismatch
+                pos = self.check(item, pos + len(chunk), depth + 1)
+            else:
+                chunk = encode_string(key) + ": " + scalars[item_type](item)
+                if not text.startswith(chunk, pos):
+                    raise _Mismatch
+                pos += len(chunk)
+
+        return pos
+
+    def _check_list(self, value: list[Any], pos: int, depth: int, inner: str) -> int:
+        """Compare the opening bracket and the items of a list."""
+        text = self.text
+        if text[pos] != "[" or not text.startswith(inner, pos + 1):
+            raise _Mismatch
+        pos += 1 + len(inner)
+
+        separator = "," + inner
+        scalars = self.scalars
+        first = True
+        for item in value:
+            if first:
+                first = False
+            elif text.startswith(separator, pos):
+                pos += len(separator)
+            else:
+                raise _Mismatch
+
+            item_type = type(item)
+            if item_type is dict or item_type is list:
+                pos = self.check(item, pos, depth + 1)
+            else:
+                chunk = scalars[item_type](item)
+                if not text.startswith(chunk, pos):
+                    raise _Mismatch
+                pos += len(chunk)
+
+        return pos
+
+    def _check_leaf(self, value: Any, pos: int, depth: int, inner: str) -> int:
+        """Compare a container without nested containers, encoding its items at once."""
+        text = self.text
+        chunk = "".join(self.encoder(depth + 1)(value, 0))
+        end = len(chunk) - 1
+        if text[pos] != chunk[0] or not text.startswith(inner, pos + 1):
+            raise _Mismatch
+        pos += 1 + len(inner)
+
+        if not text.startswith(chunk[1:end], pos):
+            raise _Mismatch
+        pos += end - 1
+
+        closing = self.newline(depth) + chunk[end]
+        if not text.startswith(closing, pos):
+            raise _Mismatch
+        return pos + len(closing)
+
+
+def is_formatted(text: str, document: Any, dump_args: dict[str, Any]) -> bool | None:
+    """
+    Return whether `text` is equal to `json.dumps(document, **dump_args) + "\\n"`,
+    where `document` is `json.loads(text)`, without building the output.
+    Return None if the options are not supported and the output has to be compared.
+    """
+    indent = dump_args.get("indent")
+    # Without indentation json.dumps runs the C encoder: the caller builds the output once
+    # rather than here and again for the result
+    if indent is None or c_make_encoder is None or dump_args.get("separators") is not None:
+        return None
+
+    if not isinstance(indent, str):
+        indent = " " * indent
+
+    verifier = _Verifier(
+        text, indent, bool(dump_args.get("sort_keys")), dump_args.get("ensure_ascii", True)
+    )
+    try:
+        end = verifier.check(document, 0, 0)
+    except (_Mismatch, IndexError):
+        return False
+    except RecursionError:
+        return None
+
+    return end == len(text) - 1 and text[end] == "\n"
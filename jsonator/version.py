@@ -0,0 +1,3 @@
+"""The version of jsonator, the one of pyproject.toml."""
+
+__version__ = "0.1.11"
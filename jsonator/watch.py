@@ -0,0 +1,214 @@
+"""
+Watch mode.
+
+After the first run, files are formatted again when they change. Changes are reported
+by inotify on Linux and found by polling elsewhere. Bursts of writes are debounced into
+a single batch, and the files written by jsonator itself are not formatted again.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+from pathlib import Path
+from typing import Callable, Iterable, Tuple
+
+from jsonator.discovery import PatternSet
+
+# Events of inotify(7)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+EVENT = struct.Struct("iIII")
+READ_SIZE = 64 * 1024
+
+POLL_INTERVAL = 1.0
+# Format a batch even if the writes never stop
+MAX_DELAY = 5.0
+
+Signature = Tuple[int, int, int]
+
+
+def signature(path: Path) -> Signature | None:
+    """Return what identifies a version of the file, or None if it doesn't exist."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+class PollingWatcher:
+    """Find the changed files by comparing their signatures between scans."""
+
+    def __init__(self, collect: Callable[[], Iterable[Path]], interval: float = POLL_INTERVAL):
+        self.collect = collect
+        self.interval = interval
+        self.snapshot = self.scan()
+
+    def scan(self) -> dict[Path, Signature | None]:
+        """Return the signatures of all the files."""
+        return {path: signature(path) for path in self.collect()}
+
+    def wait(self, timeout: float | None) -> set[Path]:
+        """Return the files changed since the last call, waiting up to `timeout` seconds."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            delay = self.interval if deadline is None else deadline - time.monotonic()
+            time.sleep(max(0.0, min(self.interval, delay)))
+            snapshot = self.scan()
+            changed = {
+                path for path, sig in snapshot.items() if sig != self.snapshot.get(path, False)
+            }
+            self.snapshot = snapshot
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def close(self) -> None:
+        """Release the resources."""
+
+
+class InotifyWatcher:
+    """Receive the changes of a directory tree from inotify."""
+
+    def __init__(
+        self, root: Path, collect: Callable[[], Iterable[Path]], excludes: PatternSet
+    ) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self.fd = libc.inotify_init1(os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.root = root
+        self.collect = collect
+        self.excludes = excludes
+        self.watches: dict[int, Path] = {}
+        self.add_tree(root)
+
+    def relative(self, path: Path) -> str:
+        """Return the path relative to the watched directory, with slashes."""
+        return path.relative_to(self.root).as_posix()
+
+    def add_tree(self, directory: Path) -> list[Path]:
+        """Watch a directory and its subdirectories. Return the files already in them."""
+        files: list[Path] = []
+        if directory != self.root and self.excludes.match(self.relative(directory), True):
+            return files
+
+        for parent, dirs, names in os.walk(directory):
+            rel_dir = "" if parent == str(self.root) else self.relative(Path(parent)) + "/"
+            dirs[:] = [name for name in dirs if not self.excludes.match(rel_dir + name, True)]
+            wd = self._add_watch(self.fd, os.fsencode(parent), WATCH_MASK)
+            if wd >= 0:
+                self.watches[wd] = Path(parent)
+            files.extend(Path(parent, name) for name in names)
+        return files
+
+    def wait(self, timeout: float | None) -> set[Path]:
+        """Return the paths changed since the last call, waiting up to `timeout` seconds."""
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return set()
+
+        changed: set[Path] = set()
+        data = os.read(self.fd, READ_SIZE)
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT.unpack_from(data, offset)
+            offset += EVENT.size
+            name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped, every file may have changed
+                changed.update(self.collect())
+            elif wd in self.watches:
+                path = self.watches[wd] / name
+                if not mask & IN_ISDIR:
+                    changed.add(path)
+                elif mask & (IN_CREATE | IN_MOVED_TO):
+                    changed.update(self.add_tree(path))
+        return changed
+
+    def close(self) -> None:
+        """Release the resources."""
+        os.close(self.fd)
+
+
+def make_watcher(
+    root: Path, collect: Callable[[], Iterable[Path]], excludes: PatternSet
+) -> InotifyWatcher | PollingWatcher:
+    """Return an inotify watcher if available, or a polling one."""
+    if root.is_dir():
+        try:
+            return InotifyWatcher(root, collect, excludes)
+        except (OSError, AttributeError, TypeError):
+            # Not Linux: no libc, or no inotify functions in it
+            pass
+    return PollingWatcher(collect)
+
+
+class Watch:
+    """Format the files as they change."""
+
+    def __init__(
+        self,
+        collect: Callable[[], Iterable[Path]],
+        format_files: Callable[[list[Path]], list[Path]],
+        debounce: float,
+    ) -> None:
+        self.collect = collect
+        self.format_files = format_files
+        self.debounce = debounce
+        self.known = set(collect())
+        self.ignored: set[Path] = set()
+        self.written: dict[Path, Signature | None] = {}
+
+    def record(self, written: Iterable[Path]) -> None:
+        """Remember the files written by jsonator, so their change events are ignored."""
+        for path in written:
+            self.written[path] = signature(path)
+
+    def select(self, changed: Iterable[Path]) -> list[Path]:
+        """Return the changed files to format."""
+        candidates = []
+        for path in changed:
+            sig = signature(path)
+            # Temporary files are gone, and files written by jsonator didn't change since
+            if sig is None or self.written.get(path) == sig:
+                continue
+            candidates.append(path)
+
+        unknown = {path for path in candidates if path not in self.known} - self.ignored
+        if unknown:
+            # New files: check them against the include, exclude and .gitignore rules
+            self.known = set(self.collect())
+            self.ignored |= unknown - self.known
+        return sorted(path for path in candidates if path in self.known)
+
+    def wait(self, watcher: InotifyWatcher | PollingWatcher) -> set[Path]:
+        """Wait for a change, then until no more happen for `debounce` seconds."""
+        changed = watcher.wait(None)
+        deadline = time.monotonic() + MAX_DELAY
+        while time.monotonic() < deadline:
+            more = watcher.wait(self.debounce)
+            if not more:
+                break
+            changed |= more
+        return changed
+
+    def run(self, watcher: InotifyWatcher | PollingWatcher) -> None:
+        """Format the batches of changed files until interrupted."""
+        try:
+            while True:
+                files = self.select(self.wait(watcher))
+                if files:
+                    self.record(self.format_files(files))
+        finally:
+            watcher.close()
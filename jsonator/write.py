@@ -0,0 +1,112 @@
+"""
+Write files atomically.
+
+The new content is written to a temporary file in the same directory, which gets the
+mode and the owner of the original file and replaces it with a rename. Readers see
+either the old or the new content, never a truncated file, even if the process is killed.
+"""
+
+from __future__ import annotations
+
+import os
+import stat
+import tempfile
+from pathlib import Path
+from typing import Iterable
+
+# Never call fsync, leave flushing to the operating system
+FSYNC_NEVER = "never"
+# Flush every file and its directory entry before moving on to the next one
+FSYNC_PER_FILE = "per-file"
+# Flush all the written files and their directories together, once they are written
+FSYNC_BATCHED = "batched"
+FSYNC_POLICIES = (FSYNC_NEVER, FSYNC_PER_FILE, FSYNC_BATCHED)
+CHUNK_SIZE = 1024 * 1024
+
+
+def resolve_link(path: Path) -> Path:
+    """Return the target of a symlink, so the link itself isn't replaced by a file."""
+    return Path(os.path.realpath(path)) if path.is_symlink() else path
+
+
+def copy_metadata(src: Path, dst: Path) -> None:
+    """Copy the permission bits and, if allowed, the owner and group of `src` to `dst`."""
+    src_stat = os.stat(src)
+    if hasattr(os, "chown"):
+        dst_stat = os.stat(dst)
+        if (src_stat.st_uid, src_stat.st_gid) != (dst_stat.st_uid, dst_stat.st_gid):
+            try:
+                os.chown(dst, src_stat.st_uid, src_stat.st_gid)
+            except PermissionError:
+                # Only root can give a file away, but the group may still be kept
+                try:
+                    os.chown(dst, -1, src_stat.st_gid)
+                except PermissionError:
+                    pass
+    os.chmod(dst, stat.S_IMODE(src_stat.st_mode))
+
+
+def sync_file(path: Path) -> None:
+    """Flush the content of a file to the disk."""
+    # Windows can only flush files opened for writing
+    fd = os.open(path, os.O_RDWR if os.name == "nt" else os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def sync_directory(path: Path) -> None:
+    """Flush the entries of a directory, so renames in it survive a crash."""
+    if not hasattr(os, "O_DIRECTORY"):
+        # Not supported on Windows, where renames are journaled with the file
+        return
+    fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def sync_files(paths: Iterable[Path]) -> None:
+    """Flush the given files, then their directories."""
+    directories: dict[Path, None] = {}
+    for path in paths:
+        target = resolve_link(path)
+        sync_file(target)
+        directories[target.parent] = None
+    for directory in directories:
+        sync_directory(directory)
+
+
+def replace(tmp_file: Path, path: Path, fsync: str = FSYNC_NEVER) -> None:
+    """Replace `path` with `tmp_file`, which must be in the same directory."""
+    target = resolve_link(path)
+    copy_metadata(target, tmp_file)
+    if fsync == FSYNC_PER_FILE:
+        sync_file(tmp_file)
+    os.replace(tmp_file, target)
+    if fsync == FSYNC_PER_FILE:
+        sync_directory(target.parent)
+
+
+def write_atomic(path: Path, text: str, fsync: str = FSYNC_NEVER) -> int:
+    """
+    Replace the content of an existing file with `text`, encoded as UTF-8 with the line
+    endings of the platform like `Path.write_text`. Return the number of bytes written.
+    """
+    target = resolve_link(path)
+    fd, tmp_name = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp")
+    tmp_file = Path(tmp_name)
+    try:
+        with open(fd, "w", encoding="utf-8") as tmp:
+            # Encode slices, not a full-size copy of the text
+            for start in range(0, len(text), CHUNK_SIZE):
+                tmp.write(text[start : start + CHUNK_SIZE])
+            tmp.flush()
+            size = os.fstat(tmp.fileno()).st_size
+        replace(tmp_file, target, fsync)
+    finally:
+        if tmp_file.exists():
+            tmp_file.unlink()
+    return size
@@ -110,3 +110,13 @@ def invalid_json_in_dir(tmp_path: Path) -> Path:
     file_path = test_dir / "test_invalid.json"
     file_path.write_text('{"', encoding=FILES_ENCODING)
     return file_path
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(
+    tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch
+) -> Path:
+    """Keep the cache of well formatted files out of the user cache directory"""
+    cache_dir = tmp_path_factory.mktemp("cache")
+    monkeypatch.setenv("JSONATOR_CACHE_DIR", str(cache_dir))
+    return cache_dir
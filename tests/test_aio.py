@@ -0,0 +1,77 @@
+"""
+Tests for the asyncio formatter
+"""
+
+import asyncio
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from jsonator.aio import format_many_async, format_paths
+from jsonator.models import ModeArgs
+from jsonator.report import Report
+from jsonator.stats import Stats
+
+DUMP_ARGS = {"sort_keys": False, "indent": 4, "ensure_ascii": True}
+FORMATTED = '{\n    "key": "value"\n}\n'
+
+
+@pytest.fixture(name="files")
+def fixture_files(tmp_path: Path) -> List[Path]:
+    """Create well formatted, badly formatted, invalid and missing files."""
+    files = [tmp_path / name for name in ("ok.json", "bad.json", "invalid.json", "missing.json")]
+    files[0].write_text(FORMATTED, encoding="utf-8")
+    files[1].write_text('{"key": "value"}', encoding="utf-8")
+    files[2].write_text("{", encoding="utf-8")
+    return files
+
+
+def test_format_paths(files: List[Path]) -> None:
+    """Test that the files are formatted and the results reported."""
+    report = Report(False, False, Stats())
+    asyncio.run(
+        format_paths(files, report, ModeArgs(False, False, False), DUMP_ARGS, io_concurrency=2)
+    )
+
+    assert (report.same_count, report.change_count, report.failure_count) == (1, 1, 2)
+    assert report.written == [files[1]]
+    assert files[1].read_text(encoding="utf-8") == FORMATTED
+    assert report.stats is not None
+    assert set(report.stats.get(files[1]).wall) == {"read", "format", "write"}
+
+
+def test_format_paths_check(files: List[Path]) -> None:
+    """Test that nothing is written in check mode."""
+    report = Report(True, False)
+    asyncio.run(
+        format_paths(files[:2], report, ModeArgs(True, False, False), DUMP_ARGS, io_concurrency=4)
+    )
+
+    assert (report.same_count, report.change_count) == (1, 1)
+    assert files[1].read_text(encoding="utf-8") == '{"key": "value"}'
+
+
+def test_format_paths_diff(files: List[Path], capsys: pytest.CaptureFixture[str]) -> None:
+    """Test that the diff is written to stdout."""
+    report = Report(True, True)
+    asyncio.run(
+        format_paths(files[:2], report, ModeArgs(True, True, False), DUMP_ARGS, io_concurrency=1)
+    )
+
+    assert "+++ formatted file" in capsys.readouterr().out
+    assert report.change_count == 1
+
+
+def test_format_many_async(tmp_path: Path) -> None:
+    """Test that many files are formatted with worker processes."""
+    files = [tmp_path / f"{i}.json" for i in range(20)]
+    for i, path in enumerate(files):
+        path.write_text(f'{{"key": {i}}}', encoding="utf-8")
+    report = Report(False, False)
+    format_many_async(
+        files, report, ModeArgs(False, False, False), DUMP_ARGS, jobs=2, io_concurrency=4
+    )
+
+    assert report.change_count == 20
+    assert files[7].read_text(encoding="utf-8") == '{\n    "key": 7\n}\n'
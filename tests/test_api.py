@@ -0,0 +1,90 @@
+"""
+Tests for the in-memory formatting API
+"""
+
+import json
+from typing import Any, Dict
+
+import pytest
+
+from jsonator import Formatter, check_str
+from jsonator import document as document_module
+from jsonator import format_bytes, format_str
+from jsonator.api import get_formatter
+
+
+def test_format_str() -> None:
+    """Test that documents are formatted with the options."""
+    assert format_str('{"b": 1, "a": [1]}') == '{\n    "b": 1,\n    "a": [\n        1\n    ]\n}\n'
+    assert format_str('{"b": 1, "a": 2}', indent=2, sort_keys=True) == '{\n  "a": 2,\n  "b": 1\n}\n'
+    assert format_str('{"a": [1, 2]}', indent=None) == '{"a": [1, 2]}\n'
+    assert format_str('{"a": [1, 2]}', compact=True) == '{"a":[1,2]}\n'
+    assert format_str('["\\u00e9"]', indent="\t", ensure_ascii=False) == '[\n\t"é"\n]\n'
+
+
+def test_format_str_unchanged() -> None:
+    """Test that a well formatted document is returned as is."""
+    text = '{\n    "a": 1\n}\n'
+    assert format_str(text) is text
+
+
+def test_format_str_deep() -> None:
+    """Test that documents too deep to verify in place are compared to their output."""
+    document: Any = []
+    for _ in range(600):
+        document = [document]
+    text = json.dumps(document, indent=4) + "\n"
+    assert format_str(text) is text
+    assert check_str(text)
+    assert not check_str(text[:-1])
+
+
+def test_format_bytes() -> None:
+    """Test that UTF-8 documents are formatted."""
+    assert format_bytes('{"é": 1}'.encode(), ensure_ascii=False) == '{\n    "é": 1\n}\n'.encode()
+    data = b"[]\n"
+    assert format_bytes(data) is data
+
+
+def test_check_str() -> None:
+    """Test that check_str tells whether a document is well formatted."""
+    assert check_str("[]\n")
+    assert not check_str("[]")
+    assert Formatter(compact=True).check_bytes(b'{"a":1}\n')
+
+
+def test_check_str_without_dump(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that check_str doesn't serialize a document which is told apart from its layout."""
+
+    def dumps(*args: Any) -> str:
+        raise AssertionError("dumped")
+
+    monkeypatch.setattr(document_module, "dumps", dumps)
+    assert not check_str('{"a": 1}')
+    assert check_str('{\n    "a": 1\n}\n')
+
+
+def test_invalid_document() -> None:
+    """Test that invalid documents raise JSONDecodeError."""
+    with pytest.raises(json.JSONDecodeError, match="Expecting value"):
+        format_str("[1,]")
+    with pytest.raises(json.JSONDecodeError) as exc_info:
+        format_str('{\n  "a": 1,\n  "b": }')
+    assert (exc_info.value.lineno, exc_info.value.colno, exc_info.value.pos) == (3, 8, 19)
+    with pytest.raises(UnicodeDecodeError):
+        format_bytes(b"\xff")
+
+
+@pytest.mark.parametrize(
+    "options", [{"indent": True}, {"indent": 4.0}, {"backend": "yaml"}, {"width": 80}]
+)
+def test_invalid_options(options: Dict[str, Any]) -> None:
+    """Test that invalid options are rejected."""
+    with pytest.raises((ValueError, TypeError)):
+        format_str("[]", **options)
+
+
+def test_formatter_is_reused() -> None:
+    """Test that the formatter is created once for the same options."""
+    assert get_formatter(indent=2) is get_formatter(indent=2)
+    assert repr(Formatter(compact=True)).startswith("Formatter({'sort_keys': False")
@@ -0,0 +1,126 @@
+"""
+Tests for the JSON backends
+"""
+
+import json
+from typing import Any, Dict, List
+
+import pytest
+
+from jsonator.backend import (
+    AUTO,
+    BACKEND_CLASSES,
+    BACKENDS,
+    ORJSON_FLOATS,
+    STDLIB,
+    Backend,
+    dumps,
+    fix_floats,
+    get_backend,
+    is_available,
+    loads,
+    select_backend,
+)
+
+INSTALLED = [name for name in BACKENDS if is_available(name)]
+
+TEXTS: List[str] = [
+    "[]",
+    "{}",
+    '"str"',
+    "12",
+    '[[[[]]], {"z": {"y": [{}]}}]',
+    '{"b": 1, "a": {"d": 2, "c": [{"f": 1, "e": 2}]}}',
+    '{"a": 1, "b": 2, "a": 3}',
+    "[1.0, 1e16, 1e15, 5e-05, 0.0001, 1e-07, -0.0, -0, 1.7976931348623157e308, 5e-324]",
+    "[9223372036854775807, 18446744073709551616, -9223372036854775809, 1e400]",
+    "[NaN, Infinity, -Infinity]",
+    '["\\u00e9 \\u00fc \\ud834\\udd1e", "\\u007f\\u0000\\u001f\\"\\\\/", "\\ud800", "1e5 0.00001"]',
+    '{"\\uffff": 1, "\\ud83d\\ude00": 2, "a": 3, "B": 4}',
+    "[" * 300 + "]" * 300,
+]
+
+INVALID_TEXTS: List[str] = ["[1,]", "01", "[1.]", '"\x01"', '"a\tb"', "﻿[]", "[1] x", ""]
+
+DUMP_ARGS: List[Dict[str, Any]] = [
+    {"sort_keys": sort_keys, "indent": indent, "ensure_ascii": ensure_ascii}
+    for sort_keys in (False, True)
+    for indent in (4, 2, 1, 0, "\t", "  ", None)
+    for ensure_ascii in (False, True)
+] + [
+    {"sort_keys": sort_keys, "indent": None, "ensure_ascii": ensure_ascii, "separators": (",", ":")}
+    for sort_keys in (False, True)
+    for ensure_ascii in (False, True)
+]
+
+
+@pytest.mark.parametrize("name", INSTALLED)
+@pytest.mark.parametrize("dump_args", DUMP_ARGS)
+def test_same_output(name: str, dump_args: Dict[str, Any]) -> None:
+    """Test that every backend gives the json output for the options it supports"""
+    backend = get_backend(name)
+    if not backend.supports(dump_args):
+        pytest.skip(f"{name} falls back to json for {dump_args}")
+
+    for text in TEXTS:
+        document, used = loads(text, backend)
+        assert dumps(document, dump_args, used) == json.dumps(json.loads(text), **dump_args), text
+
+
+def test_fix_floats() -> None:
+    """Test that only floats outside of strings are rendered again"""
+    text = '["1e-5", "\\\\", 1e16, "\\" 0.00001", -0.00001, "e-5", 10.00001, 1e-7]'
+    expected = '["1e-5", "\\\\", 1e+16, "\\" 0.00001", -1e-05, "e-5", 10.00001, 1e-07]'
+    assert fix_floats(text, ORJSON_FLOATS) == expected
+
+
+@pytest.mark.parametrize("name", INSTALLED)
+def test_same_errors(name: str) -> None:
+    """Test that invalid documents are reported with the json.loads message"""
+    for text in INVALID_TEXTS:
+        with pytest.raises(json.JSONDecodeError) as expected:
+            json.loads(text)
+        with pytest.raises(json.JSONDecodeError) as error:
+            loads(text, get_backend(name))
+        assert str(error.value) == str(expected.value), text
+
+
+@pytest.mark.parametrize(
+    ("dump_args", "backends"),
+    [
+        ({"indent": 2}, ("orjson", "ujson", "simplejson")),
+        ({"indent": None, "separators": (",", ":")}, ("orjson", "ujson", "simplejson")),
+        ({"indent": 4}, ("ujson", "simplejson")),
+        ({"indent": 0}, ("simplejson",)),
+        ({"indent": "\t"}, ("simplejson",)),
+        ({"indent": None}, ("simplejson",)),
+    ],
+)
+def test_select_backend(dump_args: Dict[str, Any], backends: List[str]) -> None:
+    """Test the fallback matrix"""
+    for name in BACKENDS:
+        if is_available(name):
+            expected = name if name in backends else STDLIB
+            assert select_backend(name, dump_args) == expected
+
+    expected = next((name for name in backends if is_available(name)), STDLIB)
+    assert select_backend(AUTO, dump_args) == expected
+
+
+class MissingBackend(Backend):
+    """A backend whose library is not installed"""
+
+    def __init__(self) -> None:
+        raise ImportError
+
+
+def test_select_backend_not_installed(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a missing library is skipped by auto and fails if requested"""
+    monkeypatch.setitem(BACKEND_CLASSES, "orjson", MissingBackend)
+    get_backend.cache_clear()
+    try:
+        assert select_backend(AUTO, {"indent": 2}) != "orjson"
+        with pytest.raises(ImportError):
+            select_backend("orjson", {"indent": 2})
+    finally:
+        get_backend.cache_clear()
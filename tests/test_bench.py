@@ -0,0 +1,68 @@
+"""
+Tests for the benchmark suite
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from jsonator.bench import CORPORA, BenchError, main, run_process, write_corpus
+from jsonator.enum import ReturnCode
+from jsonator.jsonator import format_json_file
+from jsonator.models import ModeArgs
+from jsonator.report import Report
+
+pytest_plugins = ["tests.addons"]
+
+DUMP_ARGS = {"sort_keys": False, "indent": 4, "ensure_ascii": True}
+
+
+@pytest.mark.parametrize("corpus", CORPORA)
+def test_write_corpus(corpus: str, tmp_path: Path) -> None:
+    """Test that formatted corpora are left unchanged and messy ones would be reformatted"""
+    for formatted in (True, False):
+        directory = tmp_path / str(formatted)
+        files, size = write_corpus(directory, corpus, 0.01, formatted)
+        paths = sorted(directory.rglob("*.json"))
+        assert len(paths) == files
+        assert sum(path.stat().st_size for path in paths) == size
+
+        report = Report(check=True, diff=False)
+        for path in paths:
+            format_json_file(path, report, ModeArgs(True, False, False), DUMP_ARGS)
+        assert report.change_count == (0 if formatted else files)
+
+
+def test_main_export(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    """Test that the results are printed and exported as JSON"""
+    output = tmp_path / "results.json"
+    args = ["--corpus", "tiny", "--mode", "check", "--scale", "0.002", "--repeat", "1"]
+    assert main([*args, "--output", str(output)]) == 0
+    assert main([*args, "--compare", str(output)]) == 0
+
+    results = json.loads(output.read_text(encoding="utf-8"))["results"]
+    assert [(result["state"], result["mode"]) for result in results] == [
+        ("formatted", "check"),
+        ("messy", "check"),
+    ]
+    assert all(result["files"] == 10 and result["files_per_second"] > 0 for result in results)
+    out = capsys.readouterr().out
+    assert "tiny     formatted check" in out
+    assert "(faster)" in out or "(slower)" in out
+
+
+@pytest.mark.parametrize("code", ["raise SystemExit(123)", "import os; os.abort()"])
+def test_run_process_failure(code: str) -> None:
+    """Test that a failed or killed run raises instead of being timed"""
+    assert run_process([sys.executable, "-c", "raise SystemExit(1)"])[0] > 0
+    with pytest.raises(BenchError, match="exited with status"):
+        run_process([sys.executable, "-c", code])
+
+
+def test_main_failure(capsys: pytest.CaptureFixture[str]) -> None:
+    """Test that a failed run stops the benchmarks with an error"""
+    args = ["--corpus", "tiny", "--mode", "write", "--scale", "0.002", "--repeat", "1"]
+    assert main([*args, "--backend", "missing"]) == ReturnCode.INTERNAL_ERROR.value
+    assert "exited with status" in capsys.readouterr().err
@@ -0,0 +1,51 @@
+"""
+Tests for the cache of well formatted files
+"""
+
+import os
+from pathlib import Path
+
+from jsonator.cache import Cache
+
+pytest_plugins = ["tests.addons"]
+
+FILES_ENCODING = "utf-8"
+DUMP_ARGS = {"sort_keys": False, "indent": 4, "ensure_ascii": True}
+
+
+def test_cache_roundtrip(valid_format_json: Path, isolated_cache_dir: Path) -> None:
+    """Test that cached files are skipped until they change"""
+    cache = Cache.read(DUMP_ARGS)
+    assert cache.filtered_cached([valid_format_json]) == ([valid_format_json], [])
+    cache.write([valid_format_json])
+    assert cache.cache_file.parent == isolated_cache_dir
+
+    cache = Cache.read(DUMP_ARGS)
+    assert cache.filtered_cached([valid_format_json]) == ([], [valid_format_json])
+
+    # Same size, same contents, different mtime: still cached
+    stat = valid_format_json.stat()
+    os.utime(valid_format_json, (stat.st_atime, stat.st_mtime + 10))
+    assert cache.filtered_cached([valid_format_json]) == ([], [valid_format_json])
+
+    # Same size, different contents
+    valid_format_json.write_text('{\n    "key": "VALUE"\n}\n', encoding=FILES_ENCODING)
+    os.utime(valid_format_json, (stat.st_atime, stat.st_mtime + 20))
+    assert cache.filtered_cached([valid_format_json]) == ([valid_format_json], [])
+
+
+def test_cache_invalidated_by_options(valid_format_json: Path) -> None:
+    """Test that changing formatting options uses a different cache"""
+    Cache.read(DUMP_ARGS).write([valid_format_json])
+    cache = Cache.read({**DUMP_ARGS, "indent": 2})
+    assert cache.filtered_cached([valid_format_json]) == ([valid_format_json], [])
+
+
+def test_cache_corrupted(valid_format_json: Path) -> None:
+    """Test that a corrupted cache file is ignored"""
+    cache = Cache.read(DUMP_ARGS)
+    cache.cache_file.parent.mkdir(parents=True, exist_ok=True)
+    cache.cache_file.write_text("{", encoding=FILES_ENCODING)
+    cache = Cache.read(DUMP_ARGS)
+    assert not cache.file_data
+    assert cache.filtered_cached([valid_format_json]) == ([valid_format_json], [])
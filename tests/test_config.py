@@ -0,0 +1,116 @@
+"""
+Tests for the configuration files
+"""
+
+from pathlib import Path
+from subprocess import run
+from typing import Any, Dict
+
+import pytest
+from pytest_mock import MockerFixture
+
+from jsonator.config import ConfigError, ConfigResolver, parse_options, read_options
+from jsonator.enum import ReturnCode
+
+
+def make_tree(tmp_path: Path) -> Path:
+    """Write a project with options in pyproject.toml and overrides in a subdirectory."""
+    (tmp_path / ".git").mkdir()
+    (tmp_path / "pyproject.toml").write_text(
+        "[tool.jsonator]\nindent = 2\nsort-keys = true\n", encoding="utf-8"
+    )
+    (tmp_path / "compact").mkdir()
+    (tmp_path / "compact" / ".jsonator.toml").write_text("compact = true\n", encoding="utf-8")
+    (tmp_path / "compact" / "deep").mkdir()
+    for path in (tmp_path, tmp_path / "compact", tmp_path / "compact" / "deep"):
+        (path / "data.json").write_text('{"b": 1, "a": [1]}', encoding="utf-8")
+    return tmp_path
+
+
+def test_parse_options(tmp_path: Path) -> None:
+    """Options get their command line names, schemas are relative to the config file"""
+    config_file = tmp_path / ".jsonator.toml"
+    assert parse_options(
+        {"indent": "\t", "strict": True, "schema": "s.json", "schema-map": {"a/*.json": "a.json"}},
+        config_file,
+    ) == {
+        "indent": "\t",
+        "strict": True,
+        "schema": str(tmp_path / "s.json"),
+        "schema_map": (("a/*.json", str(tmp_path / "a.json")),),
+    }
+
+
+@pytest.mark.parametrize(
+    "table",
+    [{"line-length": 80}, {"indent": True}, {"indent": -1}, {"strict": 1}, {"schema-map": []}],
+)
+def test_invalid_options(table: Dict[str, Any], tmp_path: Path) -> None:
+    """Unknown options and values of the wrong type are errors"""
+    with pytest.raises(ConfigError):
+        parse_options(table, tmp_path / ".jsonator.toml")
+
+
+def test_read_options(tmp_path: Path) -> None:
+    """.jsonator.toml overrides pyproject.toml, which may have no jsonator table"""
+    (tmp_path / "pyproject.toml").write_text("[project]\nname = 'x'\n", encoding="utf-8")
+    assert not read_options(tmp_path)
+
+    (tmp_path / "pyproject.toml").write_text(
+        "[tool.jsonator]\nindent = 2\nstrict = true\n", encoding="utf-8"
+    )
+    (tmp_path / ".jsonator.toml").write_text("indent = 8\n", encoding="utf-8")
+    assert read_options(tmp_path) == {"indent": 8, "strict": True}
+
+    (tmp_path / ".jsonator.toml").write_text("indent = \n", encoding="utf-8")
+    with pytest.raises(ConfigError):
+        read_options(tmp_path)
+
+
+def test_resolver(tmp_path: Path, mocker: MockerFixture) -> None:
+    """Nearer files override farther ones, every directory is read once"""
+    (tmp_path / "project").mkdir()
+    root = make_tree(tmp_path / "project")
+    (tmp_path / ".jsonator.toml").write_text("strict = true\n", encoding="utf-8")
+    spy = mocker.spy(ConfigResolver, "options")
+
+    resolver = ConfigResolver()
+    options = {"indent": 2, "sort_keys": True, "compact": True}
+    assert resolver.options(root / "compact" / "deep") == options
+    calls = spy.call_count
+    assert resolver.options(root / "compact" / "deep") == options
+    assert resolver.options(root / "compact") == options
+    assert spy.call_count == calls + 2
+    # The project root stops the search
+    assert resolver.options(root) == {"indent": 2, "sort_keys": True}
+
+
+def test_main_config(tmp_path: Path) -> None:
+    """Each file is formatted with the options of its directory, the command line wins"""
+    root = make_tree(tmp_path)
+    args = ["python", "-m", "jsonator", str(root), "-r", "--no-cache"]
+
+    assert run(args, check=False).returncode == ReturnCode.NOTHING_WOULD_CHANGE.value
+    assert (root / "data.json").read_text(encoding="utf-8") == (
+        '{\n  "a": [\n    1\n  ],\n  "b": 1\n}\n'
+    )
+    for path in (root / "compact", root / "compact" / "deep"):
+        assert (path / "data.json").read_text(encoding="utf-8") == '{"a":[1],"b":1}\n'
+
+    assert run([*args, "--indent", "2"], check=False).returncode == 0
+    assert (root / "compact" / "data.json").read_text(encoding="utf-8") == (
+        (root / "data.json").read_text(encoding="utf-8")
+    )
+
+    # Negated flags override the config files too
+    assert run([*args, "--no-indent"], check=False).returncode == 0
+    assert (root / "data.json").read_text(encoding="utf-8") == '{"a": [1], "b": 1}\n'
+    assert (root / "compact" / "data.json").read_text(encoding="utf-8") == ('{"a": [1], "b": 1}\n')
+
+    (root / "compact" / ".jsonator.toml").write_text("colour = true\n", encoding="utf-8")
+    process = run(args, check=False, capture_output=True, text=True)
+    assert process.returncode == ReturnCode.INTERNAL_ERROR.value
+    assert "unknown option 'colour'" in process.stderr
+    assert run([*args, "--no-config", "--check"], check=False).returncode == (
+        ReturnCode.SOME_FILES_WOULD_BE_REFORMATTED.value
+    )
@@ -0,0 +1,170 @@
+"""
+Tests for jsonatord and its client
+"""
+
+import http.client
+import json
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple, cast
+
+import pytest
+
+from jsonator.client import TOKEN_HEADER, forward
+from jsonator.client import main as client_main
+from jsonator.client import read_token, token_path, uses_stdin
+from jsonator.daemon import make_server
+from jsonator.enum import ReturnCode
+
+pytest_plugins = ["tests.addons"]
+
+
+@pytest.fixture(name="server_address")
+def fixture_server_address(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> Iterator[Tuple[str, int]]:
+    """Run the daemon on a free port, with its token in a temporary cache directory."""
+    monkeypatch.setenv("JSONATOR_CACHE_DIR", str(tmp_path / "cache"))
+    server = make_server("localhost", 0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield cast(Tuple[str, int], server.server_address)
+    server.shutdown()
+    server.server_close()
+
+
+def post(
+    address: Tuple[str, int], body: str, headers: Dict[str, str], path: str = "/"
+) -> Tuple[int, str]:
+    """Send a document to format, or a request to another path."""
+    connection = http.client.HTTPConnection(*address)
+    connection.request("POST", path, body.encode(), headers)
+    response = connection.getresponse()
+    result = response.status, response.read().decode()
+    connection.close()
+    return result
+
+
+def test_format(server_address: Tuple[str, int]) -> None:
+    """Test that the body is formatted with the options of the headers."""
+    status, text = post(server_address, '{"b": 1, "a": [1]}', {"X-Indent": "2", "X-Sort-Keys": "1"})
+    assert status == 200
+    assert text == '{\n  "a": [\n    1\n  ],\n  "b": 1\n}\n'
+
+
+def test_format_unchanged(server_address: Tuple[str, int]) -> None:
+    """Test that an already formatted document gets an empty response."""
+    status, text = post(server_address, '{"a":1}\n', {"X-Compact": "true"})
+    assert status == 204
+    assert not text
+
+
+def test_format_diff(server_address: Tuple[str, int]) -> None:
+    """Test that X-Diff returns a diff."""
+    status, text = post(server_address, '{"a": 1}', {"X-Diff": "1", "X-File-Name": "a.json"})
+    assert status == 200
+    assert text.startswith("--- a.json\n+++ formatted file\n")
+
+
+def test_format_structural_diff(server_address: Tuple[str, int]) -> None:
+    """Test that X-Diff: structural returns the diff by JSON path."""
+    status, text = post(
+        server_address, '{"b": 1, "a": 2}', {"X-Diff": "structural", "X-Sort-Keys": "1"}
+    )
+    assert status == 200
+    assert text == "--- In\n+++ formatted file\n~ $: key order changed\n"
+
+
+@pytest.mark.parametrize(
+    ("body", "headers"),
+    [
+        ("{", {}),
+        ("{}", {"X-Indent": "wide"}),
+        ("{}", {"X-Backend": "yaml"}),
+        ("{}", {"X-Protocol-Version": "2"}),
+    ],
+)
+def test_format_bad_request(
+    server_address: Tuple[str, int], body: str, headers: Dict[str, str]
+) -> None:
+    """Test that invalid documents and options are rejected."""
+    status, _ = post(server_address, body, headers)
+    assert status == 400
+
+
+def test_forward(server_address: Tuple[str, int], invalid_format_json: Path) -> None:
+    """Test that the client runs command lines on the daemon."""
+    address = f"{server_address[0]}:{server_address[1]}"
+    result = forward([str(invalid_format_json), "--check"], address)
+    assert result["status"] == ReturnCode.SOME_FILES_WOULD_BE_REFORMATTED.value
+    assert "would reformat" in str(result["stderr"])
+
+    result = forward(["--no-such-option"], address)
+    assert result["status"] == 2
+    assert "usage: jsonator" in str(result["stderr"])
+
+
+def test_run_requires_token(server_address: Tuple[str, int]) -> None:
+    """Command lines need the token of the owner and a JSON content type"""
+    body = json.dumps({"argv": ["--version"]})
+    token = read_token(f"{server_address[0]}:{server_address[1]}")
+    assert token is not None
+    assert token_path(server_address[1]).stat().st_mode & 0o777 == 0o600
+
+    assert post(server_address, body, {"Content-Type": "application/json"}, "/run")[0] == 403
+    headers = {"Content-Type": "application/json", TOKEN_HEADER: "x" * len(token)}
+    assert post(server_address, body, headers, "/run")[0] == 403
+    headers = {"Content-Type": "text/plain", TOKEN_HEADER: token}
+    assert post(server_address, body, headers, "/run")[0] == 415
+
+
+@pytest.mark.parametrize(
+    "argv", [["-"], ["--files-from", "-"], ["--files-from=-", "."], [".", "--watch"], ["--wat"]]
+)
+def test_run_refuses_blocking_commands(server_address: Tuple[str, int], argv: List[str]) -> None:
+    """Command lines reading the standard input or watching files are refused"""
+    token = read_token(f"{server_address[0]}:{server_address[1]}")
+    headers = {"Content-Type": "application/json", TOKEN_HEADER: str(token)}
+    status, _ = post(server_address, json.dumps({"argv": argv}), headers, "/run")
+    assert status == 400
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Unix sockets")
+def test_client_unix_socket(
+    tmp_path: Path,
+    invalid_format_json: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """Test that the client talks to a daemon listening on a Unix socket."""
+    socket_path = tmp_path / "jsonatord.sock"
+    server = make_server(socket_path=socket_path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setenv("JSONATOR_DAEMON", f"unix:{socket_path}")
+    try:
+        status = client_main([str(invalid_format_json), "--diff"])
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert status == ReturnCode.NOTHING_WOULD_CHANGE.value
+    assert "+++ formatted file" in capsys.readouterr().out
+    assert json.loads(invalid_format_json.read_text(encoding="utf-8"))
+
+
+def test_client_without_daemon(
+    tmp_path: Path, invalid_format_json: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that the command runs in-process when no daemon is running."""
+    monkeypatch.setenv("JSONATOR_DAEMON", f"unix:{tmp_path / 'missing.sock'}")
+    status = client_main([str(invalid_format_json), "--check"])
+    assert status == ReturnCode.SOME_FILES_WOULD_BE_REFORMATTED.value
+
+
+def test_client_stdin() -> None:
+    """Test that command lines reading the standard input are not forwarded."""
+    assert uses_stdin(["-", "--check"])
+    assert uses_stdin(["--files-from", "-"])
+    assert not uses_stdin(["data.json"])
@@ -0,0 +1,174 @@
+"""
+Tests for the diff engine
+"""
+
+import difflib
+import io
+import json
+import random
+import threading
+import time
+from typing import Iterator, List
+
+import pytest
+
+from jsonator.diff import opcodes, unified_diff
+from jsonator.output import WRITE_SIZE, color_diff, diff, iter_color, write_diff
+
+
+def apply_patch(a_lines: List[str], diff_lines: List[str]) -> List[str]:
+    """Apply a unified diff without context checks beyond the removed lines."""
+    result: List[str] = []
+    position = 0
+    for line in diff_lines[2:]:
+        if line.startswith("@@"):
+            start = int(line.split()[1][1:].split(",")[0])
+            length = line.split()[1].split(",")
+            # "-0,0" is an empty range before the first line
+            target = start if len(length) > 1 and length[1] == "0" else start - 1
+            result.extend(a_lines[position:target])
+            position = target
+        elif line.startswith((" ", "-")):
+            assert a_lines[position] == line[1:]
+            if line[0] == " ":
+                result.append(line[1:])
+            position += 1
+        else:
+            result.append(line[1:])
+    result.extend(a_lines[position:])
+    return result
+
+
+@pytest.mark.parametrize(
+    "a_lines, b_lines",
+    [
+        ([], []),
+        (["a\n"], ["a\n"]),
+        ([], ["a\n", "b\n"]),
+        (["a\n", "b\n"], []),
+        (["a\n", "b\n", "c\n"], ["a\n", "x\n", "c\n"]),
+        ([f"{i}\n" for i in range(100)], [f"{i}\n" for i in range(100) if i % 30]),
+        ([f"{i}\n" for i in range(50)], [f"{i}\n" for i in range(50)] + ["end\n"]),
+    ],
+)
+def test_unified_diff_like_difflib(a_lines: List[str], b_lines: List[str]) -> None:
+    """Simple changes give the output of difflib"""
+    expected = list(difflib.unified_diff(a_lines, b_lines, "a", "b", n=5))
+    assert list(unified_diff(a_lines, b_lines, "a", "b", context=5)) == expected
+
+
+def test_unified_diff_applies() -> None:
+    """The diff turns the first file into the second one"""
+    rng = random.Random(0)
+    for _ in range(300):
+        a_lines = [rng.choice("abcdef") + "\n" for _ in range(rng.randint(0, 40))]
+        b_lines = [rng.choice("abcdefg") + "\n" for _ in range(rng.randint(0, 40))]
+        diff_lines = list(unified_diff(a_lines, b_lines, "a", "b"))
+        assert apply_patch(a_lines, diff_lines) == b_lines
+
+        i = j = 0
+        for tag, i1, i2, j1, j2 in opcodes(a_lines, b_lines, 5.0):
+            assert (i1, j1) == (i, j)
+            if tag == "equal":
+                assert a_lines[i1:i2] == b_lines[j1:j2]
+            i, j = i2, j2
+        assert (i, j) == (len(a_lines), len(b_lines))
+
+
+def test_unified_diff_timeout() -> None:
+    """A diff over the time budget replaces the whole file"""
+    a_lines = ["a\n", "b\n", "c\n"]
+    b_lines = ["a\n", "x\n", "c\n"]
+    assert list(unified_diff(a_lines, b_lines, "a", "b", timeout=0.0)) == [
+        "--- a\n",
+        "+++ b\n",
+        "@@ -1,3 +1,3 @@\n",
+        "-a\n",
+        "-b\n",
+        "-c\n",
+        "+a\n",
+        "+x\n",
+        "+c\n",
+    ]
+
+
+def test_diff_no_newline() -> None:
+    """A missing newline at the end of a file is marked"""
+    assert diff('{"a": 1}', '{\n    "a": 1\n}\n', "a.json", "formatted file") == (
+        "--- a.json\n"
+        "+++ formatted file\n"
+        "@@ -1 +1,3 @@\n"
+        '-{"a": 1}\n'
+        "\\ No newline at end of file\n"
+        "+{\n"
+        '+    "a": 1\n'
+        "+}\n"
+    )
+
+
+def test_diff_large_file() -> None:
+    """Reindenting a large document is fast"""
+    document = [{"id": i, "name": f"item {i}", "tags": [i % 7, i % 11]} for i in range(20000)]
+    a_text = json.dumps(document, indent=2) + "\n"
+    b_text = json.dumps(document, indent=4) + "\n"
+
+    start = time.monotonic()
+    diff_text = diff(a_text, b_text, "a", "b")
+    assert time.monotonic() - start < 5.0
+    assert apply_patch(a_text.splitlines(True), diff_text.splitlines(True)) == b_text.splitlines(
+        True
+    )
+
+
+def test_iter_color() -> None:
+    """Colored lines keep their line breaks, like color_diff"""
+    contents = diff('{"a": 1}\n', '{\n    "a": 1\n}\n', "a.json", "formatted file")
+    assert "".join(iter_color(contents.splitlines(True))) == color_diff(contents)
+
+
+def test_write_diff_chunks() -> None:
+    """The lines are consumed lazily and written in chunks"""
+    writes: List[int] = []
+
+    class Stream(io.StringIO):
+        """Record the size of every write"""
+
+        def write(self, text: str) -> int:
+            writes.append(len(text))
+            return super().write(text)
+
+    def lines() -> Iterator[str]:
+        for i in range(3 * WRITE_SIZE // 9):
+            yield f"+{i:07}\n"
+        # The first chunks are out before the diff is complete
+        assert len(writes) == 2
+
+    stream = Stream()
+    write_diff(lines(), stream)
+    assert len(writes) == 3
+    assert max(writes) < WRITE_SIZE + 9
+    assert stream.getvalue() == "".join(f"+{i:07}\n" for i in range(3 * WRITE_SIZE // 9))
+
+
+def test_write_diff_lock() -> None:
+    """The diffs written at the same time come out in one piece each"""
+    stream = io.StringIO()
+
+    def lines(name: str) -> Iterator[str]:
+        for i in range(WRITE_SIZE // 4):
+            if i % 1000 == 0:
+                time.sleep(0.001)
+            yield f"{name}{i:07}\n"
+
+    threads = [
+        threading.Thread(target=write_diff, args=(lines(name), stream)) for name in ("+", "-")
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    output = stream.getvalue().splitlines()
+    assert len(output) == WRITE_SIZE // 2
+    assert len({line[0] for line in output[: WRITE_SIZE // 4]}) == 1
+    assert len({line[0] for line in output[WRITE_SIZE // 4 :]}) == 1
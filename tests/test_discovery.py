@@ -0,0 +1,120 @@
+"""
+Tests for the discovery of JSON files
+"""
+
+from pathlib import Path
+from typing import Any, List
+
+import pytest
+
+from jsonator.discovery import PatternSet, iter_files
+
+pytest_plugins = ["tests.addons"]
+
+FILES_ENCODING = "utf-8"
+
+
+def make_tree(root: Path, names: List[str]) -> None:
+    """Create empty files, with their parent directories"""
+    for name in names:
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("{}\n", encoding=FILES_ENCODING)
+
+
+def found(root: Path, **kwargs: Any) -> List[str]:
+    """Return the sorted relative paths of the discovered files"""
+    return sorted(path.relative_to(root).as_posix() for path in iter_files(root, **kwargs))
+
+
+@pytest.mark.parametrize(
+    ("pattern", "path", "is_dir", "expected"),
+    [
+        ("*.json", "a.json", False, True),
+        ("*.json", "sub/dir/a.json", False, True),
+        ("*.json", "a.jsonl", False, None),
+        ("build/", "build", True, True),
+        ("build/", "sub/build", True, True),
+        ("build/", "build", False, None),
+        ("/build", "build", True, True),
+        ("/build", "sub/build", True, None),
+        ("data/*.json", "data/a.json", False, True),
+        ("data/*.json", "sub/data/a.json", False, None),
+        ("data/*.json", "data/sub/a.json", False, None),
+        ("**/data", "sub/data", True, True),
+        ("**/data", "data", True, True),
+        ("a/**/b.json", "a/b.json", False, True),
+        ("a/**/b.json", "a/x/y/b.json", False, True),
+        ("a/**", "a/x/y", False, True),
+        ("test?.json", "test1.json", False, True),
+        ("test[0-3].json", "test4.json", False, None),
+        ("test[!0-3].json", "test4.json", False, True),
+        ("\\#note.json", "#note.json", False, True),
+        ("# comment", "# comment", False, None),
+    ],
+)
+def test_pattern_match(pattern: str, path: str, is_dir: bool, expected: object) -> None:
+    """Test the .gitignore pattern syntax"""
+    assert PatternSet([pattern]).match(path, is_dir) is expected
+
+
+def test_pattern_negation() -> None:
+    """Test that the last matching pattern decides"""
+    patterns = PatternSet(["*.json", "!keep.json"])
+    assert patterns.match("drop.json", False) is True
+    assert patterns.match("keep.json", False) is False
+    assert patterns.match("notes.txt", False) is None
+
+
+def test_iter_files(tmp_path: Path) -> None:
+    """Test that default excludes and non JSON files are skipped"""
+    make_tree(
+        tmp_path,
+        [
+            "a.json",
+            "notes.txt",
+            "logs.jsonl",
+            "sub/b.json",
+            "sub/deeper/c.json",
+            "node_modules/pkg/package.json",
+            ".git/d.json",
+            "sub/build/e.json",
+        ],
+    )
+    assert found(tmp_path) == ["a.json", "logs.jsonl", "sub/b.json", "sub/deeper/c.json"]
+    assert found(tmp_path, recursive=False) == ["a.json", "logs.jsonl"]
+    assert found(tmp_path, include=["*.txt"]) == ["notes.txt"]
+    assert found(tmp_path, extend_exclude=["deeper/"]) == ["a.json", "logs.jsonl", "sub/b.json"]
+    assert found(tmp_path, exclude=["/sub/"]) == [
+        ".git/d.json",
+        "a.json",
+        "logs.jsonl",
+        "node_modules/pkg/package.json",
+    ]
+
+
+def test_iter_files_gitignore(tmp_path: Path) -> None:
+    """Test that .gitignore files of the project are respected"""
+    (tmp_path / ".git").mkdir()
+    make_tree(tmp_path, ["a.json", "generated.json", "sub/b.json", "sub/local.json"])
+    (tmp_path / ".gitignore").write_text("generated.json\n/sub/b.json\n", encoding=FILES_ENCODING)
+    (tmp_path / "sub" / ".gitignore").write_text("*.json\n!b.json\n", encoding=FILES_ENCODING)
+
+    assert found(tmp_path) == ["a.json", "sub/b.json"]
+    assert found(tmp_path / "sub") == ["b.json"]
+    assert found(tmp_path, gitignore=False) == [
+        "a.json",
+        "generated.json",
+        "sub/b.json",
+        "sub/local.json",
+    ]
+
+
+def test_iter_files_symlinked_directory(tmp_path: Path) -> None:
+    """Test that symlinks to directories are not followed"""
+    make_tree(tmp_path, ["real/a.json"])
+    try:
+        (tmp_path / "link").symlink_to(tmp_path / "real", target_is_directory=True)
+    except OSError:
+        pytest.skip("symlinks are not supported")
+    assert found(tmp_path) == ["real/a.json"]
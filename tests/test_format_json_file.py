@@ -8,7 +8,7 @@ from pathlib import Path
 import pytest
 
 from jsonator.enum import ReturnCode
-from jsonator.jsonator import format_json_file
+from jsonator.jsonator import format_json_file, read_text, same_text
 from jsonator.models import ModeArgs
 from jsonator.report import Report
 
@@ -113,3 +113,33 @@ def test_format_json_file(json_file: Path, json_file_incorrect_format: Path) ->
     malformed_file.write_text("{", encoding=FILES_ENCODING)
     format_json_file(malformed_file, report, ModeArgs(False, False, False), dump_args=dump_args)
     assert report.status == ReturnCode.INTERNAL_ERROR.value
+
+
+@pytest.mark.parametrize("threshold", [1, 1024 * 1024])
+def test_read_text(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, threshold: int) -> None:
+    """Test that files are read like Path.read_text, mapped or not."""
+    monkeypatch.setattr("jsonator.jsonator.MMAP_THRESHOLD", threshold)
+    file_path = tmp_path / "test.json"
+    for data in (b"", b'{"key": "\xc3\xa9"}\n', b'{\r\n"a": 1\r}\r\n'):
+        file_path.write_bytes(data)
+        assert read_text(file_path) == (file_path.read_text(encoding=FILES_ENCODING), len(data))
+
+    file_path.write_bytes(b'"\xff"')
+    with pytest.raises(UnicodeDecodeError):
+        read_text(file_path)
+
+
+def test_same_text(tmp_path: Path) -> None:
+    """Test that files are compared by their text, with universal newlines."""
+    a_file = tmp_path / "a.json"
+    b_file = tmp_path / "b.json"
+    for a_data, b_data, same in (
+        (b"{}\n", b"{}\n", True),
+        (b"[1]\n", b"[2]\n", False),
+        (b"[1]\n", b"[1]", False),
+        (b"{\r\n}\r\n", b"{\n}\n", True),
+        (b"{\r\n}\r\n", b"{\n}", False),
+    ):
+        a_file.write_bytes(a_data)
+        b_file.write_bytes(b_data)
+        assert same_text(a_file, b_file) is same
@@ -0,0 +1,110 @@
+"""
+Tests for the git integration
+"""
+
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from jsonator.git import GitError, changed_files
+
+pytest_plugins = ["tests.addons"]
+
+FILES_ENCODING = "utf-8"
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+
+
+def git(repo: Path, *args: str) -> None:
+    """Run a git command in the repository"""
+    subprocess.run(
+        ["git", "-C", str(repo), "-c", "user.name=test", "-c", "user.email=test@test", *args],
+        check=True,
+        capture_output=True,
+    )
+
+
+@pytest.fixture(name="git_repo")
+def fixture_git_repo(tmp_path: Path) -> Path:
+    """Create a git repository with committed JSON files"""
+    git(tmp_path, "init", "-q")
+    (tmp_path / "sub").mkdir()
+    for name in ("committed.json", "modified.json", "sub/nested.json", "notes.txt"):
+        (tmp_path / name).write_text("{}\n", encoding=FILES_ENCODING)
+    git(tmp_path, "add", ".")
+    git(tmp_path, "commit", "-q", "-m", "initial")
+    return tmp_path
+
+
+def test_changed_files(git_repo: Path) -> None:
+    """Test that modified and untracked JSON files are found"""
+    (git_repo / "modified.json").write_text("[]\n", encoding=FILES_ENCODING)
+    (git_repo / "sub" / "nested.json").write_text("[]\n", encoding=FILES_ENCODING)
+    (git_repo / "untracked.json").write_text("{}\n", encoding=FILES_ENCODING)
+    (git_repo / "notes.txt").write_text("notes\n", encoding=FILES_ENCODING)
+
+    assert sorted(changed_files(git_repo)) == [
+        git_repo / "modified.json",
+        git_repo / "sub" / "nested.json",
+        git_repo / "untracked.json",
+    ]
+    assert sorted(changed_files(git_repo, recursive=False)) == [
+        git_repo / "modified.json",
+        git_repo / "untracked.json",
+    ]
+    assert changed_files(git_repo / "sub") == [git_repo / "sub" / "nested.json"]
+    assert changed_files(git_repo / "modified.json") == [git_repo / "modified.json"]
+    assert not changed_files(git_repo / "committed.json")
+
+
+def test_changed_files_patterns(git_repo: Path) -> None:
+    """Test that changed files are selected by the patterns of directory discovery"""
+    (git_repo / "build").mkdir()
+    for name in ("records.jsonl", "events.ndjson", "build/out.json", "sub/skip.json"):
+        (git_repo / name).write_text("{}\n", encoding=FILES_ENCODING)
+
+    assert sorted(changed_files(git_repo)) == [
+        git_repo / "events.ndjson",
+        git_repo / "records.jsonl",
+        git_repo / "sub" / "skip.json",
+    ]
+    assert changed_files(git_repo, include=["*.jsonl"]) == [git_repo / "records.jsonl"]
+    assert sorted(changed_files(git_repo, exclude=["*.ndjson"], extend_exclude=["skip.*"])) == [
+        git_repo / "build" / "out.json",
+        git_repo / "records.jsonl",
+    ]
+    assert changed_files(git_repo / "build" / "out.json") == [git_repo / "build" / "out.json"]
+
+
+def test_changed_since(git_repo: Path) -> None:
+    """Test that files committed after the revision are found"""
+    (git_repo / "modified.json").write_text("[]\n", encoding=FILES_ENCODING)
+    git(git_repo, "commit", "-q", "-am", "second")
+
+    assert not changed_files(git_repo)
+    assert changed_files(git_repo, since="HEAD~1") == [git_repo / "modified.json"]
+
+
+def test_changed_since_option(git_repo: Path) -> None:
+    """Test that a revision starting with a dash isn't passed to git as an option"""
+    output = git_repo / "output.txt"
+    with pytest.raises(GitError, match="invalid revision"):
+        changed_files(git_repo, since=f"--output={output}")
+    assert not output.exists()
+
+
+def test_staged(git_repo: Path) -> None:
+    """Test that only staged files are found"""
+    (git_repo / "modified.json").write_text("[]\n", encoding=FILES_ENCODING)
+    (git_repo / "staged.json").write_text("{}\n", encoding=FILES_ENCODING)
+    git(git_repo, "add", "staged.json")
+
+    assert changed_files(git_repo, staged=True) == [git_repo / "staged.json"]
+
+
+def test_not_a_repository(tmp_path: Path) -> None:
+    """Test that an error is raised outside of a git repository"""
+    with pytest.raises(GitError):
+        changed_files(tmp_path, since="HEAD")
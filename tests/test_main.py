@@ -20,7 +20,7 @@ def test_main_file_not_found(mocker: MockerFixture) -> None:
     mocker.patch(
         "argparse.ArgumentParser.parse_args",
         return_value=argparse.Namespace(
-            path=Path("/path/to/file.json"),
+            paths=[Path("/path/to/file.json")],
             recursive=False,
             check=False,
             diff=False,
@@ -30,6 +30,31 @@ def test_main_file_not_found(mocker: MockerFixture) -> None:
             compact=False,
             ensure_ascii=False,
             verbosity=3,
+            jobs=1,
+            cache=False,
+            cache_dir=None,
+            stream=False,
+            changed_since=None,
+            staged=False,
+            include=None,
+            exclude=None,
+            extend_exclude=None,
+            gitignore=True,
+            backend="auto",
+            stats=False,
+            slowest=10,
+            profile_output=None,
+            fsync="never",
+            watch=False,
+            debounce=0.2,
+            io_concurrency=None,
+            config=True,
+            strict=False,
+            schema=None,
+            schema_map=None,
+            files_from=None,
+            report_format=None,
+            report_file="-",
         ),
     )
     assert main() == ReturnCode.FILE_NOT_FOUND.value
@@ -40,7 +65,7 @@ def test_main_invalid_json(mocker: MockerFixture, invalid_json: Path) -> None:
     mocker.patch(
         "argparse.ArgumentParser.parse_args",
         return_value=argparse.Namespace(
-            path=invalid_json,
+            paths=[invalid_json],
             recursive=False,
             check=False,
             diff=False,
@@ -50,6 +75,31 @@ def test_main_invalid_json(mocker: MockerFixture, invalid_json: Path) -> None:
             compact=False,
             ensure_ascii=False,
             verbosity=3,
+            jobs=1,
+            cache=False,
+            cache_dir=None,
+            stream=False,
+            changed_since=None,
+            staged=False,
+            include=None,
+            exclude=None,
+            extend_exclude=None,
+            gitignore=True,
+            backend="auto",
+            stats=False,
+            slowest=10,
+            profile_output=None,
+            fsync="never",
+            watch=False,
+            debounce=0.2,
+            io_concurrency=None,
+            config=True,
+            strict=False,
+            schema=None,
+            schema_map=None,
+            files_from=None,
+            report_format=None,
+            report_file="-",
         ),
     )
     assert main() == ReturnCode.INTERNAL_ERROR.value
@@ -60,7 +110,7 @@ def test_main_invalid_json_dir(mocker: MockerFixture, invalid_json_in_dir: Path)
     mocker.patch(
         "argparse.ArgumentParser.parse_args",
         return_value=argparse.Namespace(
-            path=invalid_json_in_dir,
+            paths=[invalid_json_in_dir],
             recursive=False,
             check=False,
             diff=False,
@@ -70,6 +120,31 @@ def test_main_invalid_json_dir(mocker: MockerFixture, invalid_json_in_dir: Path)
             compact=False,
             ensure_ascii=False,
             verbosity=3,
+            jobs=1,
+            cache=False,
+            cache_dir=None,
+            stream=False,
+            changed_since=None,
+            staged=False,
+            include=None,
+            exclude=None,
+            extend_exclude=None,
+            gitignore=True,
+            backend="auto",
+            stats=False,
+            slowest=10,
+            profile_output=None,
+            fsync="never",
+            watch=False,
+            debounce=0.2,
+            io_concurrency=None,
+            config=True,
+            strict=False,
+            schema=None,
+            schema_map=None,
+            files_from=None,
+            report_format=None,
+            report_file="-",
         ),
     )
     assert main() == ReturnCode.INTERNAL_ERROR.value
@@ -80,7 +155,7 @@ def test_main_valid_single_file_no_check(mocker: MockerFixture, valid_format_jso
     mocker.patch(
         "argparse.ArgumentParser.parse_args",
         return_value=argparse.Namespace(
-            path=valid_format_json,
+            paths=[valid_format_json],
             recursive=False,
             check=False,
             diff=False,
@@ -90,6 +165,31 @@ def test_main_valid_single_file_no_check(mocker: MockerFixture, valid_format_jso
             compact=False,
             ensure_ascii=False,
             verbosity=3,
+            jobs=1,
+            cache=False,
+            cache_dir=None,
+            stream=False,
+            changed_since=None,
+            staged=False,
+            include=None,
+            exclude=None,
+            extend_exclude=None,
+            gitignore=True,
+            backend="auto",
+            stats=False,
+            slowest=10,
+            profile_output=None,
+            fsync="never",
+            watch=False,
+            debounce=0.2,
+            io_concurrency=None,
+            config=True,
+            strict=False,
+            schema=None,
+            schema_map=None,
+            files_from=None,
+            report_format=None,
+            report_file="-",
         ),
     )
     assert main() == ReturnCode.NOTHING_WOULD_CHANGE.value
@@ -102,7 +202,7 @@ def test_main_invalid_single_file_no_check(
     mocker.patch(
         "argparse.ArgumentParser.parse_args",
         return_value=argparse.Namespace(
-            path=invalid_format_json,
+            paths=[invalid_format_json],
             recursive=False,
             check=False,
             diff=False,
@@ -112,6 +212,31 @@ def test_main_invalid_single_file_no_check(
             compact=False,
             ensure_ascii=False,
             verbosity=3,
+            jobs=1,
+            cache=False,
+            cache_dir=None,
+            stream=False,
+            changed_since=None,
+            staged=False,
+            include=None,
+            exclude=None,
+            extend_exclude=None,
+            gitignore=True,
+            backend="auto",
+            stats=False,
+            slowest=10,
+            profile_output=None,
+            fsync="never",
+            watch=False,
+            debounce=0.2,
+            io_concurrency=None,
+            config=True,
+            strict=False,
+            schema=None,
+            schema_map=None,
+            files_from=None,
+            report_format=None,
+            report_file="-",
         ),
     )
     assert main() == ReturnCode.NOTHING_WOULD_CHANGE.value
@@ -123,7 +248,7 @@ def test_main_valid_single_file_check(mocker: MockerFixture, valid_format_json:
     mocker.patch(
         "argparse.ArgumentParser.parse_args",
         return_value=argparse.Namespace(
-            path=valid_format_json,
+            paths=[valid_format_json],
             recursive=False,
             check=True,
             diff=False,
@@ -133,6 +258,31 @@ def test_main_valid_single_file_check(mocker: MockerFixture, valid_format_json:
             compact=False,
             ensure_ascii=False,
             verbosity=3,
+            jobs=1,
+            cache=False,
+            cache_dir=None,
+            stream=False,
+            changed_since=None,
+            staged=False,
+            include=None,
+            exclude=None,
+            extend_exclude=None,
+            gitignore=True,
+            backend="auto",
+            stats=False,
+            slowest=10,
+            profile_output=None,
+            fsync="never",
+            watch=False,
+            debounce=0.2,
+            io_concurrency=None,
+            config=True,
+            strict=False,
+            schema=None,
+            schema_map=None,
+            files_from=None,
+            report_format=None,
+            report_file="-",
         ),
     )
     assert main() == ReturnCode.NOTHING_WOULD_CHANGE.value
@@ -146,7 +296,7 @@ def test_main_valid_single_file_check_sort_keys(
     mocker.patch(
         "argparse.ArgumentParser.parse_args",
         return_value=argparse.Namespace(
-            path=invalid_format_json_multiple_keys,
+            paths=[invalid_format_json_multiple_keys],
             recursive=False,
             check=True,
             diff=False,
@@ -156,6 +306,31 @@ def test_main_valid_single_file_check_sort_keys(
             compact=False,
             ensure_ascii=False,
             verbosity=3,
+            jobs=1,
+            cache=False,
+            cache_dir=None,
+            stream=False,
+            changed_since=None,
+            staged=False,
+            include=None,
+            exclude=None,
+            extend_exclude=None,
+            gitignore=True,
+            backend="auto",
+            stats=False,
+            slowest=10,
+            profile_output=None,
+            fsync="never",
+            watch=False,
+            debounce=0.2,
+            io_concurrency=None,
+            config=True,
+            strict=False,
+            schema=None,
+            schema_map=None,
+            files_from=None,
+            report_format=None,
+            report_file="-",
         ),
     )
     assert main() == ReturnCode.SOME_FILES_WOULD_BE_REFORMATTED.value
@@ -167,7 +342,7 @@ def test_main_invalid_single_file_check(mocker: MockerFixture, invalid_format_js
     mocker.patch(
         "argparse.ArgumentParser.parse_args",
         return_value=argparse.Namespace(
-            path=invalid_format_json,
+            paths=[invalid_format_json],
             recursive=False,
             check=True,
             diff=False,
@@ -177,6 +352,31 @@ def test_main_invalid_single_file_check(mocker: MockerFixture, invalid_format_js
             compact=False,
             ensure_ascii=False,
             verbosity=3,
+            jobs=1,
+            cache=False,
+            cache_dir=None,
+            stream=False,
+            changed_since=None,
+            staged=False,
+            include=None,
+            exclude=None,
+            extend_exclude=None,
+            gitignore=True,
+            backend="auto",
+            stats=False,
+            slowest=10,
+            profile_output=None,
+            fsync="never",
+            watch=False,
+            debounce=0.2,
+            io_concurrency=None,
+            config=True,
+            strict=False,
+            schema=None,
+            schema_map=None,
+            files_from=None,
+            report_format=None,
+            report_file="-",
         ),
     )
     assert main() == ReturnCode.SOME_FILES_WOULD_BE_REFORMATTED.value
@@ -190,7 +390,7 @@ def test_main_valid_dir_no_check_no_subdirs(
     mocker.patch(
         "argparse.ArgumentParser.parse_args",
         return_value=argparse.Namespace(
-            path=valid_format_dir_no_subdirs,
+            paths=[valid_format_dir_no_subdirs],
             recursive=False,
             check=False,
             diff=False,
@@ -200,6 +400,31 @@ def test_main_valid_dir_no_check_no_subdirs(
             compact=False,
             ensure_ascii=False,
             verbosity=3,
+            jobs=1,
+            cache=False,
+            cache_dir=None,
+            stream=False,
+            changed_since=None,
+            staged=False,
+            include=None,
+            exclude=None,
+            extend_exclude=None,
+            gitignore=True,
+            backend="auto",
+            stats=False,
+            slowest=10,
+            profile_output=None,
+            fsync="never",
+            watch=False,
+            debounce=0.2,
+            io_concurrency=None,
+            config=True,
+            strict=False,
+            schema=None,
+            schema_map=None,
+            files_from=None,
+            report_format=None,
+            report_file="-",
         ),
     )
     assert main() == ReturnCode.NOTHING_WOULD_CHANGE.value
@@ -213,7 +438,7 @@ def test_main_invalid_dir_no_check_no_subdirs(
     mocker.patch(
         "argparse.ArgumentParser.parse_args",
         return_value=argparse.Namespace(
-            path=invalid_format_dir_no_subdirs,
+            paths=[invalid_format_dir_no_subdirs],
             recursive=False,
             check=False,
             diff=False,
@@ -223,6 +448,31 @@ def test_main_invalid_dir_no_check_no_subdirs(
             compact=False,
             ensure_ascii=False,
             verbosity=3,
+            jobs=1,
+            cache=False,
+            cache_dir=None,
+            stream=False,
+            changed_since=None,
+            staged=False,
+            include=None,
+            exclude=None,
+            extend_exclude=None,
+            gitignore=True,
+            backend="auto",
+            stats=False,
+            slowest=10,
+            profile_output=None,
+            fsync="never",
+            watch=False,
+            debounce=0.2,
+            io_concurrency=None,
+            config=True,
+            strict=False,
+            schema=None,
+            schema_map=None,
+            files_from=None,
+            report_format=None,
+            report_file="-",
         ),
     )
     assert main() == ReturnCode.NOTHING_WOULD_CHANGE.value
@@ -236,7 +486,7 @@ def test_main_valid_dir_check_no_subdirs(
     mocker.patch(
         "argparse.ArgumentParser.parse_args",
         return_value=argparse.Namespace(
-            path=valid_format_dir_no_subdirs,
+            paths=[valid_format_dir_no_subdirs],
             recursive=False,
             check=True,
             diff=False,
@@ -246,6 +496,31 @@ def test_main_valid_dir_check_no_subdirs(
             compact=False,
             ensure_ascii=False,
             verbosity=3,
+            jobs=1,
+            cache=False,
+            cache_dir=None,
+            stream=False,
+            changed_since=None,
+            staged=False,
+            include=None,
+            exclude=None,
+            extend_exclude=None,
+            gitignore=True,
+            backend="auto",
+            stats=False,
+            slowest=10,
+            profile_output=None,
+            fsync="never",
+            watch=False,
+            debounce=0.2,
+            io_concurrency=None,
+            config=True,
+            strict=False,
+            schema=None,
+            schema_map=None,
+            files_from=None,
+            report_format=None,
+            report_file="-",
         ),
     )
     assert main() == ReturnCode.NOTHING_WOULD_CHANGE.value
@@ -259,7 +534,7 @@ def test_main_invalid_dir_check_no_subdirs(
     mocker.patch(
         "argparse.ArgumentParser.parse_args",
         return_value=argparse.Namespace(
-            path=invalid_format_dir_no_subdirs,
+            paths=[invalid_format_dir_no_subdirs],
             recursive=False,
             check=True,
             diff=False,
@@ -269,6 +544,31 @@ def test_main_invalid_dir_check_no_subdirs(
             compact=False,
             ensure_ascii=False,
             verbosity=3,
+            jobs=1,
+            cache=False,
+            cache_dir=None,
+            stream=False,
+            changed_since=None,
+            staged=False,
+            include=None,
+            exclude=None,
+            extend_exclude=None,
+            gitignore=True,
+            backend="auto",
+            stats=False,
+            slowest=10,
+            profile_output=None,
+            fsync="never",
+            watch=False,
+            debounce=0.2,
+            io_concurrency=None,
+            config=True,
+            strict=False,
+            schema=None,
+            schema_map=None,
+            files_from=None,
+            report_format=None,
+            report_file="-",
         ),
     )
     assert main() == ReturnCode.SOME_FILES_WOULD_BE_REFORMATTED.value
@@ -281,7 +581,7 @@ def test_main_valid_dir_no_check_no_recursive(
     mocker.patch(
         "argparse.ArgumentParser.parse_args",
         return_value=argparse.Namespace(
-            path=valid_format_dir_subdirs,
+            paths=[valid_format_dir_subdirs],
             recursive=False,
             check=False,
             diff=False,
@@ -291,6 +591,31 @@ def test_main_valid_dir_no_check_no_recursive(
             compact=False,
             ensure_ascii=False,
             verbosity=3,
+            jobs=1,
+            cache=False,
+            cache_dir=None,
+            stream=False,
+            changed_since=None,
+            staged=False,
+            include=None,
+            exclude=None,
+            extend_exclude=None,
+            gitignore=True,
+            backend="auto",
+            stats=False,
+            slowest=10,
+            profile_output=None,
+            fsync="never",
+            watch=False,
+            debounce=0.2,
+            io_concurrency=None,
+            config=True,
+            strict=False,
+            schema=None,
+            schema_map=None,
+            files_from=None,
+            report_format=None,
+            report_file="-",
         ),
     )
     assert main() == ReturnCode.NOTHING_WOULD_CHANGE.value
@@ -303,7 +628,7 @@ def test_main_invalid_dir_no_check_no_recursive(
     mocker.patch(
         "argparse.ArgumentParser.parse_args",
         return_value=argparse.Namespace(
-            path=invalid_format_dir_subdirs,
+            paths=[invalid_format_dir_subdirs],
             recursive=False,
             check=False,
             diff=False,
@@ -313,6 +638,31 @@ def test_main_invalid_dir_no_check_no_recursive(
             compact=False,
             ensure_ascii=False,
             verbosity=3,
+            jobs=1,
+            cache=False,
+            cache_dir=None,
+            stream=False,
+            changed_since=None,
+            staged=False,
+            include=None,
+            exclude=None,
+            extend_exclude=None,
+            gitignore=True,
+            backend="auto",
+            stats=False,
+            slowest=10,
+            profile_output=None,
+            fsync="never",
+            watch=False,
+            debounce=0.2,
+            io_concurrency=None,
+            config=True,
+            strict=False,
+            schema=None,
+            schema_map=None,
+            files_from=None,
+            report_format=None,
+            report_file="-",
         ),
     )
     assert main() == ReturnCode.NOTHING_WOULD_CHANGE.value
@@ -325,7 +675,7 @@ def test_main_valid_dir_check_no_recursive(
     mocker.patch(
         "argparse.ArgumentParser.parse_args",
         return_value=argparse.Namespace(
-            path=valid_format_dir_subdirs,
+            paths=[valid_format_dir_subdirs],
             recursive=False,
             check=True,
             diff=False,
@@ -335,6 +685,31 @@ def test_main_valid_dir_check_no_recursive(
             compact=False,
             ensure_ascii=False,
             verbosity=3,
+            jobs=1,
+            cache=False,
+            cache_dir=None,
+            stream=False,
+            changed_since=None,
+            staged=False,
+            include=None,
+            exclude=None,
+            extend_exclude=None,
+            gitignore=True,
+            backend="auto",
+            stats=False,
+            slowest=10,
+            profile_output=None,
+            fsync="never",
+            watch=False,
+            debounce=0.2,
+            io_concurrency=None,
+            config=True,
+            strict=False,
+            schema=None,
+            schema_map=None,
+            files_from=None,
+            report_format=None,
+            report_file="-",
         ),
     )
     assert main() == ReturnCode.NOTHING_WOULD_CHANGE.value
@@ -347,7 +722,7 @@ def test_main_invalid_dir_check_no_recursive(
     mocker.patch(
         "argparse.ArgumentParser.parse_args",
         return_value=argparse.Namespace(
-            path=invalid_format_dir_subdirs,
+            paths=[invalid_format_dir_subdirs],
             recursive=False,
             check=True,
             diff=False,
@@ -357,6 +732,31 @@ def test_main_invalid_dir_check_no_recursive(
             compact=False,
             ensure_ascii=False,
             verbosity=3,
+            jobs=1,
+            cache=False,
+            cache_dir=None,
+            stream=False,
+            changed_since=None,
+            staged=False,
+            include=None,
+            exclude=None,
+            extend_exclude=None,
+            gitignore=True,
+            backend="auto",
+            stats=False,
+            slowest=10,
+            profile_output=None,
+            fsync="never",
+            watch=False,
+            debounce=0.2,
+            io_concurrency=None,
+            config=True,
+            strict=False,
+            schema=None,
+            schema_map=None,
+            files_from=None,
+            report_format=None,
+            report_file="-",
         ),
     )
     assert main() == ReturnCode.NOTHING_WOULD_CHANGE.value
@@ -369,7 +769,7 @@ def test_main_valid_dir_no_check_recursive(
     mocker.patch(
         "argparse.ArgumentParser.parse_args",
         return_value=argparse.Namespace(
-            path=valid_format_dir_subdirs,
+            paths=[valid_format_dir_subdirs],
             recursive=True,
             check=False,
             diff=False,
@@ -379,6 +779,31 @@ def test_main_valid_dir_no_check_recursive(
             compact=False,
             ensure_ascii=False,
             verbosity=3,
+            jobs=1,
+            cache=False,
+            cache_dir=None,
+            stream=False,
+            changed_since=None,
+            staged=False,
+            include=None,
+            exclude=None,
+            extend_exclude=None,
+            gitignore=True,
+            backend="auto",
+            stats=False,
+            slowest=10,
+            profile_output=None,
+            fsync="never",
+            watch=False,
+            debounce=0.2,
+            io_concurrency=None,
+            config=True,
+            strict=False,
+            schema=None,
+            schema_map=None,
+            files_from=None,
+            report_format=None,
+            report_file="-",
         ),
     )
     assert main() == ReturnCode.NOTHING_WOULD_CHANGE.value
@@ -391,7 +816,7 @@ def test_main_invalid_dir_no_check_recursive(
     mocker.patch(
         "argparse.ArgumentParser.parse_args",
         return_value=argparse.Namespace(
-            path=invalid_format_dir_subdirs,
+            paths=[invalid_format_dir_subdirs],
             recursive=True,
             check=False,
             diff=False,
@@ -401,6 +826,31 @@ def test_main_invalid_dir_no_check_recursive(
             compact=False,
             ensure_ascii=False,
             verbosity=3,
+            jobs=1,
+            cache=False,
+            cache_dir=None,
+            stream=False,
+            changed_since=None,
+            staged=False,
+            include=None,
+            exclude=None,
+            extend_exclude=None,
+            gitignore=True,
+            backend="auto",
+            stats=False,
+            slowest=10,
+            profile_output=None,
+            fsync="never",
+            watch=False,
+            debounce=0.2,
+            io_concurrency=None,
+            config=True,
+            strict=False,
+            schema=None,
+            schema_map=None,
+            files_from=None,
+            report_format=None,
+            report_file="-",
         ),
     )
     assert main() == ReturnCode.NOTHING_WOULD_CHANGE.value
@@ -413,7 +863,7 @@ def test_main_valid_dir_check_recursive(
     mocker.patch(
         "argparse.ArgumentParser.parse_args",
         return_value=argparse.Namespace(
-            path=valid_format_dir_subdirs,
+            paths=[valid_format_dir_subdirs],
             recursive=True,
             check=True,
             diff=False,
@@ -423,6 +873,31 @@ def test_main_valid_dir_check_recursive(
             compact=False,
             ensure_ascii=False,
             verbosity=3,
+            jobs=1,
+            cache=False,
+            cache_dir=None,
+            stream=False,
+            changed_since=None,
+            staged=False,
+            include=None,
+            exclude=None,
+            extend_exclude=None,
+            gitignore=True,
+            backend="auto",
+            stats=False,
+            slowest=10,
+            profile_output=None,
+            fsync="never",
+            watch=False,
+            debounce=0.2,
+            io_concurrency=None,
+            config=True,
+            strict=False,
+            schema=None,
+            schema_map=None,
+            files_from=None,
+            report_format=None,
+            report_file="-",
         ),
     )
     assert main() == ReturnCode.NOTHING_WOULD_CHANGE.value
@@ -435,7 +910,7 @@ def test_main_invalid_dir_check_recursive(
     mocker.patch(
         "argparse.ArgumentParser.parse_args",
         return_value=argparse.Namespace(
-            path=invalid_format_dir_subdirs,
+            paths=[invalid_format_dir_subdirs],
             recursive=True,
             check=True,
             diff=False,
@@ -445,6 +920,78 @@ def test_main_invalid_dir_check_recursive(
             compact=False,
             ensure_ascii=False,
             verbosity=3,
+            jobs=1,
+            cache=False,
+            cache_dir=None,
+            stream=False,
+            changed_since=None,
+            staged=False,
+            include=None,
+            exclude=None,
+            extend_exclude=None,
+            gitignore=True,
+            backend="auto",
+            stats=False,
+            slowest=10,
+            profile_output=None,
+            fsync="never",
+            watch=False,
+            debounce=0.2,
+            io_concurrency=None,
+            config=True,
+            strict=False,
+            schema=None,
+            schema_map=None,
+            files_from=None,
+            report_format=None,
+            report_file="-",
+        ),
+    )
+    assert main() == ReturnCode.SOME_FILES_WOULD_BE_REFORMATTED.value
+
+
+def test_main_invalid_dir_check_recursive_jobs(
+    mocker: MockerFixture, invalid_format_dir_subdirs: Path
+) -> None:
+    """Test main function with a invalid directory path, with check, recursive and 2 workers."""
+    mocker.patch(
+        "argparse.ArgumentParser.parse_args",
+        return_value=argparse.Namespace(
+            paths=[invalid_format_dir_subdirs],
+            recursive=True,
+            check=True,
+            diff=False,
+            color=False,
+            sort_keys=False,
+            indent=4,
+            compact=False,
+            ensure_ascii=False,
+            verbosity=3,
+            jobs=2,
+            cache=False,
+            cache_dir=None,
+            stream=False,
+            changed_since=None,
+            staged=False,
+            include=None,
+            exclude=None,
+            extend_exclude=None,
+            gitignore=True,
+            backend="auto",
+            stats=False,
+            slowest=10,
+            profile_output=None,
+            fsync="never",
+            watch=False,
+            debounce=0.2,
+            io_concurrency=None,
+            config=True,
+            strict=False,
+            schema=None,
+            schema_map=None,
+            files_from=None,
+            report_format=None,
+            report_file="-",
         ),
     )
     assert main() == ReturnCode.SOME_FILES_WOULD_BE_REFORMATTED.value
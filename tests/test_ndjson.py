@@ -0,0 +1,95 @@
+"""
+Tests for the JSON Lines files
+"""
+
+import io
+import logging
+from pathlib import Path
+from typing import Tuple
+
+import pytest
+
+from jsonator.enum import ReturnCode
+from jsonator.jsonator import format_json_file
+from jsonator.models import ModeArgs
+from jsonator.ndjson import format_chunks, format_ndjson, format_records, read_chunks, record_args
+from jsonator.report import Report
+
+DUMP_ARGS = {"sort_keys": True, "indent": 4, "ensure_ascii": True}
+RECORDS = b'{"b": 1, "a": [1, 2]}\n\n  "\xc3\xa9"  \r\n{"a":null}'
+
+
+def test_read_chunks() -> None:
+    """Chunks end at line breaks and know their first line"""
+    lines = [f'{{"id": {i}}}\n'.encode() for i in range(100)]
+    chunks = list(read_chunks(io.BytesIO(b"".join(lines)), 50))
+    assert b"".join(chunk for _, chunk in chunks) == b"".join(lines)
+    assert all(chunk.endswith(b"\n") for _, chunk in chunks)
+    assert [first_line for first_line, _ in chunks][:3] == [1, 6, 11]
+
+
+def test_format_records() -> None:
+    """Records are written compact, one per line, without blank lines"""
+    args = record_args(DUMP_ARGS)
+    assert format_records(RECORDS, 1, args, "json") == (
+        b'{"a":[1,2],"b":1}\n"\\u00e9"\n{"a":null}\n',
+        None,
+    )
+
+
+@pytest.mark.parametrize(
+    ("chunk", "error"),
+    [
+        (b'{"a": 1}\n{"a": }\n', ("Expecting value", 11, 7)),
+        (b'{"a": 1}\n\n[1, 2] [3]\n', ("Extra data", 12, 8)),
+        (b'{"a": 1}\n"\xff"\n', ("invalid start byte", 11, 2)),
+    ],
+)
+def test_format_records_error(chunk: bytes, error: Tuple[str, int, int]) -> None:
+    """Errors give the line number of the invalid record"""
+    assert format_records(chunk, 10, record_args(DUMP_ARGS), "json") == (b"", error)
+
+
+def test_format_chunks_jobs() -> None:
+    """Chunks formatted in worker processes come back in order"""
+    data = b"".join(f'{{ "id" : {i} }}\n'.encode() for i in range(200))
+    results = list(format_chunks(read_chunks(io.BytesIO(data), 64), record_args({}), "json", 2))
+    assert len(results) > 4
+    assert b"".join(formatted for _, (formatted, _) in results) == b"".join(
+        f'{{"id":{i}}}\n'.encode() for i in range(200)
+    )
+
+
+def test_format_ndjson() -> None:
+    """Whether the records change is reported, and the output written if requested"""
+    dst = io.BytesIO()
+    assert format_ndjson(io.BytesIO(RECORDS), dst, DUMP_ARGS, "json") == (True, None)
+    assert format_ndjson(io.BytesIO(dst.getvalue()), None, DUMP_ARGS, "json") == (False, None)
+    assert format_ndjson(io.BytesIO(b""), None, DUMP_ARGS, "json") == (False, None)
+
+
+def test_format_json_file_ndjson(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    """JSON Lines files are checked, written and reported record by record"""
+    json_file = tmp_path / "records.jsonl"
+    json_file.write_bytes(RECORDS)
+
+    report = Report(check=True, diff=False)
+    format_json_file(json_file, report, ModeArgs(True, False, False), DUMP_ARGS)
+    assert report.status == ReturnCode.SOME_FILES_WOULD_BE_REFORMATTED.value
+    assert json_file.read_bytes() == RECORDS
+
+    report = Report(check=False, diff=False)
+    format_json_file(json_file, report, ModeArgs(False, False, False), DUMP_ARGS)
+    assert json_file.read_bytes() == b'{"a":[1,2],"b":1}\n"\\u00e9"\n{"a":null}\n'
+    assert [path.name for path in tmp_path.iterdir()] == ["records.jsonl"]
+
+    report = Report(check=True, diff=False)
+    format_json_file(json_file, report, ModeArgs(True, False, False), DUMP_ARGS)
+    assert report.status == ReturnCode.NOTHING_WOULD_CHANGE.value
+
+    json_file.write_bytes(b'{"a": 1}\n{"a": 1,}\n')
+    report = Report(check=True, diff=False)
+    with caplog.at_level(logging.ERROR):
+        format_json_file(json_file, report, ModeArgs(True, False, False), DUMP_ARGS)
+    assert report.status == ReturnCode.INTERNAL_ERROR.value
+    assert "line 2, column 9: Expecting property name enclosed in double quotes" in caplog.text
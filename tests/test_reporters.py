@@ -0,0 +1,127 @@
+"""
+Tests for the machine-readable reports
+"""
+
+import io
+import json
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import pytest
+
+from jsonator.jsonator import format_json_file, format_json_file_stream
+from jsonator.models import REPORT_FORMATS, ModeArgs
+from jsonator.report import FAILED, UNCHANGED, WOULD_REFORMAT, Report
+from jsonator.reporters import REPORTERS
+
+DUMP_ARGS = {"sort_keys": False, "indent": 4, "ensure_ascii": True}
+
+
+def make_files(tmp_path: Path) -> None:
+    """Write a well formatted, a badly formatted and an invalid file."""
+    (tmp_path / "good.json").write_text("{}\n", encoding="utf-8")
+    (tmp_path / "bad.json").write_text('{"a": 1}', encoding="utf-8")
+    (tmp_path / "broken.json").write_text('{\n  "a": ,\n}', encoding="utf-8")
+
+
+def run_report(tmp_path: Path, report_format: str) -> str:
+    """Check the files and return the report."""
+    make_files(tmp_path)
+    stream = io.StringIO()
+    report = Report(True, False, reporter=REPORTERS[report_format](stream))
+    mode_args = ModeArgs(True, False, False, report=True)
+    for name in ("good.json", "bad.json", "broken.json"):
+        format_json_file(tmp_path / name, report, mode_args, DUMP_ARGS)
+    report.reporter.finish(report, report.status)  # type: ignore[union-attr]
+    return stream.getvalue()
+
+
+def test_results_recorded(tmp_path: Path) -> None:
+    """Every file gets its status, metrics and the position of its error"""
+    make_files(tmp_path)
+    report = Report(True, False, record=True)
+    mode_args = ModeArgs(True, False, False, report=True)
+    for name in ("good.json", "bad.json", "broken.json"):
+        format_json_file(tmp_path / name, report, mode_args, DUMP_ARGS)
+
+    assert report.results is not None
+    good, bad, broken = report.results
+    assert (good.status, bad.status, broken.status) == (UNCHANGED, WOULD_REFORMAT, FAILED)
+    assert (bad.bytes_read, bad.bytes_written) == (8, 0)
+    assert bad.seconds > 0
+    assert (broken.message, broken.line, broken.column) == ("Expecting value", 2, 8)
+
+
+def test_stream_results_recorded(tmp_path: Path) -> None:
+    """The streaming formatter counts the bytes of the report too"""
+    (tmp_path / "bad.json").write_text('{"a": 1}', encoding="utf-8")
+    report = Report(False, False, record=True)
+    mode_args = ModeArgs(False, False, False, report=True)
+    assert format_json_file_stream(tmp_path / "bad.json", report, mode_args, DUMP_ARGS)
+
+    assert report.results is not None
+    (result,) = report.results
+    assert (result.bytes_read, result.bytes_written) == (8, 15)
+
+
+def test_merge_forwards_results(tmp_path: Path) -> None:
+    """The results of worker reports go to the reporter of the run"""
+    stream = io.StringIO()
+    report = Report(True, False, reporter=REPORTERS["json"](stream))
+    worker = Report(True, False, record=True)
+    (tmp_path / "a.json").write_text("{}\n", encoding="utf-8")
+    format_json_file(tmp_path / "a.json", worker, ModeArgs(True, False, False), DUMP_ARGS)
+
+    report.merge(worker)
+    report.reporter.finish(report, report.status)  # type: ignore[union-attr]
+    assert [entry["status"] for entry in json.loads(stream.getvalue())["files"]] == [UNCHANGED]
+
+
+def test_json_report(tmp_path: Path) -> None:
+    """The JSON report has an entry per file and the summary of the run"""
+    document = json.loads(run_report(tmp_path, "json"))
+    assert [entry["status"] for entry in document["files"]] == [UNCHANGED, WOULD_REFORMAT, FAILED]
+    assert document["files"][2]["error"] == {"message": "Expecting value", "line": 2, "column": 8}
+    assert document["summary"] == {"changed": 1, "unchanged": 1, "failed": 1, "status": 123}
+
+
+def test_sarif_report(tmp_path: Path) -> None:
+    """The SARIF report has a result per file, with the region of errors"""
+    document = json.loads(run_report(tmp_path, "sarif"))
+    assert document["version"] == "2.1.0"
+    results = document["runs"][0]["results"]
+    assert [result.get("level", result.get("kind")) for result in results] == [
+        "pass",
+        "warning",
+        "error",
+    ]
+    assert results[2]["locations"][0]["physicalLocation"]["region"] == {
+        "startLine": 2,
+        "startColumn": 8,
+    }
+    assert results[1]["properties"]["bytes_read"] == 8
+
+
+def test_junit_report(tmp_path: Path) -> None:
+    """The JUnit report has a test case per file, failed or in error"""
+    suite = ET.fromstring(run_report(tmp_path, "junit")).find("testsuite")
+    assert suite is not None
+    cases = suite.findall("testcase")
+    assert len(cases) == 3
+    assert cases[0].find("failure") is None and cases[0].find("error") is None
+    assert cases[1].find("failure") is not None
+    error = cases[2].find("error")
+    assert error is not None
+    assert error.get("message") == "line 2, column 8: Expecting value"
+
+
+@pytest.mark.parametrize("report_format", REPORT_FORMATS)
+def test_empty_report(report_format: str) -> None:
+    """A run without files gives a valid report"""
+    stream = io.StringIO()
+    report = Report(False, False, reporter=REPORTERS[report_format](stream))
+    report.reporter.finish(report, 0)  # type: ignore[union-attr]
+    if report_format == "junit":
+        ET.fromstring(stream.getvalue())
+    else:
+        json.loads(stream.getvalue())
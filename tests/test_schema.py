@@ -0,0 +1,161 @@
+"""
+Tests for the JSON Schema validation
+"""
+
+import io
+import json
+from pathlib import Path
+from subprocess import run
+from typing import Any, Dict
+
+import pytest
+
+from jsonator.document import format_document
+from jsonator.enum import ReturnCode
+from jsonator.jsonator import format_json_file
+from jsonator.models import ModeArgs
+from jsonator.ndjson import format_ndjson
+from jsonator.report import Report
+from jsonator.schema import SchemaError, json_pointer, load_validator, schema_for, validate
+
+pytest.importorskip("jsonschema")
+
+DUMP_ARGS = {"sort_keys": False, "indent": 4, "ensure_ascii": True}
+SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {"items": {"type": "array", "items": {"type": "integer"}}},
+    "required": ["items"],
+}
+
+
+@pytest.fixture(name="schema")
+def fixture_schema(tmp_path: Path) -> str:
+    """Write the schema and return its path."""
+    schema_file = tmp_path / "schema.json"
+    schema_file.write_text(json.dumps(SCHEMA), encoding="utf-8")
+    return str(schema_file)
+
+
+def test_json_pointer() -> None:
+    """Keys are escaped, the root is the empty pointer"""
+    assert json_pointer([]) == ""
+    assert json_pointer(["items", 0, "a/b~c"]) == "/items/0/a~1b~0c"
+
+
+def test_validate(schema: str) -> None:
+    """Errors give the JSON pointer of the value and the number of other errors"""
+    assert validate({"items": [1, 2]}, schema) is None
+    assert validate({"items": [1, "x", "y"]}, schema) == (
+        "does not match schema.json at /items/1: 'x' is not of type 'integer' (1 more error)"
+    )
+    assert validate([], schema) == (
+        "does not match schema.json at the root: [] is not of type 'object'"
+    )
+
+
+def test_validator_loaded_once(schema: str, tmp_path: Path) -> None:
+    """The validator is created once, invalid schemas raise SchemaError"""
+    assert load_validator(schema) is load_validator(schema)
+
+    invalid = tmp_path / "invalid.json"
+    invalid.write_text('{"type": 12}', encoding="utf-8")
+    with pytest.raises(SchemaError):
+        load_validator(str(invalid))
+
+
+def test_schema_for() -> None:
+    """The first matching glob wins, then the default schema"""
+    mode_args = ModeArgs(
+        True, False, False, schema="default.json", schema_map=(("conf/*.json", "conf.json"),)
+    )
+    assert schema_for(Path("a/conf/b.json"), mode_args) == "conf.json"
+    assert schema_for(Path("a/b.json"), mode_args) == "default.json"
+    assert schema_for(Path("a/b.json"), ModeArgs(True, False, False)) is None
+
+
+def test_format_json_file(schema: str, tmp_path: Path) -> None:
+    """Files not matching the schema fail and are left alone"""
+    valid = tmp_path / "valid.json"
+    valid.write_text('{"items": [1]}', encoding="utf-8")
+    invalid = tmp_path / "invalid.json"
+    invalid.write_text('{"items": ["x"]}', encoding="utf-8")
+
+    report = Report(False, False, record=True)
+    for stream in (False, True):
+        mode_args = ModeArgs(False, False, False, stream=stream, schema=schema)
+        format_json_file(valid, report, mode_args, DUMP_ARGS)
+        format_json_file(invalid, report, mode_args, DUMP_ARGS)
+
+    assert valid.read_text(encoding="utf-8") == '{\n    "items": [\n        1\n    ]\n}\n'
+    assert invalid.read_text(encoding="utf-8") == '{"items": ["x"]}'
+    assert report.failure_count == 2
+    assert report.results is not None
+    assert report.results[1].message == (
+        "does not match schema.json at /items/0: 'x' is not of type 'integer'"
+    )
+
+
+def test_format_ndjson(schema: str) -> None:
+    """Records not matching the schema give their line"""
+    src = io.BytesIO(b'{"items": [1]}\n{"items": [2]}\n{"items": {}}\n')
+    assert format_ndjson(src, None, DUMP_ARGS, "json", schema=schema) == (
+        False,
+        ("does not match schema.json at /items: {} is not of type 'array'", 3, 1),
+    )
+
+
+def test_format_document(schema: str) -> None:
+    """Documents not matching the schema give an error without position"""
+    mode_args = ModeArgs(False, False, False)
+    assert format_document('{"items": 1}', mode_args, DUMP_ARGS, schema=schema) == (
+        False,
+        None,
+        ("does not match schema.json at /items: 1 is not of type 'array'", 0, 0),
+        None,
+    )
+
+
+def test_main_schema(schema: str, tmp_path: Path) -> None:
+    """The command line validates the files and rejects invalid schemas"""
+    json_file = tmp_path / "data.json"
+    json_file.write_text('{"items": ["x"]}\n', encoding="utf-8")
+    args = ["python", "-m", "jsonator", str(json_file), "--check"]
+
+    process = run([*args, "--schema", schema], check=False, capture_output=True, text=True)
+    assert process.returncode == ReturnCode.INTERNAL_ERROR.value
+    assert "does not match schema.json at /items/0" in process.stderr
+
+    returncode = run(
+        [*args, "--schema", schema, "--schema-map", f"other/*.json={schema}"], check=False
+    ).returncode
+    assert returncode == ReturnCode.INTERNAL_ERROR.value
+    returncode = run([*args, "--schema-map", f"other/*.json={schema}"], check=False).returncode
+    assert returncode == ReturnCode.SOME_FILES_WOULD_BE_REFORMATTED.value
+
+    process = run(
+        [*args, "--schema", str(tmp_path / "missing.json")],
+        check=False,
+        capture_output=True,
+        text=True,
+    )
+    assert process.returncode == ReturnCode.INTERNAL_ERROR.value
+    assert "cannot load schema" in process.stderr
+
+
+def test_main_schema_cache(schema: str, tmp_path: Path) -> None:
+    """Files cached without a schema, or with another one, are validated"""
+    json_file = tmp_path / "data.json"
+    json_file.write_text('{\n    "items": [\n        "x"\n    ]\n}\n', encoding="utf-8")
+    args = ["python", "-m", "jsonator", str(json_file), "--cache-dir", str(tmp_path / "cache")]
+
+    assert run(args, check=False).returncode == ReturnCode.NOTHING_WOULD_CHANGE.value
+    process = run([*args, "--schema", schema], check=False, capture_output=True, text=True)
+    assert process.returncode == ReturnCode.INTERNAL_ERROR.value
+    assert "does not match schema.json at /items/0" in process.stderr
+
+    Path(schema).write_text('{"type": "object"}', encoding="utf-8")
+    assert run([*args, "--schema", schema], check=False).returncode == 0
+    Path(schema).write_text(json.dumps(SCHEMA), encoding="utf-8")
+    assert run([*args, "--schema", schema], check=False).returncode == (
+        ReturnCode.INTERNAL_ERROR.value
+    )
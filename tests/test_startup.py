@@ -0,0 +1,106 @@
+"""
+Tests for the startup time of the command line
+"""
+
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import pytest
+
+import jsonator
+from jsonator import __version__, main
+
+# Microseconds spent importing jsonator for `jsonator --version`. Importing the command
+# line machinery takes several times as long.
+IMPORT_BUDGET = 50_000
+# Modules the fast path must not import
+HEAVY_MODULES = ("argparse", "logging", "json", "typing", "jsonator.cli", "jsonator.api")
+# Modules a run on a single file must not import
+OPTIONAL_MODULES = (
+    "jsonator.discovery",
+    "jsonator.git",
+    "jsonator.reporters",
+    "jsonator.stats",
+    "logging.handlers",
+    "multiprocessing",
+)
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)")
+
+
+def import_times(*args: str) -> Dict[str, Tuple[int, List[str]]]:
+    """
+    Run Python with `-X importtime` and return the cumulative import time of every
+    top-level module and the modules it imported.
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    times: Dict[str, Tuple[int, List[str]]] = {}
+    nested: List[str] = []
+    for line in process.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match is None:
+            continue
+        _, cumulative, indent, name = match.groups()
+        if indent:
+            nested.append(name)
+        else:
+            times[name] = int(cumulative), nested
+            nested = []
+    return times
+
+
+def test_version(capsys: pytest.CaptureFixture[str]) -> None:
+    """--version prints the version, alone or with other options"""
+    assert main(["--version"]) == 0
+    assert capsys.readouterr().out == f"jsonator {__version__}\n"
+
+    with pytest.raises(SystemExit) as exc_info:
+        main(["--version", "-v", "0"])
+    assert exc_info.value.code == 0
+    assert capsys.readouterr().out == f"jsonator {__version__}\n"
+
+
+def test_version_matches_project() -> None:
+    """The version is the one of the project"""
+    pyproject = Path(__file__).parent.parent / "pyproject.toml"
+    versions = re.findall(r'^version = "(.*)"', pyproject.read_text(encoding="utf-8"), re.M)
+    assert versions and set(versions) == {__version__}
+
+
+def test_version_import_budget() -> None:
+    """`jsonator --version` imports nothing else and stays within its budget"""
+    times = import_times("-m", "jsonator", "--version")
+    cumulative, imported = times["jsonator"]
+    assert not set(imported) & set(HEAVY_MODULES)
+    assert cumulative < IMPORT_BUDGET
+
+
+def test_single_file_imports(tmp_path: Path) -> None:
+    """`jsonator --check` on a file doesn't import the modules of other options"""
+    path = tmp_path / "data.json"
+    path.write_text("{}\n", encoding="utf-8")
+    times = import_times("-m", "jsonator", "--check", "--no-cache", str(path))
+    imported = {name for top, (_, nested) in times.items() for name in (top, *nested)}
+    assert not imported & set(OPTIONAL_MODULES)
+
+
+def test_lazy_api() -> None:
+    """The API is imported on first use"""
+    code = (
+        "import sys, jsonator\n"
+        "assert 'jsonator.api' not in sys.modules\n"
+        "assert jsonator.format_str('[1]') == '[\\n    1\\n]\\n'\n"
+        "assert 'jsonator.api' in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+    assert "format_str" in dir(jsonator)
+    with pytest.raises(AttributeError):
+        getattr(jsonator, "missing")
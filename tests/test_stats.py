@@ -0,0 +1,74 @@
+"""
+Tests for the per-phase timings
+"""
+
+import json
+from pathlib import Path
+
+from jsonator.jsonator import format_json_file
+from jsonator.models import ModeArgs
+from jsonator.report import Report
+from jsonator.stats import Stats
+
+DUMP_ARGS = {"sort_keys": False, "indent": 4, "ensure_ascii": True}
+
+
+def test_phase_timings() -> None:
+    """Test that phases are timed per file and accumulated."""
+    stats = Stats()
+    for _ in range(2):
+        with stats.phase(Path("a.json"), "parse"):
+            pass
+    with stats.phase(None, "discover"):
+        pass
+
+    assert set(stats.files) == {Path("a.json"), None}
+    assert set(stats.get(Path("a.json")).wall) == {"parse"}
+    assert stats.get(Path("a.json")).wall["parse"] >= 0
+    assert not stats.events
+
+
+def test_merge_and_summary() -> None:
+    """Test that merged stats are summarized with the slowest files first."""
+    stats = Stats()
+    for name, seconds in (("fast.json", 0.1), ("slow.json", 2.0)):
+        other = Stats()
+        other.get(Path(name)).wall["dump"] = seconds
+        other.get(Path(name)).cpu["dump"] = seconds
+        other.count_bytes(Path(name), read=2 * 1024 * 1024, written=1024 * 1024)
+        stats.merge(other)
+
+    summary = stats.summary(slowest=1)
+    assert "2 files, 4.0 MB read, 2.0 MB written" in summary
+    assert "slowest 1:" in summary
+    assert "slow.json" in summary
+    assert "fast.json" not in summary
+
+
+def test_write_trace(tmp_path: Path) -> None:
+    """Test that the events are written in the Chrome trace format."""
+    stats = Stats(trace=True)
+    with stats.phase(Path("a.json"), "read"):
+        pass
+    trace_file = tmp_path / "trace.json"
+    stats.write_trace(trace_file)
+
+    events = json.loads(trace_file.read_text(encoding="utf-8"))["traceEvents"]
+    assert len(events) == 1
+    assert events[0]["name"] == "read"
+    assert events[0]["ph"] == "X"
+    assert events[0]["args"] == {"file": "a.json"}
+
+
+def test_format_json_file_phases(tmp_path: Path) -> None:
+    """Test that formatting a file records its phases and byte counts."""
+    json_file = tmp_path / "test.json"
+    json_file.write_text('{"key": "value"}', encoding="utf-8")
+    report = Report(False, False, Stats())
+    format_json_file(json_file, report, ModeArgs(False, False, False, stats=True), DUMP_ARGS)
+
+    assert report.stats is not None
+    file_stats = report.stats.get(json_file)
+    assert {"read", "parse", "verify", "dump", "write"} <= set(file_stats.wall)
+    assert file_stats.bytes_read == len('{"key": "value"}')
+    assert file_stats.bytes_written == len(json_file.read_bytes())
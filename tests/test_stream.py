@@ -0,0 +1,120 @@
+"""
+Tests for the streaming formatter
+"""
+
+import io
+import json
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+
+from jsonator.enum import ReturnCode
+from jsonator.jsonator import format_json_file
+from jsonator.models import ModeArgs
+from jsonator.report import Report
+from jsonator.stream import StreamFallback, StreamFormatter
+
+FILES_ENCODING = "utf-8"
+
+DOCUMENTS = [
+    "[]",
+    "{}",
+    '"str"',
+    "  12  ",
+    '[[[[]]], {"z": {"y": [{}]}}]',
+    '{"b": 1, "a": {"d": 2, "c": [{"f": 1, "e": 2}]}}',
+    '[1.0, 10000000000000000000000, 0.1e1, -0, 1e400, -1E-3, NaN, -Infinity, "é ü 𝄞"]',
+    '{"a": [true, false, null], "b": "\\u00e9\\ud83d\\ude00 \\n\\"q\\\\"}',
+]
+
+DUMP_ARGS = [
+    {"sort_keys": sort_keys, "indent": indent, "ensure_ascii": ensure_ascii}
+    for sort_keys in (False, True)
+    for indent in (4, 0, "\t", None)
+    for ensure_ascii in (False, True)
+] + [{"sort_keys": False, "indent": None, "ensure_ascii": True, "separators": (",", ":")}]
+
+INVALID_DOCUMENTS = [
+    "",
+    "[1,]",
+    "[1 2]",
+    '{"a" 1}',
+    '{"a":1,',
+    "1 2",
+    '"abc',
+    "[-]",
+    "\ufeff1",
+    '{"a": ',
+    '{"a": {"b": ',
+    '["abc\ndef',
+    '["abc\ndef"]',
+    '["abc\\\ndef"]',
+]
+
+
+@pytest.mark.parametrize("document", DOCUMENTS)
+@pytest.mark.parametrize("dump_args", DUMP_ARGS)
+@pytest.mark.parametrize("chunk_size", [1, 3, 1024])
+def test_stream_output_identical(document: str, dump_args: Dict[str, Any], chunk_size: int) -> None:
+    """Test that the streaming formatter produces the same output as json.dumps"""
+    output = io.StringIO()
+    StreamFormatter(dump_args, chunk_size).format(io.StringIO(document), output)
+    assert output.getvalue() == json.dumps(json.loads(document), **dump_args) + "\n"
+
+
+@pytest.mark.parametrize("document", INVALID_DOCUMENTS)
+@pytest.mark.parametrize("sort_keys", [False, True])
+@pytest.mark.parametrize("chunk_size", [1, 1024])
+def test_stream_errors(document: str, sort_keys: bool, chunk_size: int) -> None:
+    """Test that the streaming formatter reports the same errors as json.loads"""
+    with pytest.raises(json.JSONDecodeError) as expected:
+        json.loads(document)
+
+    with pytest.raises(json.JSONDecodeError) as actual:
+        StreamFormatter({**DUMP_ARGS[0], "sort_keys": sort_keys}, chunk_size).format(
+            io.StringIO(document), io.StringIO()
+        )
+
+    assert str(actual.value) == str(expected.value)
+
+
+def test_stream_duplicate_keys() -> None:
+    """Test that duplicate keys can't be streamed"""
+    with pytest.raises(StreamFallback):
+        StreamFormatter(DUMP_ARGS[0]).format(io.StringIO('{"a": 1, "a": 2}'), io.StringIO())
+
+
+def test_format_json_file_stream(tmp_path: Path) -> None:
+    """Test format_json_file function in the streaming mode"""
+    dump_args = {"sort_keys": False, "indent": 4, "ensure_ascii": True}
+    json_file = tmp_path / "test.json"
+    json_file.write_text('{"key": [1, 2], "key2": {}}', encoding=FILES_ENCODING)
+
+    report = Report(check=True, diff=True)
+    format_json_file(json_file, report, ModeArgs(True, True, False, True), dump_args)
+    assert report.status == ReturnCode.SOME_FILES_WOULD_BE_REFORMATTED.value
+    assert json_file.read_text(encoding=FILES_ENCODING) == '{"key": [1, 2], "key2": {}}'
+
+    report = Report(check=False, diff=False)
+    format_json_file(json_file, report, ModeArgs(False, False, False, True), dump_args)
+    assert report.change_count == 1
+    assert json_file.read_text(encoding=FILES_ENCODING) == (
+        '{\n    "key": [\n        1,\n        2\n    ],\n    "key2": {}\n}\n'
+    )
+
+    report = Report(check=True, diff=False)
+    format_json_file(json_file, report, ModeArgs(True, False, False, True), dump_args)
+    assert report.status == ReturnCode.NOTHING_WOULD_CHANGE.value
+
+    # Duplicate keys fall back to the in-memory path
+    json_file.write_text('{"key": 1, "key": 2}', encoding=FILES_ENCODING)
+    report = Report(check=False, diff=False)
+    format_json_file(json_file, report, ModeArgs(False, False, False, True), dump_args)
+    assert json_file.read_text(encoding=FILES_ENCODING) == '{\n    "key": 2\n}\n'
+
+    json_file.write_text("{", encoding=FILES_ENCODING)
+    report = Report(check=False, diff=False)
+    format_json_file(json_file, report, ModeArgs(False, False, False, True), dump_args)
+    assert report.status == ReturnCode.INTERNAL_ERROR.value
+    assert list(tmp_path.iterdir()) == [json_file]
@@ -0,0 +1,126 @@
+"""
+Tests for the strict parse
+"""
+
+import io
+import json
+from pathlib import Path
+from subprocess import run
+
+import pytest
+
+from jsonator.api import Formatter, format_str
+from jsonator.document import format_document
+from jsonator.enum import ReturnCode
+from jsonator.jsonator import format_json_file
+from jsonator.models import ModeArgs
+from jsonator.ndjson import format_ndjson
+from jsonator.report import Report
+from jsonator.strict import LossyDocumentError, strict_loads
+
+DUMP_ARGS = {"sort_keys": False, "indent": 4, "ensure_ascii": True}
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        '{"a": 1, "b": {"a": 2}}',
+        "[0.1, 1.5, -0.0, 1e+100, 2.5E-3, 1.50, 1e5, 12345678901234567890123]",
+        '["0.10000000000000000001", NaN, Infinity]',
+    ],
+)
+def test_exact_documents(text: str) -> None:
+    """Documents without duplicate keys or lossy numbers parse like with json.loads"""
+    assert strict_loads(text) == json.loads(text)
+
+
+@pytest.mark.parametrize(
+    ("text", "message", "line", "column"),
+    [
+        ('{"a": 1, "a": 2}', "Duplicate key 'a'", 1, 1),
+        ('[\n  {"a": {"b": 1, "b": 1}}\n]', "Duplicate key 'b'", 2, 9),
+        (
+            '{"s": "0.10000000000000000001",\n "n": 0.10000000000000000001}',
+            "Number 0.10000000000000000001 can't be represented exactly",
+            2,
+            7,
+        ),
+        ("[1e400]", "Number 1e400 can't be represented exactly", 1, 2),
+        ("[1e-400]", "Number 1e-400 can't be represented exactly", 1, 2),
+    ],
+)
+def test_lossy_documents(text: str, message: str, line: int, column: int) -> None:
+    """Duplicate keys and lossy numbers give their position"""
+    with pytest.raises(LossyDocumentError) as exc_info:
+        strict_loads(text)
+    assert (exc_info.value.msg, exc_info.value.lineno, exc_info.value.colno) == (
+        message,
+        line,
+        column,
+    )
+
+
+def test_format_json_file(tmp_path: Path) -> None:
+    """Lossy files fail and are left alone, also in stream mode"""
+    json_file = tmp_path / "data.json"
+    json_file.write_text('{"a": 1, "a": 2}', encoding="utf-8")
+
+    report = Report(False, False, record=True)
+    for stream in (False, True):
+        format_json_file(json_file, report, ModeArgs(False, False, False, stream, strict=True), {})
+    assert json_file.read_text(encoding="utf-8") == '{"a": 1, "a": 2}'
+    assert report.failure_count == 2
+
+    format_json_file(json_file, report, ModeArgs(False, False, False), DUMP_ARGS)
+    assert json_file.read_text(encoding="utf-8") == '{\n    "a": 2\n}\n'
+
+
+def test_format_ndjson() -> None:
+    """Lossy records give their line and column"""
+    src = io.BytesIO(b'{"a": 1}\n[1, 1e999]\n')
+    assert format_ndjson(src, None, DUMP_ARGS, "json", strict=True) == (
+        False,
+        ("Number 1e999 can't be represented exactly", 2, 5),
+    )
+
+
+def test_format_document() -> None:
+    """Lossy documents give their position"""
+    mode_args = ModeArgs(False, False, False, strict=True)
+    assert format_document('{"a": 1, "a": 2}', mode_args, DUMP_ARGS) == (
+        False,
+        None,
+        ("Duplicate key 'a'", 1, 1),
+        None,
+    )
+
+
+def test_api() -> None:
+    """The formatter raises JSONDecodeError for lossy documents"""
+    assert Formatter(strict=True).format_str("[1.0]") == "[\n    1.0\n]\n"
+    with pytest.raises(json.JSONDecodeError):
+        format_str('{"a": 1, "a": 2}', strict=True)
+
+
+def test_main_strict(tmp_path: Path) -> None:
+    """The command line fails on lossy files"""
+    json_file = tmp_path / "data.json"
+    json_file.write_text('{\n    "a": 1,\n    "a": 2\n}\n', encoding="utf-8")
+    args = ["python", "-m", "jsonator", str(json_file), "--check", "--no-cache"]
+
+    assert run(args, check=False).returncode == ReturnCode.SOME_FILES_WOULD_BE_REFORMATTED.value
+    process = run([*args, "--strict"], check=False, capture_output=True, text=True)
+    assert process.returncode == ReturnCode.INTERNAL_ERROR.value
+    assert "Duplicate key 'a'" in process.stderr
+
+
+@pytest.mark.parametrize("backend", ["orjson", "ujson"])
+def test_main_strict_backend(backend: str, tmp_path: Path) -> None:
+    """NaN and Infinity are kept when a third-party backend is requested"""
+    pytest.importorskip(backend)
+    json_file = tmp_path / "data.json"
+    json_file.write_text("[NaN, Infinity]", encoding="utf-8")
+    args = ["python", "-m", "jsonator", str(json_file), "--strict", "--compact", "--no-cache"]
+
+    assert run([*args, "--backend", backend], check=False).returncode == 0
+    assert json_file.read_text(encoding="utf-8") == "[NaN,Infinity]\n"
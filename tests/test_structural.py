@@ -0,0 +1,84 @@
+"""
+Tests for the structural diff
+"""
+
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from jsonator.jsonator import format_json_file
+from jsonator.models import DIFF_STRUCTURAL, ModeArgs
+from jsonator.output import iter_document_diff
+from jsonator.report import Report
+from jsonator.structural import key_path, structural_diff
+
+
+@pytest.mark.parametrize(
+    ("a_document", "b_document", "expected"),
+    [
+        ({"a": [1, 2]}, {"a": [1, 2]}, []),
+        ({"a": 1, "b": 2}, {"b": 2, "a": 1}, ["~ $: key order changed"]),
+        ({"a": 1}, {"a": 2}, ["- $.a: 1", "+ $.a: 2"]),
+        ({"a": 1}, {"a": 1.0}, ["- $.a: 1", "+ $.a: 1.0"]),
+        ({"a": 1}, {"a": True}, ["- $.a: 1", "+ $.a: true"]),
+        ({"a": 1, "b c": [1]}, {"a": 1}, ['- $["b c"]: [1]']),
+        ({}, {"x": {"y": None}}, ['+ $.x: {"y": null}']),
+        ([1, 2, 3], [1, 3], ["- $[1]: 2"]),
+        (
+            [1, {"x": 1, "y": 2}],
+            [0, 1, {"y": 2, "x": 1}],
+            ["+ $[0]: 0", "~ $[1]: key order changed"],
+        ),
+        ([{"x": [1, 2]}], [{"x": [1, 3]}], ["- $[0].x[1]: 2", "+ $[0].x[1]: 3"]),
+        ([float("nan")], [float("nan")], []),
+        ([[-0.0]], [[0.0]], []),
+        ([[1, {"x": 1}]], [[True, {"x": 1}]], ["- $[0][0]: 1", "+ $[0][0]: true"]),
+        (
+            {"a": {"b": {"x": 1, "y": 2}}},
+            {"a": {"b": {"y": 2, "x": 1}}},
+            ["~ $.a.b: key order changed"],
+        ),
+    ],
+)
+def test_structural_diff(a_document: Any, b_document: Any, expected: Any) -> None:
+    """Only changed values and reordered keys are reported, by JSON path"""
+    diff_text = structural_diff(a_document, b_document, "a.json", "formatted file")
+    if expected:
+        assert diff_text.splitlines() == ["--- a.json", "+++ formatted file", *expected]
+    else:
+        assert diff_text == ""
+
+
+def test_iter_document_diff() -> None:
+    """The parsed input document is used as is"""
+    lines = iter_document_diff("", '{"a": 1}\n', "a.json", "formatted file", {"a": 2})
+    assert list(lines)[2:] == ["- $.a: 2\n", "+ $.a: 1\n"]
+
+
+def test_key_path() -> None:
+    """Keys which are not identifiers are quoted"""
+    assert key_path("$", "name_1") == "$.name_1"
+    assert key_path("$.a", "1st") == '$.a["1st"]'
+    assert key_path("$", 'a "b"') == '$["a \\"b\\""]'
+
+
+@pytest.mark.parametrize(("sort_keys", "expected"), [(False, ""), (True, "~ $: key order changed")])
+def test_format_json_file_structural_diff(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str], sort_keys: bool, expected: str
+) -> None:
+    """The structural diff of a reformatted file only shows the reordered keys"""
+    json_file = tmp_path / "test.json"
+    json_file.write_text('{"b": [1,\n 2], "a": 1}', encoding="utf-8")
+    mode_args = ModeArgs(True, True, False, diff_mode=DIFF_STRUCTURAL)
+    dump_args = {"sort_keys": sort_keys, "indent": 4, "ensure_ascii": True}
+
+    format_json_file(json_file, Report(check=True, diff=True), mode_args, dump_args)
+
+    out = capsys.readouterr().out
+    if expected:
+        assert f"+++ formatted file\n{expected}\n" in out
+    else:
+        assert not out
+    assert json.loads(json_file.read_text(encoding="utf-8")) == {"b": [1, 2], "a": 1}
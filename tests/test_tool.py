@@ -1,7 +1,12 @@
 """Test tool"""
 
+import json
+import time
 from pathlib import Path
-from subprocess import run
+from subprocess import PIPE, Popen, run
+from typing import List, Union
+
+import pytest
 
 from jsonator.enum import ReturnCode
 
@@ -181,3 +186,234 @@ def test_main_diff_colored_output(invalid_format_dir_subdirs: Path) -> None:
         check=False,
     )
     assert process.returncode == ReturnCode.SOME_FILES_WOULD_BE_REFORMATTED.value
+
+
+def test_main_invalid_dir_no_check_recursive_jobs(invalid_format_dir_subdirs: Path) -> None:
+    """Test that main module reformats files using several worker processes."""
+    process = run(
+        [PYTHON_EXE, MODULE, JSONATOR, "--recursive", "--jobs", "2", invalid_format_dir_subdirs],
+        check=False,
+    )
+    assert process.returncode == ReturnCode.NOTHING_WOULD_CHANGE.value
+    process = run(
+        [PYTHON_EXE, MODULE, JSONATOR, "--recursive", "--check", invalid_format_dir_subdirs],
+        check=False,
+    )
+    assert process.returncode == ReturnCode.NOTHING_WOULD_CHANGE.value
+
+
+def test_main_jobs_output_order(tmp_path: Path) -> None:
+    """Test that the logs and the diffs of the workers come out like with a single process."""
+    for i in range(24):
+        text = '{"a":' if i == 7 else f'{{"a": {i}}}'
+        (tmp_path / f"{i:02}.json").write_text(text, encoding="utf-8")
+
+    outputs = [
+        run(
+            [PYTHON_EXE, MODULE, JSONATOR, "--check", "--diff", "--no-cache", "--jobs", jobs]
+            + [str(path) for path in sorted(tmp_path.iterdir())],
+            check=False,
+            capture_output=True,
+            text=True,
+        )
+        for jobs in ("1", "3")
+    ]
+    assert outputs[0].returncode == outputs[1].returncode == ReturnCode.INTERNAL_ERROR.value
+    assert outputs[0].stdout.count("+++ formatted file") == 23
+    assert (outputs[0].stdout, outputs[0].stderr) == (outputs[1].stdout, outputs[1].stderr)
+
+
+def test_main_cached_file_changed(valid_format_json: Path) -> None:
+    """Test that a cached file is checked again once it changes."""
+    process = run([PYTHON_EXE, MODULE, JSONATOR, "--check", valid_format_json], check=False)
+    assert process.returncode == ReturnCode.NOTHING_WOULD_CHANGE.value
+    valid_format_json.write_text('{"key": "value"}', encoding="utf-8")
+    process = run([PYTHON_EXE, MODULE, JSONATOR, "--check", valid_format_json], check=False)
+    assert process.returncode == ReturnCode.SOME_FILES_WOULD_BE_REFORMATTED.value
+
+
+@pytest.mark.parametrize("jobs", ["1", "3"])
+def test_main_cached_files_order(tmp_path: Path, jobs: str) -> None:
+    """Test that cached files are reported in their place among the formatted ones."""
+    data = tmp_path / "data"
+    data.mkdir()
+    for i in range(8):
+        (data / f"{i}.json").write_text("{}\n", encoding="utf-8")
+    args = [PYTHON_EXE, MODULE, JSONATOR, "--check", "--cache-dir", str(tmp_path / "cache")]
+    args += ["--jobs", jobs, "--report-format", "json", str(data)]
+    assert run(args, check=False).returncode == ReturnCode.NOTHING_WOULD_CHANGE.value
+    for i in (2, 5):
+        (data / f"{i}.json").write_text("{ }\n", encoding="utf-8")
+
+    reports = [
+        run(command, check=False, capture_output=True, text=True).stdout
+        for command in (args, [*args, "--no-cache"])
+    ]
+    cached, uncached = ([entry["path"] for entry in json.loads(out)["files"]] for out in reports)
+    assert cached == uncached
+    assert len(cached) == 8
+
+
+def test_main_changed_since_outside_repository(valid_format_dir_no_subdirs: Path) -> None:
+    """Test that main module returns INTERNAL_ERROR when git can't list changed files."""
+    process = run(
+        [PYTHON_EXE, MODULE, JSONATOR, "--changed-since", "HEAD", valid_format_dir_no_subdirs],
+        check=False,
+    )
+    assert process.returncode == ReturnCode.INTERNAL_ERROR.value
+
+
+def test_main_bench(tmp_path: Path) -> None:
+    """Test that the bench subcommand runs the benchmark suite."""
+    output = tmp_path / "results.json"
+    process = run(
+        [
+            PYTHON_EXE,
+            MODULE,
+            JSONATOR,
+            "bench",
+            "--corpus",
+            "nested",
+            "--mode",
+            "write",
+            "--scale",
+            "0.01",
+            "--repeat",
+            "1",
+            "--output",
+            output,
+        ],
+        check=False,
+    )
+    assert process.returncode == ReturnCode.NOTHING_WOULD_CHANGE.value
+    assert output.exists()
+
+
+def test_main_stats(invalid_format_dir_no_subdirs: Path, tmp_path: Path) -> None:
+    """Test that --stats prints the timings and --profile-output writes a trace."""
+    trace_file = tmp_path / "trace.json"
+    process = run(
+        [
+            PYTHON_EXE,
+            MODULE,
+            JSONATOR,
+            "--stats",
+            "--profile-output",
+            trace_file,
+            invalid_format_dir_no_subdirs,
+        ],
+        check=False,
+        capture_output=True,
+        text=True,
+    )
+    assert process.returncode == ReturnCode.NOTHING_WOULD_CHANGE.value
+    assert "slowest" in process.stderr
+    assert trace_file.read_text(encoding="utf-8").startswith('{"traceEvents": [')
+
+
+def test_main_watch(tmp_path: Path) -> None:
+    """Test that --watch formats changed files once, without looping on its own writes."""
+    json_file = tmp_path / "test.json"
+    json_file.write_text("{}\n", encoding="utf-8")
+    with Popen(
+        [PYTHON_EXE, MODULE, JSONATOR, tmp_path, "--watch", "--debounce", "0.05", "-v", "3"],
+        stderr=PIPE,
+        text=True,
+    ) as process:
+        try:
+            deadline = time.monotonic() + 10
+            while process.stderr is not None and "Watching" not in process.stderr.readline():
+                assert time.monotonic() < deadline
+            json_file.write_text('{"key": "value"}', encoding="utf-8")
+            while json_file.read_text(encoding="utf-8") != '{\n    "key": "value"\n}\n':
+                assert time.monotonic() < deadline
+                time.sleep(0.05)
+            time.sleep(0.5)
+        finally:
+            process.terminate()
+        _, errors = process.communicate(timeout=10)
+
+    assert process.returncode == ReturnCode.NOTHING_WOULD_CHANGE.value
+    assert errors.count("reformatted") == 2
+
+
+def test_main_io_concurrency(invalid_format_dir_subdirs: Path) -> None:
+    """Test that main module formats files with the asyncio engine."""
+    args: List[Union[str, Path]] = [PYTHON_EXE, MODULE, JSONATOR, "-r", "--io-concurrency", "4"]
+    args.append(invalid_format_dir_subdirs)
+    process = run([*args, "--check"], check=False)
+    assert process.returncode == ReturnCode.SOME_FILES_WOULD_BE_REFORMATTED.value
+    process = run(args, check=False)
+    assert process.returncode == ReturnCode.NOTHING_WOULD_CHANGE.value
+    process = run([*args, "--check"], check=False)
+    assert process.returncode == ReturnCode.NOTHING_WOULD_CHANGE.value
+
+
+def test_main_structural_diff(tmp_path: Path) -> None:
+    """Test that the structural diff only reports the reordered keys."""
+    json_file = tmp_path / "test.json"
+    json_file.write_text('{"b": 1,\n"a": [1,\n2]}', encoding="utf-8")
+    args: List[Union[str, Path]] = [PYTHON_EXE, MODULE, JSONATOR, json_file, "--check"]
+    process = run(
+        [*args, "--sort-keys", "--diff=structural"], check=False, capture_output=True, text=True
+    )
+    assert process.returncode == ReturnCode.SOME_FILES_WOULD_BE_REFORMATTED.value
+    assert process.stdout == "--- test.json\n+++ formatted file\n~ $: key order changed\n"
+
+
+def test_main_report_file(invalid_format_dir_no_subdirs: Path, tmp_path: Path) -> None:
+    """Test that --report-format writes an entry per file to --report-file."""
+    report_file = tmp_path / "report.json"
+    args: List[Union[str, Path]] = [PYTHON_EXE, MODULE, JSONATOR, invalid_format_dir_no_subdirs]
+    process = run(
+        [*args, "--check", "--report-format", "json", "--report-file", report_file], check=False
+    )
+    assert process.returncode == ReturnCode.SOME_FILES_WOULD_BE_REFORMATTED.value
+    document = json.loads(report_file.read_text(encoding="utf-8"))
+    statuses = {Path(entry["path"]).name: entry["status"] for entry in document["files"]}
+    assert statuses == {
+        "test1.json": "unchanged",
+        "test2.json": "unchanged",
+        "test3.json": "would-reformat",
+    }
+    assert document["summary"]["status"] == ReturnCode.SOME_FILES_WOULD_BE_REFORMATTED.value
+
+
+def test_main_stdin() -> None:
+    """Test that - formats the standard input to the standard output."""
+    args: List[Union[str, Path]] = [PYTHON_EXE, MODULE, JSONATOR, "-"]
+    process = run(args, input='{"key": "value"}', check=False, capture_output=True, text=True)
+    assert process.returncode == ReturnCode.NOTHING_WOULD_CHANGE.value
+    assert process.stdout == '{\n    "key": "value"\n}\n'
+
+    process = run(
+        [*args, "--check"], input='{"key": "value"}', check=False, capture_output=True, text=True
+    )
+    assert process.returncode == ReturnCode.SOME_FILES_WOULD_BE_REFORMATTED.value
+    assert not process.stdout
+
+    process = run(args, input='{"key": }', check=False, capture_output=True, text=True)
+    assert process.returncode == ReturnCode.INTERNAL_ERROR.value
+    assert not process.stdout
+    assert "cannot format -: line 1, column 9: Expecting value" in process.stderr
+
+    process = run([*args, "--diff"], input="[1]", check=False, capture_output=True, text=True)
+    assert process.stdout.startswith("--- -\n+++ formatted file\n")
+
+
+def test_main_many_paths(invalid_format_dir_no_subdirs: Path, invalid_format_json: Path) -> None:
+    """Test that several paths and --files-from are formatted in one run."""
+    args: List[Union[str, Path]] = [PYTHON_EXE, MODULE, JSONATOR, "--check", "--no-cache"]
+    process = run([*args, invalid_format_dir_no_subdirs, invalid_format_json], check=False)
+    assert process.returncode == ReturnCode.SOME_FILES_WOULD_BE_REFORMATTED.value
+
+    files = b"\0".join(bytes(path) for path in sorted(invalid_format_dir_no_subdirs.iterdir())[:2])
+    process = run([*args, "--files-from", "-"], input=files + b"\0", check=False)
+    assert process.returncode == ReturnCode.NOTHING_WOULD_CHANGE.value
+    process = run([*args, "--files-from", "-", invalid_format_json], input=files, check=False)
+    assert process.returncode == ReturnCode.SOME_FILES_WOULD_BE_REFORMATTED.value
+
+    process = run([*args, invalid_format_json, "missing.json"], check=False)
+    assert process.returncode == ReturnCode.FILE_NOT_FOUND.value
+    process = run([*args, invalid_format_json, "-"], check=False, capture_output=True)
+    assert process.returncode == 2
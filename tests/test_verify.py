@@ -0,0 +1,67 @@
+"""
+Tests for the check of already formatted documents
+"""
+
+import json
+from typing import Any, Dict, List
+
+import pytest
+
+from jsonator.verify import is_formatted
+
+DOCUMENTS: List[Any] = [
+    [],
+    {},
+    "str",
+    12,
+    [[[[]]], {"z": {"y": [{}]}}],
+    {"b": 1, "a": {"d": 2, "c": [{"f": 1, "e": 2}]}},
+    [1.0, 10**22, -0.0, float("inf"), float("nan"), "é ü 𝄞", None, True, False],
+    {"a, [b]": ["{c}", ",", "\n"], "é": {"x": [1, [2, [3]]]}},
+]
+
+DUMP_ARGS = [
+    {"sort_keys": sort_keys, "indent": indent, "ensure_ascii": ensure_ascii}
+    for sort_keys in (False, True)
+    for indent in (4, 0, "\t")
+    for ensure_ascii in (False, True)
+]
+
+
+def mutations(text: str) -> List[str]:
+    """Return small changes of the text, which may still be valid JSON"""
+    result: List[str] = []
+    for i in range(len(text)):
+        result.extend((text[:i] + text[i + 1 :], text[:i] + " " + text[i:]))
+        result.extend((text[:i] + "\n" + text[i:], text[:i] + "\t" + text[i:]))
+    return result
+
+
+@pytest.mark.parametrize("document", DOCUMENTS)
+@pytest.mark.parametrize("dump_args", DUMP_ARGS)
+def test_is_formatted(document: Any, dump_args: Dict[str, Any]) -> None:
+    """Test that the check gives the same result as comparing the output of json.dumps"""
+    text = json.dumps(document, **dump_args) + "\n"
+    assert is_formatted(text, json.loads(text), dump_args) is True
+
+    for mutation in mutations(text):
+        try:
+            parsed = json.loads(mutation)
+        except json.JSONDecodeError:
+            continue
+
+        expected = mutation == json.dumps(parsed, **dump_args) + "\n"
+        assert is_formatted(mutation, parsed, dump_args) is expected, repr(mutation)
+
+
+@pytest.mark.parametrize(
+    "dump_args",
+    [
+        {"indent": 4, "separators": (", ", ": ")},
+        {"indent": None},
+        {"indent": None, "separators": (",", ":")},
+    ],
+)
+def test_is_formatted_unsupported(dump_args: Dict[str, Any]) -> None:
+    """Test that custom separators and documents on one line fall back to comparing the output"""
+    assert is_formatted("[]\n", [], dump_args) is None
@@ -0,0 +1,66 @@
+"""
+Tests for the watch mode
+"""
+
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from jsonator.discovery import DEFAULT_EXCLUDES, PatternSet, iter_files
+from jsonator.watch import InotifyWatcher, PollingWatcher, Watch, make_watcher
+
+
+def collect(directory: Path) -> List[Path]:
+    """Return the JSON files of the directory tree."""
+    return list(iter_files(directory, gitignore=False))
+
+
+def test_polling_watcher(tmp_path: Path) -> None:
+    """Test that the polling watcher finds new and modified files."""
+    (tmp_path / "a.json").write_text("{}", encoding="utf-8")
+    (tmp_path / "b.json").write_text("{}", encoding="utf-8")
+    watcher = PollingWatcher(lambda: collect(tmp_path), interval=0.01)
+    assert not watcher.wait(0.01)
+
+    (tmp_path / "a.json").write_text("[]", encoding="utf-8")
+    (tmp_path / "c.json").write_text("{}", encoding="utf-8")
+    assert watcher.wait(0.01) == {tmp_path / "a.json", tmp_path / "c.json"}
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify")
+def test_inotify_watcher(tmp_path: Path) -> None:
+    """Test that inotify reports written files, in new directories too but not excluded ones."""
+    watcher = make_watcher(tmp_path, lambda: collect(tmp_path), PatternSet(DEFAULT_EXCLUDES))
+    assert isinstance(watcher, InotifyWatcher)
+    try:
+        (tmp_path / "node_modules").mkdir()
+        (tmp_path / "sub").mkdir()
+        assert not watcher.wait(0.1)
+
+        (tmp_path / "node_modules" / "a.json").write_text("{}", encoding="utf-8")
+        (tmp_path / "sub" / "b.json").write_text("{}", encoding="utf-8")
+        assert watcher.wait(1) == {tmp_path / "sub" / "b.json"}
+    finally:
+        watcher.close()
+
+
+def test_select(tmp_path: Path) -> None:
+    """Test that only included files not written by jsonator since are selected."""
+    formatted = tmp_path / "formatted.json"
+    formatted.write_text("{}", encoding="utf-8")
+    watch = Watch(lambda: collect(tmp_path), lambda files: files, 0.01)
+    watch.record([formatted])
+
+    new = tmp_path / "new.json"
+    new.write_text("{}", encoding="utf-8")
+    other = tmp_path / "notes.txt"
+    other.write_text("", encoding="utf-8")
+    assert watch.select([formatted, new, other, tmp_path / ".new.json.tmp"]) == [new]
+    assert other in watch.ignored
+
+    time.sleep(0.01)
+    formatted.write_text("[]", encoding="utf-8")
+    assert watch.select([formatted]) == [formatted]
@@ -0,0 +1,183 @@
+"""
+Tests for the atomic writes
+"""
+
+import os
+import stat
+from pathlib import Path
+from typing import Any, List
+
+import pytest
+
+from jsonator import write
+from jsonator.concurrency import format_many, format_serial
+from jsonator.jsonator import format_json_file
+from jsonator.models import ModeArgs
+from jsonator.report import Report
+from jsonator.write import (
+    FSYNC_BATCHED,
+    FSYNC_NEVER,
+    FSYNC_PER_FILE,
+    sync_files,
+    write_atomic,
+)
+
+DUMP_ARGS = {"sort_keys": False, "indent": 4, "ensure_ascii": True}
+
+
+@pytest.fixture(name="fsync_calls")
+def fixture_fsync_calls(monkeypatch: pytest.MonkeyPatch) -> List[int]:
+    """Record the calls to os.fsync."""
+    calls: List[int] = []
+    real_fsync = os.fsync
+
+    def fsync(fd: int) -> None:
+        calls.append(fd)
+        real_fsync(fd)
+
+    monkeypatch.setattr(os, "fsync", fsync)
+    return calls
+
+
+def test_write_atomic(tmp_path: Path) -> None:
+    """Test that the file is replaced and no temporary file is left behind."""
+    path = tmp_path / "test.json"
+    path.write_text("old", encoding="utf-8")
+    assert write_atomic(path, "new\n") == len(f"new{os.linesep}")
+
+    assert path.read_text(encoding="utf-8") == "new\n"
+    assert list(tmp_path.iterdir()) == [path]
+
+
+@pytest.mark.skipif(os.name == "nt", reason="POSIX permissions")
+def test_write_atomic_keeps_mode(tmp_path: Path) -> None:
+    """Test that the permission bits of the original file are kept."""
+    path = tmp_path / "test.json"
+    path.write_text("old", encoding="utf-8")
+    path.chmod(0o640)
+    write_atomic(path, "new")
+
+    assert stat.S_IMODE(path.stat().st_mode) == 0o640
+
+
+def test_write_atomic_symlink(tmp_path: Path) -> None:
+    """Test that the target of a symlink is written, not the link replaced."""
+    target = tmp_path / "target.json"
+    target.write_text("old", encoding="utf-8")
+    link = tmp_path / "link.json"
+    try:
+        link.symlink_to(target)
+    except OSError:
+        pytest.skip("symlinks are not supported")
+    write_atomic(link, "new")
+
+    assert link.is_symlink()
+    assert target.read_bytes() == b"new"
+
+
+def test_write_atomic_failure(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the original file is intact if the rename fails."""
+    path = tmp_path / "test.json"
+    path.write_text("old", encoding="utf-8")
+
+    def fail(*_: Any) -> None:
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail)
+    with pytest.raises(OSError, match="disk full"):
+        write_atomic(path, "new")
+
+    assert path.read_text(encoding="utf-8") == "old"
+    assert list(tmp_path.iterdir()) == [path]
+
+
+@pytest.mark.parametrize(
+    ("policy", "synced"), [(FSYNC_NEVER, False), (FSYNC_PER_FILE, True), (FSYNC_BATCHED, False)]
+)
+def test_write_atomic_fsync(
+    tmp_path: Path, fsync_calls: List[int], policy: str, synced: bool
+) -> None:
+    """Test that only the per-file policy flushes in write_atomic."""
+    path = tmp_path / "test.json"
+    path.write_text("old", encoding="utf-8")
+    write_atomic(path, "new", policy)
+
+    assert bool(fsync_calls) is synced
+
+
+def test_sync_files(tmp_path: Path, fsync_calls: List[int]) -> None:
+    """Test that every file is flushed, and every directory once."""
+    paths = [tmp_path / "a.json", tmp_path / "b.json"]
+    for path in paths:
+        path.write_text("{}", encoding="utf-8")
+    sync_files(paths)
+
+    assert len(fsync_calls) == (2 if os.name == "nt" else 3)
+
+
+def test_format_serial_batched(tmp_path: Path, fsync_calls: List[int]) -> None:
+    """Test that the batched policy flushes the reformatted files at the end."""
+    formatted = tmp_path / "formatted.json"
+    formatted.write_text("{}\n", encoding="utf-8")
+    messy = tmp_path / "messy.json"
+    messy.write_text('{"a":1}', encoding="utf-8")
+    report = Report(False, False)
+    mode_args = ModeArgs(False, False, False, fsync=FSYNC_BATCHED)
+    format_serial([formatted, messy], report, mode_args, DUMP_ARGS)
+
+    assert report.written == [messy]
+    assert messy.read_text(encoding="utf-8") == '{\n    "a": 1\n}\n'
+    assert len(fsync_calls) == (1 if os.name == "nt" else 2)
+
+
+def test_format_many_batched(tmp_path: Path, fsync_calls: List[int]) -> None:
+    """Test that the files written by the workers are flushed once, by the main process."""
+    paths = [tmp_path / f"{i}.json" for i in range(4)]
+    for path in paths:
+        path.write_text('{"a":1}', encoding="utf-8")
+    report = Report(False, False)
+    mode_args = ModeArgs(False, False, False, fsync=FSYNC_BATCHED)
+    format_many(paths, report, mode_args, DUMP_ARGS, 2)
+
+    assert sorted(report.written) == paths
+    assert len(fsync_calls) == (4 if os.name == "nt" else 5)
+
+
+def test_format_json_file_removed(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a file removed before it's replaced is reported as not found."""
+    path = tmp_path / "data.json"
+    path.write_text('{"a":1}', encoding="utf-8")
+    real_copy_metadata = write.copy_metadata
+
+    def copy_metadata(src: Path, dst: Path) -> None:
+        src.unlink()
+        real_copy_metadata(src, dst)
+
+    monkeypatch.setattr(write, "copy_metadata", copy_metadata)
+    report = Report(False, False)
+    format_json_file(path, report, ModeArgs(False, False, False), DUMP_ARGS)
+
+    assert report.failure_count == 1
+    assert not list(tmp_path.iterdir())
+
+
+@pytest.mark.skipif(
+    os.name == "nt" or os.geteuid() == 0, reason="POSIX permissions, which root bypasses"
+)
+@pytest.mark.parametrize(
+    ("name", "stream"), [("data.json", False), ("data.json", True), ("data.ndjson", False)]
+)
+def test_format_json_file_read_only_directory(tmp_path: Path, name: str, stream: bool) -> None:
+    """Test that a file in a read-only directory is reported as failed, not raised."""
+    path = tmp_path / name
+    path.write_text('{"a":1}\n', encoding="utf-8")
+    tmp_path.chmod(0o555)
+    report = Report(False, False)
+    try:
+        format_json_file(path, report, ModeArgs(False, False, False, stream=stream), DUMP_ARGS)
+    finally:
+        tmp_path.chmod(0o755)
+
+    assert report.failure_count == 1
+    assert path.read_text(encoding="utf-8") == '{"a":1}\n'
+    assert list(tmp_path.iterdir()) == [path]